@@ -0,0 +1,24 @@
+"""
+Benchmarks of the bootcamp scripts on synthetic data.
+
+Seeded generators produce sshd auth.log, rsyslog syslog and
+AlphaTech employee csv files of 10^3 to 10^8 lines, the cases
+time trim_log (task1), convert_line, setup_relations (task2),
+process_log (task3) and text_analysis (task4). Results are
+stored as json to track regressions.
+
+Usage (from the scripting directory):
+    python3 -m benchmark [--min_exp N] [--max_exp N] [--rounds N]
+                         [--seed N] [--cases name,name,...]
+                         [--data DIR] [--output FILE]
+                         [--compare FILE] [--threshold N]
+
+Modules:
+
+    generators
+    cases
+"""
+
+from .generators import AuthLogGenerator,SyslogGenerator,EmployeeGenerator, \
+                        TextGenerator
+from .cases import Benchmark,Fixtures,CASES
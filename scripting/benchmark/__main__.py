@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Runs the benchmark cases for 10^min_exp to 10^max_exp lines
+and writes the results as json (format of pytest-benchmark).
+
+Options:
+    --min_exp N, --max_exp N
+        Sizes of the input (default 10^3 to 10^5 lines).
+    --rounds N
+        Timed calls per case and size (default 3).
+    --seed N
+        Seed of the generators (default 0).
+    --cases name,name,...
+        Cases to run (default all).
+    --data DIR
+        Keep generated input in DIR (default: temporary).
+    --output FILE
+        Results (default benchmark_results.json).
+    --compare FILE
+        Compare mean times with earlier results, exits with 1
+        on a slowdown above --threshold N percent (default 10).
+
+Exits with 1 if a case reports a mismatch with its reference.
+"""
+
+# Python Standard Library
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime,timezone
+
+# Local
+from .cases import CASES,Benchmark,Fixtures,Skipped,Mismatch
+
+
+def get_option(name,default):
+    """Reads value of option name from the command line."""
+
+    value = default
+    if (name in sys.argv[1:-1]):
+        value = type(default)(sys.argv[sys.argv.index(name)+1])
+
+    return value
+
+
+def machine_info():
+    """Returns description of the machine."""
+
+    return {"node": platform.node(),
+            "processor": platform.processor(),
+            "machine": platform.machine(),
+            "python_implementation": platform.python_implementation(),
+            "python_version": platform.python_version(),
+            "system": platform.system(),
+            "release": platform.release(),
+            "cpu_count": os.cpu_count()}
+
+
+def commit_info():
+    """Returns current git commit of the repository."""
+
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git","rev-parse","HEAD"],cwd=cwd, \
+                                capture_output=True,text=True).stdout.strip()
+        dirty = subprocess.run(["git","status","--porcelain"],cwd=cwd, \
+                               capture_output=True,text=True).stdout
+    except FileNotFoundError:
+        return dict()
+
+    return {"id": commit,"dirty": bool(dirty.strip())}
+
+
+def run_cases(names,sizes,rounds,fixtures):
+    """
+    Runs cases names for all sizes, returns results and names 
+    of the mismatching benchmarks.
+    """
+
+    results = []
+    mismatches = []
+    for name in names:
+        for num_lines in sizes:
+            benchmark = Benchmark(f"{name}[{num_lines}]",name, \
+                                  {"num_lines": num_lines},rounds)
+            try:
+                CASES[name](benchmark,fixtures,num_lines)
+            except Skipped as reason:
+                print(f"{benchmark.name:<32} skipped: {reason}")
+                break
+            except Mismatch as reason:
+                print(f"{benchmark.name:<32} MISMATCH: {reason}")
+                mismatches.append(benchmark.name)
+                continue
+
+            result = benchmark.as_dict()
+            stats = result["stats"]
+            print(f"{benchmark.name:<32} {stats['mean']:10.4f} s " \
+                 +f"(min {stats['min']:.4f} s) " \
+                 +f"{result['extra_info']['lines_per_second']:14.0f} lines/s")
+            results.append(result)
+
+    return results,mismatches
+
+
+def compare(results,fname,threshold):
+    """
+    Compares mean times of results with the results in fname,
+    returns True on a slowdown above threshold percent.
+    """
+
+    with open(fname) as jsonfile:
+        previous = {result["name"]: result["stats"]["mean"] \
+                    for result in json.load(jsonfile)["benchmarks"]}
+
+    regression = False
+    print(f"\nCompared with {fname}:")
+    for result in results:
+        if (result["name"] not in previous):
+            continue
+        ratio = result["stats"]["mean"]/previous[result["name"]]
+        slower = (ratio > 1+threshold/100)
+        regression = regression or slower
+        print(f"{result['name']:<32} {ratio:8.2f}x" \
+             +("  REGRESSION" if (slower) else ""))
+
+    return regression
+
+
+def main():
+    """Runs the benchmarks and stores the results."""
+
+    print("\n| Benchmarks |\n")
+
+    sizes = [10**exp for exp in range(get_option("--min_exp",3), \
+                                      get_option("--max_exp",5)+1)]
+    rounds = get_option("--rounds",3)
+    seed = get_option("--seed",0)
+    names = get_option("--cases",",".join(CASES.keys())).split(",")
+    unknown = [name for name in names if name not in CASES]
+    if (bool(unknown)):
+        print(f"Error: Unknown cases {', '.join(unknown)}, " \
+             +f"available: {', '.join(CASES.keys())}.")
+        sys.exit(2)
+    output = get_option("--output","benchmark_results.json")
+
+    data = get_option("--data","")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fixtures = Fixtures(data or tmpdir,seed)
+        results,mismatches = run_cases(names,sizes,rounds,fixtures)
+
+    report = {"machine_info": machine_info(),
+              "commit_info": commit_info(),
+              "datetime": datetime.now(timezone.utc).isoformat(),
+              "version": "bootcamp-benchmark",
+              "seed": seed,
+              "benchmarks": results}
+    with open(output,"w") as jsonfile:
+        json.dump(report,jsonfile,indent=4)
+    print(f"\nResults written to {output}.")
+
+    previous = get_option("--compare","")
+    regression = bool(previous) and \
+                 compare(results,previous,get_option("--threshold",10))
+    if (regression or bool(mismatches)):
+        sys.exit(1)
+
+
+if (__name__ == "__main__"):
+    main()
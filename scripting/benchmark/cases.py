@@ -0,0 +1,410 @@
+"""
+Benchmark cases in the style of pytest-benchmark: every case is
+a function bench_<name>(benchmark,fixtures,num_lines) which hands
+the code under test to the benchmark fixture.
+
+Classes:
+
+    Skipped
+    Mismatch
+    Benchmark
+    Fixtures
+"""
+
+# Python Standard Library
+import contextlib
+import csv
+import functools
+import importlib
+import io
+import os
+import statistics
+import sys
+import time
+from collections import deque
+from datetime import datetime,timedelta
+
+# Local
+from .generators import AuthLogGenerator,SyslogGenerator,EmployeeGenerator, \
+                        TextGenerator
+
+
+SCRIPTING = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USER_LIST = ["jan","ironman","mira","spiderman"]
+
+
+class Skipped(Exception):
+    """Raised by a case which cannot run (missing module, login)."""
+
+
+class Mismatch(Exception):
+    """Raised by a case whose result differs from the reference."""
+
+
+class Benchmark:
+    """
+    A class to time a case, a subset of the benchmark fixture of
+    pytest-benchmark.
+
+    ...
+
+    Attributes
+    ----------
+    name : str
+        name of the benchmark (case[num_lines])
+    group : str
+        name of the case
+    params : dict
+        parameters of the case
+    rounds : int
+        number of timed calls
+    extra_info : dict
+        additional results of the case
+    times : list of float
+        duration of every round in seconds
+
+    Instance Methods
+    ----------------
+    __call__(function,*args,**kwargs):
+        Times rounds calls of function.
+    pedantic(target,args=(),kwargs=None,setup=None,rounds=None):
+        Times target, calls untimed setup before every round.
+    stats():
+        Returns statistics of the rounds.
+    as_dict():
+        Returns the benchmark as in the json of pytest-benchmark.
+    """
+
+    def __init__(self,name,group,params,rounds=3):
+        """Constructs necessary attributes of the Benchmark object."""
+
+        self.name = name
+        self.group = group
+        self.params = params
+        self.rounds = rounds
+        self.extra_info = dict()
+        self.times = []
+
+
+    def __call__(self,function,*args,**kwargs):
+        """Times rounds calls of function, returns the last result."""
+
+        return self.pedantic(function,args,kwargs)
+
+
+    def pedantic(self,target,args=(),kwargs=None,setup=None,rounds=None):
+        """
+        Times target, calls untimed setup before every round.
+        Returns the result of the last round.
+        """
+
+        kwargs = kwargs or dict()
+        result = None
+        for ii in range(rounds or self.rounds):
+            if (setup is not None):
+                setup()
+            start = time.perf_counter()
+            result = target(*args,**kwargs)
+            self.times.append(time.perf_counter() - start)
+
+        return result
+
+
+    def stats(self):
+        """Returns statistics of the rounds."""
+
+        mean = statistics.mean(self.times)
+        stddev = statistics.stdev(self.times) if (len(self.times)>1) else 0.0
+
+        return {"min": min(self.times),
+                "max": max(self.times),
+                "mean": mean,
+                "stddev": stddev,
+                "median": statistics.median(self.times),
+                "rounds": len(self.times),
+                "ops": 1/mean if (mean > 0) else 0.0,
+                "data": self.times}
+
+
+    def as_dict(self):
+        """Returns the benchmark as in the json of pytest-benchmark."""
+
+        stats = self.stats()
+        num_lines = self.params.get("num_lines",0)
+        extra_info = {"lines_per_second": num_lines*stats["ops"], \
+                      **self.extra_info}
+
+        return {"group": self.group,
+                "name": self.name,
+                "fullname": f"benchmark/cases.py::bench_{self.name}",
+                "params": self.params,
+                "param": str(num_lines),
+                "extra_info": extra_info,
+                "stats": stats}
+
+
+class Fixtures:
+    """
+    A class to provide the input of the cases. Generated files
+    are kept in the data directory and reused for the same seed
+    and size.
+
+    ...
+
+    Attributes
+    ----------
+    data : str
+        directory of the generated files
+    output : str
+        directory of files written by the cases
+    seed : int
+        seed of the generators
+
+    Instance Methods
+    ----------------
+    generate(generator,fname,num_lines):
+        Returns path to fname, generated if missing.
+    auth_log(num_lines):
+        Returns path to a synthetic auth.log.
+    syslog(num_lines):
+        Returns path to a synthetic syslog.
+    employees(num_lines):
+        Returns path to a synthetic AlphaTech csv file.
+    text(num_lines):
+        Returns path to a synthetic forum text.
+    sql_login():
+        Returns login data for the SQL server.
+    """
+
+    def __init__(self,data,seed=0):
+        """Constructs necessary attributes of the Fixtures object."""
+
+        self.data = data
+        self.output = os.path.join(data,"output")
+        self.seed = seed
+        os.makedirs(self.output,exist_ok=True)
+
+
+    def generate(self,generator,fname,num_lines):
+        """Returns path to fname, generated if missing."""
+
+        path = os.path.join(self.data,fname)
+        if (not os.path.exists(path)):
+            generator.write(path+".part",num_lines)
+            os.replace(path+".part",path)
+
+        return path
+
+
+    def auth_log(self,num_lines):
+        """Returns path to a synthetic auth.log."""
+
+        return self.generate(AuthLogGenerator(self.seed), \
+                             f"auth_{self.seed}_{num_lines}.log",num_lines)
+
+
+    def syslog(self,num_lines):
+        """Returns path to a synthetic syslog."""
+
+        return self.generate(SyslogGenerator(self.seed), \
+                             f"syslog_{self.seed}_{num_lines}",num_lines)
+
+
+    def employees(self,num_lines):
+        """Returns path to a synthetic AlphaTech csv file."""
+
+        return self.generate(EmployeeGenerator(self.seed), \
+                             f"employees_{self.seed}_{num_lines}.csv", \
+                             num_lines)
+
+
+    def text(self,num_lines):
+        """Returns path to a synthetic forum text."""
+
+        return self.generate(TextGenerator(self.seed), \
+                             f"text_{self.seed}_{num_lines}.txt",num_lines)
+
+
+    @staticmethod
+    def sql_login():
+        """
+        Returns login data (name, password) for the SQL server
+        from the environment variables of checkLogins.
+        """
+
+        name = os.getenv('CHECK_LOGIN_USR')
+        passwd = os.getenv('CHECK_LOGIN_PWD')
+        if (name is None or passwd is None):
+            raise Skipped("Set CHECK_LOGIN_USR and CHECK_LOGIN_PWD "+ \
+                          "for the SQL server.")
+
+        return name,passwd
+
+
+def import_task(task,module):
+    """Imports module of the script directory task."""
+
+    path = os.path.join(SCRIPTING,task)
+    if (path not in sys.path):
+        sys.path.insert(0,path)
+    try:
+        return importlib.import_module(module)
+    except ImportError as error:
+        raise Skipped(f"{module}: {error}")
+
+
+def bench_trim_log(benchmark,fixtures,num_lines):
+    """Trims a syslog with severity tags (task1)."""
+
+    readable_logs = import_task("task1","readable_logs_OOP_v3")
+    fname = fixtures.syslog(num_lines)
+    log_file = readable_logs.LogFile(os.path.basename(fname), \
+                                     os.path.dirname(fname))
+    log_file.set_output(fixtures.output)
+
+    benchmark(log_file.trim_log)
+
+
+def bench_process_log(benchmark,fixtures,num_lines):
+    """Extracts the sessions of an auth.log (task3)."""
+
+    check_logins = import_task("task3","check_logins_OOP")
+    fname = fixtures.auth_log(num_lines)
+    log_file = check_logins.LogFile(os.path.basename(fname), \
+                                    os.path.dirname(fname))
+
+    def run():
+        log_processed = log_file.process_log(USER_LIST,datetime.min, \
+                                             datetime.min)
+        return sum(1 for line in log_processed)
+
+    benchmark.extra_info["records"] = benchmark(run) - 1
+
+
+def bench_process_log_detect(benchmark,fixtures,num_lines):
+    """
+    Extracts the sessions of an auth.log and detects brute-force 
+    attempts as with --detect (task3).
+    """
+
+    check_logins = import_task("task3","check_logins_OOP")
+    fname = fixtures.auth_log(num_lines)
+    log_file = check_logins.LogFile(os.path.basename(fname), \
+                                    os.path.dirname(fname))
+
+    def run():
+        detector = check_logins.BruteForceDetector(10,timedelta(seconds=60))
+        log_processed = log_file.process_log(USER_LIST,datetime.min, \
+                                             datetime.min,detector=detector)
+        deque(log_processed,maxlen=0)
+        return len(detector.alerts)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmark.extra_info["alerts"] = benchmark(run)
+
+
+def final_states(log_processed):
+    """Returns last state of every session by (pid,first_date_time)."""
+
+    log_processed = iter(log_processed)
+    next(log_processed)
+
+    return {(line[0],line[3]): list(line) for line in log_processed}
+
+
+def bench_process_log_parallel(benchmark,fixtures,num_lines,workers=3):
+    """
+    Extracts the sessions of an auth.log with a pool of workers,
+    checks that the final states equal those of the serial 
+    process_log (task3).
+    """
+
+    check_logins = import_task("task3","check_logins_OOP")
+    fname = fixtures.auth_log(num_lines)
+    log_file = check_logins.LogFile(os.path.basename(fname), \
+                                    os.path.dirname(fname))
+
+    def run():
+        return final_states(log_file.process_log_parallel(USER_LIST, \
+                                datetime.min,datetime.min,workers))
+
+    parallel = benchmark(run)
+    serial = final_states(log_file.process_log(USER_LIST,datetime.min, \
+                                               datetime.min))
+    if (parallel != serial):
+        differing = [key for key in serial.keys() | parallel.keys() \
+                     if serial.get(key) != parallel.get(key)]
+        raise Mismatch(f"{len(differing)} of {len(serial)} sessions "+ \
+                       "differ from process_log.")
+    benchmark.extra_info["records"] = len(parallel)
+
+
+def bench_convert_line(benchmark,fixtures,num_lines):
+    """
+    Reads the AlphaTech csv and converts every line for every
+    relation (task2).
+    """
+
+    overview = import_task("task2","overview_OOP")
+    fname = fixtures.employees(num_lines)
+    db = overview.Database("bench_alphatech",fname,None)
+    db.initialize_relations()
+    with open(fname,newline="") as csvfile:
+        header = next(csv.reader(csvfile,delimiter=","))
+    for relation in db.relations:
+        relation.create_attr_dict(header)
+
+    def run():
+        with open(fname,newline="") as csvfile:
+            reader = csv.reader(csvfile,delimiter=",")
+            next(reader)
+            deque((relation.convert_line(line) for line in reader \
+                   for relation in db.relations),maxlen=0)
+
+    benchmark(run)
+
+
+def bench_setup_relations(benchmark,fixtures,num_lines,bulk=False):
+    """
+    Creates and fills the relations of the AlphaTech csv in a
+    fresh database on the local PostgreSQL server (task2).
+    """
+
+    overview = import_task("task2","overview_OOP")
+    user = overview.User()
+    user.name,user.passwd = fixtures.sql_login()
+    fname = fixtures.employees(num_lines)
+    tests = os.path.join(fixtures.output,"AlphaTech_tests.txt")
+    db = overview.Database("bench_alphatech",fname,tests,bulk)
+    if (not db.check_credentials(user)):
+        raise Skipped("Login to the SQL server failed.")
+
+    def setup():
+        db.create_database(user)
+        db.initialize_relations()
+
+    try:
+        benchmark.pedantic(db.setup_relations,(user,),setup=setup)
+    finally:
+        db.close_connections()
+
+
+def bench_text_analysis(benchmark,fixtures,num_lines):
+    """Analyses a forum text of num_lines lines (task4)."""
+
+    crawler = import_task("task4","crawler_analysis")
+    with open(fixtures.text(num_lines)) as textfile:
+        forum_text = textfile.read()
+
+    benchmark(crawler.text_analysis,None,None,forum_text)
+
+
+CASES = {"trim_log": bench_trim_log,
+         "process_log": bench_process_log,
+         "process_log_detect": bench_process_log_detect,
+         "process_log_parallel": bench_process_log_parallel,
+         "convert_line": bench_convert_line,
+         "setup_relations": bench_setup_relations,
+         "setup_relations_bulk": functools.partial(bench_setup_relations, \
+                                                   bulk=True),
+         "text_analysis": bench_text_analysis}
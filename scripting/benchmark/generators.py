@@ -0,0 +1,443 @@
+"""
+Seeded generators of synthetic input for the benchmarks.
+
+The same seed and number of lines always produce the same file.
+
+Classes:
+
+    Generator
+    AuthLogGenerator
+    SyslogGenerator
+    EmployeeGenerator
+    TextGenerator
+"""
+
+# Python Standard Library
+import csv
+import random
+from datetime import datetime,timedelta
+
+
+class Generator:
+    """
+    A base class of the seeded generators.
+
+    ...
+
+    Attributes
+    ----------
+    seed : int
+        seed of the random number generator
+    rng : Random object
+        random number generator (reset by lines)
+
+    Instance Methods
+    ----------------
+    lines(num_lines):
+        Yields num_lines lines of synthetic data.
+    write(fname,num_lines):
+        Writes num_lines lines of synthetic data to fname.
+    """
+
+    def __init__(self,seed=0):
+        """Constructs necessary attributes of the Generator object."""
+
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+
+    def lines(self,num_lines):
+        """Yields num_lines lines of synthetic data."""
+
+        raise NotImplementedError
+
+
+    def write(self,fname,num_lines):
+        """Writes num_lines lines of synthetic data to fname."""
+
+        with open(fname,"w") as outfile:
+            for line in self.lines(num_lines):
+                outfile.write(line+"\n")
+
+
+class AuthLogGenerator(Generator):
+    """
+    Generator of an auth.log as written by rsyslog: sshd sessions
+    (accepted, failed, invalid users, brute-force attempts)
+    interleaved with CRON and systemd-logind noise.
+
+    ...
+
+    Attributes
+    ----------
+    hostname : str
+        host of the Log lines
+    start : datetime
+        time of the first line
+    ssh_fraction : float
+        fraction of sshd lines
+    max_open : int
+        maximum number of interleaved sessions
+    users : list of str
+        existing users
+    invalid_users : list of str
+        user names tried by attackers
+    ip_addresses : list of str
+        clients of the sessions
+
+    Instance Methods
+    ----------------
+    session(pid):
+        Returns the messages of a random sshd session.
+    noise(pid):
+        Returns the messages of a CRON or systemd-logind event.
+    lines(num_lines):
+        Yields num_lines lines of the Log.
+    """
+
+    def __init__(self,seed=0,hostname="ubuntu-desktop", \
+                 start=datetime(2023,11,12),ssh_fraction=0.25,max_open=4):
+        """Constructs necessary attributes of the AuthLogGenerator."""
+
+        super().__init__(seed)
+        self.hostname = hostname
+        self.start = start
+        self.ssh_fraction = ssh_fraction
+        self.max_open = max_open
+        self.users = ["jan","ironman","mira","spiderman","ast","maje"]
+        self.invalid_users = ["perseus","cicero","odysseus","admin", \
+                              "test","oracle","guest","ubuntu"]
+        self.ip_addresses = ["10.0.2.2","192.168.100.5"] \
+                           +[f"203.0.113.{ii}" for ii in range(1,255)]
+
+
+    def session(self,pid):
+        """Returns the messages of a random sshd session."""
+
+        rng = self.rng
+        ip_address = rng.choice(self.ip_addresses)
+        port = rng.randint(1024,65535)
+        client = f"{ip_address} port {port}"
+        kind = rng.random()
+
+        # login of an existing user, some failed attempts first
+        if (kind < 0.6):
+            user = rng.choice(self.users)
+            messages = []
+            for ii in range(rng.choice((0,0,0,1,2))):
+                messages += ["pam_unix(sshd:auth): authentication failure; "
+                            +"logname= uid=0 euid=0 tty=ssh ruser= "
+                            +f"rhost={ip_address}  user={user}",
+                             f"Failed password for {user} from {client} ssh2"]
+            messages += [f"Accepted password for {user} from {client} ssh2",
+                         "pam_unix(sshd:session): session opened for user "
+                        +f"{user}(uid=1000) by (uid=0)",
+                         "pam_env(sshd:session): deprecated reading of "
+                        +"user environment enabled",
+                         f"Received disconnect from {client}:11: "
+                        +"disconnected by user",
+                         f"Disconnected from user {user} {client}",
+                         "pam_unix(sshd:session): session closed for user "
+                        +f"{user}"]
+
+        # unknown user
+        elif (kind < 0.85):
+            user = rng.choice(self.invalid_users)
+            messages = [f"Invalid user {user} from {client}"]
+            for ii in range(rng.randint(1,3)):
+                messages += ["pam_unix(sshd:auth): check pass; user unknown",
+                             "pam_unix(sshd:auth): authentication failure; "
+                            +"logname= uid=0 euid=0 tty=ssh ruser= "
+                            +f"rhost={ip_address} ",
+                             f"Failed password for invalid user {user} "
+                            +f"from {client} ssh2"]
+            messages += [f"error: Received disconnect from {client}:13: "
+                        +"Unable to authenticate [preauth]",
+                         f"Disconnected from invalid user {user} {client} "
+                        +"[preauth]"]
+
+        # brute force on an existing user
+        else:
+            user = rng.choice(self.users)
+            messages = ["pam_unix(sshd:auth): authentication failure; "
+                       +"logname= uid=0 euid=0 tty=ssh ruser= "
+                       +f"rhost={ip_address}  user={user}",
+                        f"Failed password for {user} from {client} ssh2",
+                        "message repeated 2 times: [ Failed password for "
+                       +f"{user} from {client} ssh2]",
+                        f"Failed password for {user} from {client} ssh2",
+                        "message repeated 2 times: [ Failed password for "
+                       +f"{user} from {client} ssh2]",
+                        "error: maximum authentication attempts exceeded "
+                       +f"for {user} from {client} ssh2 [preauth]",
+                        f"Disconnecting authenticating user {user} "
+                       +f"{client}: Too many authentication failures "
+                       +"[preauth]",
+                        "PAM service(sshd) ignoring max retries; 6 > 3"]
+
+        return [f"sshd[{pid}]: {message}" for message in messages]
+
+
+    def noise(self,pid):
+        """Returns the messages of a CRON or systemd-logind event."""
+
+        if (self.rng.random() < 0.9):
+            user = self.rng.choice(("root","root","jan"))
+            uid = "0" if (user=="root") else "1000"
+            return [f"CRON[{pid}]: pam_unix(cron:session): session opened "
+                   +f"for user {user}(uid={uid}) by (uid=0)",
+                    f"CRON[{pid}]: pam_unix(cron:session): session closed "
+                   +f"for user {user}"]
+
+        session = self.rng.randint(1,999)
+        return [f"systemd-logind[{pid % 1000}]: New session {session} "
+               +"of user jan.",
+                f"systemd-logind[{pid % 1000}]: Removed session {session}."]
+
+
+    def lines(self,num_lines):
+        """Yields num_lines lines of the Log."""
+
+        self.rng = random.Random(self.seed)
+        rng = self.rng
+        line_time = self.start
+        pid = 1000
+        sessions = []
+        prefix = f" {self.hostname} "
+
+        for ii in range(num_lines):
+            # continue an open session or start a new one
+            if (bool(sessions) and (len(sessions) >= self.max_open \
+                                    or rng.random() < 0.5)):
+                messages = rng.choice(sessions)
+            else:
+                pid += rng.randint(1,50)
+                if (rng.random() < self.ssh_fraction):
+                    messages = self.session(pid)
+                else:
+                    messages = self.noise(pid)
+                messages.reverse()
+                sessions.append(messages)
+
+            message = messages.pop()
+            if (not bool(messages)):
+                sessions.remove(messages)
+
+            line_time += timedelta(seconds=rng.expovariate(0.5))
+            timestamp = line_time.isoformat(timespec="microseconds")
+            yield timestamp+"+01:00"+prefix+message
+
+
+class SyslogGenerator(Generator):
+    """
+    Generator of a syslog as written by rsyslog with severity
+    tags (" ERROR:", " WARNING:", ...) in part of the messages.
+
+    ...
+
+    Attributes
+    ----------
+    hostname : str
+        host of the Log lines
+    start : datetime
+        time of the first line
+    tagged_fraction : float
+        fraction of lines with a severity tag
+    severities : list of str
+        severity tags
+    weights : list of float
+        relative frequency of the severity tags
+    services : list of str
+        services writing to the Log
+    messages : list of str
+        message texts
+
+    Instance Methods
+    ----------------
+    lines(num_lines):
+        Yields num_lines lines of the Log.
+    """
+
+    def __init__(self,seed=0,hostname="ubuntu-desktop", \
+                 start=datetime(2023,11,12),tagged_fraction=0.3):
+        """Constructs necessary attributes of the SyslogGenerator."""
+
+        super().__init__(seed)
+        self.hostname = hostname
+        self.start = start
+        self.tagged_fraction = tagged_fraction
+        self.severities = ["EMERGENCY","ALERT","CRITICAL","ERROR", \
+                           "WARNING","NOTICE","INFORMATIONAL","DEBUG"]
+        self.weights = [0.001,0.004,0.01,0.1,0.2,0.2,0.3,0.185]
+        self.services = ["systemd","kernel","NetworkManager","gnome-shell", \
+                         "dbus-daemon","snapd","rsyslogd","cupsd"]
+        self.messages = ["Started Session {} of User jan.",
+                         "Reached target Timers.",
+                         "device (wlp2s0): state change: activated",
+                         "[UFW BLOCK] IN=wlp2s0 OUT= SRC=10.0.2.{} PROTO=UDP",
+                         "Activating via systemd: service name requested",
+                         "Connection to socket {} refused",
+                         "Failed to load module \"canberra-gtk-module\"",
+                         "snapd.service: Consumed {}ms CPU time."]
+
+
+    def lines(self,num_lines):
+        """Yields num_lines lines of the Log."""
+
+        self.rng = random.Random(self.seed)
+        rng = self.rng
+        line_time = self.start
+        prefix = f" {self.hostname} "
+
+        for ii in range(num_lines):
+            service = rng.choice(self.services)
+            message = rng.choice(self.messages).format(rng.randint(1,999))
+            if (rng.random() < self.tagged_fraction):
+                severity = rng.choices(self.severities,self.weights)[0]
+                message = f"{severity}: {message}"
+            if (service != "kernel"):
+                service += f"[{rng.randint(100,99999)}]"
+
+            line_time += timedelta(seconds=rng.expovariate(1.0))
+            timestamp = line_time.isoformat(timespec="microseconds")
+            yield timestamp+"+01:00"+prefix+service+": "+message
+
+
+class EmployeeGenerator(Generator):
+    """
+    Generator of AlphaTechConsultigEmployees.csv: one employee per
+    line, departments, positions, managers, projects and clients
+    are drawn from consistent tables. Dates of birth have
+    two-digit years as in the original.
+
+    ...
+
+    Attributes
+    ----------
+    header : list of str
+        columns of the csv file
+    departments : list of tuple
+        (DeptID, Department)
+    positions : list of tuple
+        (PositionID, Position)
+    managers : list of tuple
+        (ManagerID, ManagerName)
+    projects : list of tuple
+        (ProjectID, ClientID, Project, ProductOwner, ProjectBudget,
+         Client, ClientAddress, ClientCEO)
+
+    Instance Methods
+    ----------------
+    lines(num_lines):
+        Yields num_lines rows (list of str) including the header.
+    write(fname,num_lines):
+        Writes num_lines rows as csv to fname.
+    """
+
+    def __init__(self,seed=0):
+        """Constructs necessary attributes of the EmployeeGenerator."""
+
+        super().__init__(seed)
+        self.header = ["","EmployeeName","EmpID","GenderID","DeptID", \
+                       "Salary","PositionID","Position","State","Zip", \
+                       "DateofBirth","Sex","DateofHire","Department", \
+                       "ManagerName","ManagerID","Client","Project", \
+                       "ProductOwner","ClientID","ProjectID", \
+                       "ProjectBudget","ClientAddress","ClientCEO"]
+        self.departments = [(1,"Admin Offices"),(2,"Executive Office"), \
+                            (3,"IT/IS"),(4,"Software Engineering"), \
+                            (5,"Production"),(6,"Sales")]
+        self.positions = [(ii,name) for ii,name in enumerate( \
+                          ["Accountant I","Administrative Assistant", \
+                           "Data Analyst","Database Administrator", \
+                           "IT Support","Network Engineer", \
+                           "Production Technician I", \
+                           "Production Technician II","Sales Manager", \
+                           "Software Developer I","Software Engineer", \
+                           "Sr. DBA"],start=1)]
+        self.managers = [(ii,f"Manager{ii}, Name{ii}") \
+                         for ii in range(1,41)]
+        clients = [(100*ii+1,f"Client{ii}",f"{ii} Main Street, Boston", \
+                    f"CEO{ii}") for ii in range(1,21)]
+        self.projects = [(client[0]*100+jj,client[0], \
+                          f"{client[1]}Project{jj}",f"Owner{jj} {client[1]}", \
+                          str(100000*jj),*client[1:]) \
+                         for client in clients for jj in range(1,6)]
+
+
+    def lines(self,num_lines):
+        """Yields num_lines rows (list of str) including the header."""
+
+        self.rng = random.Random(self.seed)
+        rng = self.rng
+        yield self.header
+
+        for ii in range(num_lines-1):
+            dept_id,department = rng.choice(self.departments)
+            position_id,position = rng.choice(self.positions)
+            manager_id,manager = rng.choice(self.managers)
+            project_id,client_id,project,owner,budget,client,address,ceo = \
+                    rng.choice(self.projects)
+            gender_id = rng.randint(0,1)
+            birth = f"{rng.randint(1,12):02d}/{rng.randint(1,28):02d}/" \
+                   +f"{rng.randint(50,99):02d}"
+            hire = f"{rng.randint(1,12)}/{rng.randint(1,28)}/" \
+                  +f"{rng.randint(2006,2023)}"
+            yield [str(ii),f"Lastname{ii}, Firstname{ii}",str(10000+ii), \
+                   str(gender_id),str(dept_id),str(rng.randint(45000,250000)), \
+                   str(position_id),position,rng.choice(("MA","CT","NY")), \
+                   str(rng.randint(1000,2999)),birth,"MF"[gender_id]+" ", \
+                   hire,department,manager,str(manager_id),client,project, \
+                   owner,str(client_id),str(project_id),budget,address,ceo]
+
+
+    def write(self,fname,num_lines):
+        """Writes num_lines rows as csv to fname."""
+
+        with open(fname,"w",newline="") as csvfile:
+            writer = csv.writer(csvfile,delimiter=",",quotechar="\"", \
+                                quoting=csv.QUOTE_MINIMAL)
+            writer.writerows(self.lines(num_lines))
+
+
+class TextGenerator(Generator):
+    """
+    Generator of forum text for text_analysis: lines of German
+    words with a share of "und".
+
+    ...
+
+    Attributes
+    ----------
+    words : list of str
+        vocabulary
+    words_per_line : int
+        number of words per line
+
+    Instance Methods
+    ----------------
+    lines(num_lines):
+        Yields num_lines lines of text.
+    """
+
+    def __init__(self,seed=0,words_per_line=12):
+        """Constructs necessary attributes of the TextGenerator."""
+
+        super().__init__(seed)
+        self.words_per_line = words_per_line
+        self.words = ["und","der","die","das","ist","nicht","Datenbank", \
+                      "Anmeldung","Server","Protokoll","schnell","Fehler", \
+                      "Benutzer","Sitzung","Abfrage","Ergebnis","Skript", \
+                      "Verbindung","Zeitstempel","Auswertung","einmalig", \
+                      "Wörter","Histogramm","Bootcamp","Aufgabe"]
+
+
+    def lines(self,num_lines):
+        """Yields num_lines lines of text."""
+
+        self.rng = random.Random(self.seed)
+        rng = self.rng
+
+        for ii in range(num_lines):
+            words = rng.choices(self.words,k=self.words_per_line)
+            yield " ".join(words)+"."
@@ -4,8 +4,34 @@ Produce daily readable Log files:
 *locally in the calling users home-directory
 *globally in /home if called by root/sudo
 
+Options:
+    --rotated
+        Read the rotation set of the Log in place (syslog,
+        syslog.1, syslog.2.gz, ...) instead of a copy of syslog.
+    --severities LEVEL,LEVEL,...
+        Keep messages with these severity tags (default: all
+        levels, EMERGENCY,ALERT,...,DEBUG).
+    --facilities NAME,NAME,...
+        Also keep messages of these programs (e.g. sshd,kernel).
+    --automaton
+        Match the whitelist with an Aho-Corasick automaton 
+        (pyahocorasick) instead of a compiled alternation.
+    --workers N
+        Trim newline-aligned chunks of the Log in N processes,
+        the output is the same as with one process (default 1).
+    --incremental
+        Trim only lines appended since the last run (checkpoint
+        of inode and offset, no copy of syslog) and append them
+        to the file of their day. Sets up a cronjob every 5 minutes.
+        The day is read from ISO timestamps (2023-10-17T00:01:02),
+        lines with traditional timestamps (Oct 17 00:01:02) go to 
+        the file of the run, e.g. lines of 23:55 trimmed after 
+        midnight to the file of the next day.
+
 Classes:
 
+    Matcher
+    Checkpoint
     LogFile
     CronJob
     User
@@ -14,6 +40,242 @@ Classes:
 from datetime import date
 import re
 import subprocess
+import sys
+import os
+import glob
+import gzip
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    # optional: only needed for zstd-compressed Log files
+    zstandard = None
+
+try:
+    import ahocorasick
+except ImportError:
+    # optional: only needed for the Aho-Corasick Matcher
+    ahocorasick = None
+
+
+# bytes per chunk of the parallel trim_log
+CHUNK_SIZE = 16*1024**2
+
+# bytes of a mapped Log file scanned before its pages are released
+WINDOW_SIZE = 16*1024**2
+
+# end of the timestamp: first whitespace after the first character
+# (raw bytes: ASCII whitespace, or a non-ASCII byte to decode first)
+TIMESTAMP_END = re.compile(r"\s")
+TIMESTAMP_END_BYTES = re.compile(rb"[\s\x1c-\x1f\x80-\xff]")
+
+# severity tags of the Log, highest severity first
+SEVERITIES = ("EMERGENCY","ALERT","CRITICAL","ERROR","WARNING","NOTICE", \
+              "INFORMATIONAL","DEBUG")
+
+
+class Matcher:
+    """
+    A class to find whitelist entries in lines of the Log with a
+    single scan per line: one compiled alternation of all entries
+    or, for long whitelists, an Aho-Corasick automaton (requires
+    the pyahocorasick package).
+
+    ...
+
+    Instance Attributes
+    -------------------
+    whitelist : tuple of str
+        entries to search for
+    _pattern : Pattern
+        alternation of the whitelist entries
+    _bytes_pattern : Pattern
+        alternation of the whitelist entries for raw bytes
+    _automaton : Automaton
+        Aho-Corasick automaton of the whitelist entries 
+        (None: use _pattern)
+
+    Instance Methods
+    ----------------
+    search(line):
+        Returns offset of the first whitelist entry in line.
+    scan(buffer,start=0,end=None):
+        Yields offsets of the lines of buffer with whitelist entry.
+    _scan_automaton(buffer,start,end):
+        Yields offsets as scan, searched with the automaton.
+
+    Class Methods
+    -------------
+    from_names(severities=SEVERITIES,facilities=(),automaton=False):
+        Constructs Matcher for severity levels and programs.
+    """
+
+    def __init__(self,whitelist,automaton=False):
+        """Constructs necessary attributes of the Matcher object."""
+
+        self.whitelist = tuple(whitelist)
+        self._pattern = re.compile("|".join(map(re.escape,self.whitelist)))
+        self._bytes_pattern = re.compile(self._pattern.pattern.encode())
+        self._automaton = None
+        if (automaton):
+            if (ahocorasick is None):
+                raise ImportError("The Aho-Corasick matcher requires "+ \
+                                  "the pyahocorasick package.")
+            self._automaton = ahocorasick.Automaton()
+            for wl_entry in self.whitelist:
+                self._automaton.add_word(wl_entry,len(wl_entry))
+            self._automaton.make_automaton()
+
+
+    @classmethod
+    def from_names(cls,severities=SEVERITIES,facilities=(),automaton=False):
+        """
+        Constructs Matcher for severity levels (tag " LEVEL:") 
+        and programs (" name:" or " name[pid]:").
+        """
+
+        whitelist = [f" {level}:" for level in severities]
+        for name in facilities:
+            whitelist += [f" {name}:",f" {name}["]
+
+        return cls(whitelist,automaton)
+
+
+    def search(self,line):
+        """
+        Returns offset of the first whitelist entry in line
+        (-1: no entry).
+        """
+
+        if (self._automaton is not None):
+            for end,length in self._automaton.iter(line):
+                return end-length+1
+            return -1
+
+        match = self._pattern.search(line)
+
+        return match.start() if bool(match) else -1
+
+
+    def scan(self,buffer,start=0,end=None):
+        """
+        Yields offsets (line_start,entry_start,line_end) of the lines
+        of buffer[start:end] (bytes, mmap) with whitelist entry. 
+        Lines end at "\n" or "\r" as in text mode, start has to be 
+        the start of a line. The bytes are not copied (except by the
+        automaton, see _scan_automaton).
+        """
+
+        end = len(buffer) if (end is None) else end
+        if (self._automaton is not None):
+            yield from self._scan_automaton(buffer,start,end)
+            return
+
+        search = self._bytes_pattern.search
+        pos = start
+
+        while (pos < end):
+            match = search(buffer,pos,end)
+            if (not bool(match)):
+                return
+            entry_start = match.start()
+
+            line_start = max(buffer.rfind(b"\n",pos,entry_start), \
+                             buffer.rfind(b"\r",pos,entry_start),pos-1)+1
+            line_end = buffer.find(b"\n",entry_start,end)
+            line_end = end if (line_end < 0) else line_end
+            carriage = buffer.find(b"\r",entry_start,line_end)
+            line_end = line_end if (carriage < 0) else carriage
+
+            yield line_start,entry_start,line_end
+            pos = line_end+1
+
+
+    def _scan_automaton(self,buffer,start,end):
+        """
+        Yields offsets as scan with the automaton, which searches a
+        copy of buffer[start:end] decoded as latin-1 (one character
+        per byte keeps the offsets).
+        """
+
+        text = buffer[start:end].decode("latin-1")
+        pos = start
+
+        for entry_end,length in self._automaton.iter(text):
+            entry_start = start+entry_end-length+1
+            if (entry_start < pos):
+                # further entry of a yielded line
+                continue
+
+            line_start = max(buffer.rfind(b"\n",pos,entry_start), \
+                             buffer.rfind(b"\r",pos,entry_start),pos-1)+1
+            line_end = buffer.find(b"\n",entry_start,end)
+            line_end = end if (line_end < 0) else line_end
+            carriage = buffer.find(b"\r",entry_start,line_end)
+            line_end = line_end if (carriage < 0) else carriage
+
+            yield line_start,entry_start,line_end
+            pos = line_end+1
+
+
+class Checkpoint:
+    """
+    A class to represent a persisted position in a Log file.
+
+    ...
+
+    Instance Attributes
+    -------------------
+    fname : str
+        file storing the checkpoint
+    inode : int
+        inode of the Log file (None if unknown)
+    offset : int
+        byte offset after the last processed line
+
+    Instance Methods
+    ----------------
+    load():
+        Reads checkpoint from file.
+    save():
+        Writes checkpoint to file.
+    """
+
+    def __init__(self,fname):
+        """Constructs necessary attributes of the Checkpoint object."""
+
+        self.fname = fname
+        self.inode = None
+        self.offset = 0
+
+
+    def load(self):
+        """Reads checkpoint from file."""
+
+        try:
+            with open(self.fname,"r") as checkfile:
+                inode,offset = checkfile.read().split()
+                self.inode = int(inode)
+                self.offset = int(offset)
+        except (FileNotFoundError,ValueError):
+            self.inode = None
+            self.offset = 0
+
+
+    def save(self):
+        """Writes checkpoint to file."""
+
+        # replace atomically, a crash keeps the previous checkpoint
+        tmp_fname = self.fname+".tmp"
+        try:
+            with open(tmp_fname,"w") as checkfile:
+                checkfile.write(f"{self.inode} {self.offset}\n")
+            os.replace(tmp_fname,self.fname)
+        except PermissionError:
+            msg = f"You lack permission to create {self.fname}."
+            print(msg)
 
 
 class LogFile:
@@ -28,24 +290,63 @@ class LogFile:
         name of the Log file
     _location : str
         path to the Log file
+    _output : str
+        path to the trimmed Log file
+    rotated : bool
+        read the rotation set of the Log (name, name.1, name.2.gz,
+        ...) or all files matching name as glob pattern
+    matcher : Matcher object
+        whitelist of trim_log (default: all severity levels)
 
     Instance Methods
     ----------------
     copy_log(destination):
         Copies Log to destination.
+    set_output(destination):
+        Sets path to the trimmed Log file.
+    log_files():
+        Returns Log file or its rotation set, oldest first.
     _read_log():
         Reads from Log file, one line at a time.
     _write_log():
         Writes trimmed Log to file YYYY-MM-dd, one line at a time.
-    trim_log():
+    _append_log():
+        Appends trimmed lines to the file of their day.
+    _complete_end(fname):
+        Returns offset after the last complete line of fname.
+    _new_ranges(checkpoint):
+        Returns byte ranges of the Log after the checkpoint.
+    trim_incremental(checkpoint):
+        Trims lines appended to the Log since the checkpoint.
+    _chunks(chunk_size=None):
+        Splits Log into byte ranges of about chunk_size bytes.
+    trim_log(workers=1,chunk_size=CHUNK_SIZE):
         Trims Log to improve readability.
+
+    Class Methods
+    -------------
+    _open_log(fname):
+        Opens plain, gzip- or zstd-compressed Log file.
+    _timestamp(line):
+        Returns timestamp of line.
+    _trim_lines(lines,search):
+        Yields trimmed lines with whitelist entry.
+    _trim_mapped(buffer,start,end,matcher):
+        Yields trimmed lines of a byte range of a mapped Log file.
+    _trim_range(fname,start,end,matcher):
+        Yields trimmed lines of a byte range of the Log.
+    _trim_chunk(fname,start,end,matcher):
+        Trims the lines of a byte range of the Log.
     """
 
-    def __init__(self,name,location):
+    def __init__(self,name,location,rotated=False,matcher=None):
         """Constructs necessary attributes of the LogFile object."""
 
         self._name = name
         self._location = location
+        self._output = location
+        self.rotated = rotated or glob.has_magic(name)
+        self.matcher = matcher or Matcher.from_names()
 
 
     def copy_log(self,destination):
@@ -59,28 +360,86 @@ class LogFile:
         cmd = f"cp {self._location}/{self._name} {destination}"
         subprocess.call(cmd,shell=True)
         self._location = destination
+        self._output = destination
+
+
+    def set_output(self,destination):
+        """
+        Sets path to the trimmed Log file.
+
+           Parameters:
+               destination (str): Absolute path
+        """
+
+        self._output = destination
+
+
+    def log_files(self):
+        """
+        Returns Log file or its rotation set, oldest first
+        (highest rotation number first, current Log last).
+        """
+
+        if (not self.rotated):
+            return [f"{self._location}/{self._name}"]
+
+        if (glob.has_magic(self._name)):
+            fnames = glob.glob(f"{self._location}/{self._name}")
+        else:
+            pattern = re.escape(self._name)+r"(\.[0-9]+)?(\.gz|\.zst)?$"
+            fnames = [fname for fname \
+                      in glob.glob(f"{self._location}/{self._name}*") \
+                      if re.match(pattern,os.path.basename(fname))]
+
+        def rotation_number(fname):
+            search = re.search(r"\.([0-9]+)(\.gz|\.zst)?$",fname)
+            return int(search.group(1)) if bool(search) else 0
+
+        return sorted(fnames,key=lambda fname: (-rotation_number(fname), \
+                                                fname))
+
+
+    @staticmethod
+    def _open_log(fname):
+        """Opens plain, gzip- or zstd-compressed Log file as text."""
+
+        if (fname.endswith(".gz")):
+            return gzip.open(fname,"rt")
+        if (fname.endswith(".zst")):
+            if (zstandard is None):
+                raise ImportError(f"Reading {fname} requires "+ \
+                                  "the zstandard package.")
+            return zstandard.open(fname,"rt")
+
+        return open(fname,"r")
 
 
     def _read_log(self):
-        """Reads from Log file, one line at a time."""
+        """
+        Reads from Log file, or its rotation set in chronological
+        order, one line at a time. Compressed files are 
+        decompressed on the fly.
+        """
 
-        fname = f"{self._location}/{self._name}"
-        try:
-            with open(fname,"r") as logfile:
-                for line in logfile:
-                    yield line
-        except FileNotFoundError:
-            msg = f"The file {fname} does not exist."
-            print(msg)
-        except PermissionError:
-            msg = f"You lack permission to read {fname}."
-            print(msg)
+        for fname in self.log_files():
+            try:
+                with self._open_log(fname) as logfile:
+                    for line in logfile:
+                        yield line
+            except FileNotFoundError:
+                msg = f"The file {fname} does not exist."
+                print(msg)
+            except PermissionError:
+                msg = f"You lack permission to read {fname}."
+                print(msg)
+            except ImportError as error:
+                print(error)
 
 
     def _write_log(self):
         """Writes trimmed Log to file YYYY-MM-dd, one line at a time."""
 
-        fname = f"{self._location}/"+date.today().strftime("%Y-%m-%d")
+        fname = f"{self._output}/"+date.today().strftime("%Y-%m-%d")
         try:
             with open(fname,"w") as logfile:
                 while True:
@@ -91,37 +450,316 @@ class LogFile:
             print(msg)
 
 
-    def trim_log(self):
+    def _append_log(self):
+        """
+        Appends trimmed lines to file YYYY-MM-dd of the date of 
+        their timestamp (today if the timestamp has no ISO date, 
+        e.g. traditional syslog timestamps), i.e. the output rolls 
+        over at midnight. Ends if a file cannot be opened.
+        """
+
+        day = None
+        logfile = None
+        try:
+            while True:
+                data = (yield)
+                line_day = data[:10]
+                if (not re.match(r"[0-9]{4}-[0-9]{2}-[0-9]{2}$",line_day)):
+                    line_day = date.today().strftime("%Y-%m-%d")
+                if (line_day != day):
+                    if (logfile is not None):
+                        logfile.close()
+                    day = line_day
+                    fname = f"{self._output}/{day}"
+                    logfile = open(fname,"a")
+                logfile.write(data+"\n")
+        except PermissionError:
+            msg = f"You lack permission to create {fname}."
+            print(msg)
+        except FileNotFoundError:
+            msg = f"The directory {self._output} does not exist."
+            print(msg)
+        except OSError as error:
+            print(error)
+        finally:
+            if (logfile is not None):
+                logfile.close()
+
+
+    @staticmethod
+    def _timestamp(line):
+        """Returns timestamp of line (up to the first whitespace)."""
+
+        match = TIMESTAMP_END.search(line,1)
+
+        return line[:match.start()] if bool(match) else line
+
+
+    @staticmethod
+    def _trim_lines(lines,search):
+        """
+        Yields lines with whitelist entry as timestamp and message
+        from the whitelist entry on (search: Matcher.search).
+        """
+
+        for line_log in lines:
+            # offset of the first whitelist entry
+            start = search(line_log)
+            if (start < 0):
+                # omit lines without whitelist entry
+                continue
+    
+            # keep timestamp, messages from whitelist entry on
+            timestamp = LogFile._timestamp(line_log)
+            wl_message = line_log[start:].strip()
+            yield " - ".join([timestamp,wl_message])
+
+
+    def _chunks(self,chunk_size=None):
+        """
+        Splits every plain Log file into byte ranges (fname,start,end)
+        of about chunk_size bytes (default: whole file), aligned on 
+        newlines by the readers. Compressed files form one chunk 
+        each (end None).
+        """
+
+        chunks = []
+        for fname in self.log_files():
+            if (fname.endswith((".gz",".zst"))):
+                chunks.append((fname,0,None))
+                continue
+
+            try:
+                size = os.path.getsize(fname)
+            except FileNotFoundError:
+                msg = f"The file {fname} does not exist."
+                print(msg)
+                continue
+
+            bounds = [*range(0,size,chunk_size or max(size,1)),size]
+            chunks.extend([(fname,bounds[ii],bounds[ii+1]) \
+                           for ii in range(len(bounds)-1)])
+
+        return chunks
+
+
+    @staticmethod
+    def _trim_mapped(buffer,start,end,matcher):
+        """
+        Yields trimmed lines of buffer[start:end] of a mapped Log 
+        file. Whitelist entries are searched on the raw bytes, only
+        the kept parts of matching lines are decoded.
+        """
+
+        timestamp_end = TIMESTAMP_END_BYTES.search
+        for line_start,entry_start,line_end in \
+            matcher.scan(buffer,start,end):
+
+            match = timestamp_end(buffer,line_start+1,line_end)
+            if (bool(match) and buffer[match.start()] < 0x80):
+                timestamp = buffer[line_start:match.start()] \
+                            .decode(errors="replace")
+            else:
+                # whitespace of the decoded line as in text mode
+                timestamp = LogFile._timestamp(buffer[line_start:line_end] \
+                                               .decode(errors="replace"))
+            wl_message = buffer[entry_start:line_end]
+            yield " - ".join([timestamp, \
+                              wl_message.decode(errors="replace").strip()])
+
+
+    @staticmethod
+    def _trim_range(fname,start,end,matcher):
+        """
+        Yields trimmed lines starting in the byte range [start,end) 
+        of the Log (whole file if end is None). Plain files are 
+        memory-mapped and scanned in windows, scanned pages are
+        released to keep the memory flat. Compressed files are 
+        read as text.
+        """
+
+        if (end is None):
+            with LogFile._open_log(fname) as logfile:
+                yield from LogFile._trim_lines(logfile,matcher.search)
+            return
+
+        if (start >= end):
+            return
+
+        with open(fname,"rb") as logfile, \
+             mmap.mmap(logfile.fileno(),0,access=mmap.ACCESS_READ) as mm:
+            # align range on the next line starts
+            def align(offset):
+                if (offset <= 0):
+                    return 0
+                return mm.find(b"\n",offset-1)+1 or len(mm)
+
+            start,end = align(start),align(end)
+            released = start - start % mmap.PAGESIZE
+            while (start < end):
+                stop = align(min(start+WINDOW_SIZE,end))
+                yield from LogFile._trim_mapped(mm,start,stop,matcher)
+                start = stop
+
+                if (hasattr(mmap,"MADV_DONTNEED")):
+                    page = start - start % mmap.PAGESIZE
+                    if (page > released):
+                        mm.madvise(mmap.MADV_DONTNEED,released,page-released)
+                        released = page
+
+
+    @staticmethod
+    def _trim_chunk(fname,start,end,matcher):
+        """
+        Trims the lines starting in the byte range [start,end) of 
+        the Log (whole file if end is None). Returns the trimmed 
+        lines joined by newlines.
+        """
+
+        return "\n".join(LogFile._trim_range(fname,start,end,matcher))
+
+
+    @staticmethod
+    def _complete_end(fname):
+        """
+        Returns offset after the last complete line of fname,
+        an incomplete last line is left for the next run.
+        """
+
+        if (os.path.getsize(fname) == 0):
+            return 0
+
+        with open(fname,"rb") as logfile, \
+             mmap.mmap(logfile.fileno(),0,access=mmap.ACCESS_READ) as mm:
+            return mm.rfind(b"\n")+1
+
+
+    def _new_ranges(self,checkpoint):
+        """
+        Returns byte ranges (fname,start,end) of the Log after the
+        checkpoint (inode, byte offset) and advances the checkpoint.
+        Follows the Log through rotation (Log moved to Log.1, new 
+        inode) and truncation.
+        """
+
+        fname = f"{self._location}/{self._name}"
+        ranges = []
+
+        # finish rotated Log if the checkpoint points to it
+        inode = os.stat(fname).st_ino
+        rotated = fname+".1"
+        if (checkpoint.inode is not None and inode != checkpoint.inode and \
+            os.path.exists(rotated) and \
+            os.stat(rotated).st_ino == checkpoint.inode):
+            ranges.append((rotated,checkpoint.offset, \
+                           self._complete_end(rotated)))
+
+        end = self._complete_end(fname)
+        if (inode != checkpoint.inode or end < checkpoint.offset):
+            # new Log or truncation (copytruncate)
+            checkpoint.offset = 0
+        ranges.append((fname,checkpoint.offset,end))
+
+        checkpoint.inode = inode
+        checkpoint.offset = end
+
+        return ranges
+
+
+    def trim_incremental(self,checkpoint):
+        """
+        Trims the lines appended to the Log since the checkpoint
+        and appends them to the files of their day, the checkpoint
+        is saved only after all lines are written.
+        """
+
+        checkpoint.load()
+        try:
+            ranges = self._new_ranges(checkpoint)
+        except FileNotFoundError:
+            msg = f"The file {self._location}/{self._name} does not exist."
+            print(msg)
+            return
+        except PermissionError:
+            msg = f"You lack permission to read {self._location}/{self._name}."
+            print(msg)
+            return
+
+        write_gen = self._append_log()
+        write_gen.send(None)
+        try:
+            for chunk in ranges:
+                for line_mod in self._trim_range(*chunk,self.matcher):
+                    write_gen.send(line_mod)
+        except StopIteration:
+            # output file could not be opened (reported by writer)
+            return
+        except PermissionError:
+            msg = f"You lack permission to read {chunk[0]}."
+            print(msg)
+            return
+        except FileNotFoundError:
+            msg = f"The file {chunk[0]} does not exist."
+            print(msg)
+            return
+        finally:
+            # close generator
+            write_gen.close()
+
+        checkpoint.save()
+
+
+    def trim_log(self,workers=1,chunk_size=CHUNK_SIZE):
         """
         Trims Log to improve readability.
+        Plain files are memory-mapped and scanned as raw bytes.
+        With several workers, chunks of about chunk_size bytes 
+        are trimmed in parallel and written in order, one write
+        per chunk.
         
-        Modify whitelist to control filter.
+        Modify the whitelist of matcher to control filter.
         """
 
-        # whitelist of filter
-        whitelist = [" EMERGENCY:"," ALERT:"," CRITICAL:"," ERROR:",\
-                     " WARNING:"," NOTICE:"," INFORMATIONAL:"," DEBUG:"]
-    
         write_gen = self._write_log()
         write_gen.send(None)
-    
-        for line_log in self._read_log():
-            # check if line contains whitelist entry
-            is_allowed = [(wl_entry in line_log) for wl_entry in whitelist]
-            if (any(is_allowed)):
-                wl_entry = whitelist[is_allowed.index(True)]
-            else:
-                # omit lines without whitelist entry
-                continue
-    
-            # keep timestamp, messages with whitelist entry
-            time_pattern = r"^(.+?)\s"
-            wl_pattern = r"("+wl_entry+r".+?)$"
-            timestamp = re.search(time_pattern,line_log).group(1)
-            wl_message = re.search(wl_pattern,line_log).group(1).strip()
-            line_mod = " - ".join([timestamp,wl_message])
-    
-            write_gen.send(line_mod)
+
+        if (workers > 1):
+            chunks = self._chunks(chunk_size)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self._trim_chunk,*chunk, \
+                                           self.matcher) \
+                           for chunk in chunks]
+                failed = set()
+                for chunk,future in zip(chunks,futures):
+                    try:
+                        data = future.result()
+                    except PermissionError:
+                        msg = f"You lack permission to read {chunk[0]}."
+                    except FileNotFoundError:
+                        msg = f"The file {chunk[0]} does not exist."
+                    except ImportError as error:
+                        msg = str(error)
+                    else:
+                        if (bool(data)):
+                            write_gen.send(data)
+                        continue
+                    # report every file once
+                    if (chunk[0] not in failed):
+                        failed.add(chunk[0])
+                        print(msg)
+        else:
+            for chunk in self._chunks():
+                try:
+                    for line_mod in self._trim_range(*chunk,self.matcher):
+                        write_gen.send(line_mod)
+                except PermissionError:
+                    msg = f"You lack permission to read {chunk[0]}."
+                    print(msg)
+                except FileNotFoundError:
+                    msg = f"The file {chunk[0]} does not exist."
+                    print(msg)
+                except ImportError as error:
+                    print(error)
     
         # close generator
         write_gen.close()
@@ -261,18 +899,48 @@ def main():
 
     print("\n| ReadAble Logs |\n")
 
-    cronjob = CronJob("0","0","*","*","1-5","python3",f"{__file__}")
+    incremental = ("--incremental" in sys.argv[1:])
+    if (incremental):
+        cronjob = CronJob("*/5","*","*","*","*","python3", \
+                          f"{__file__} --incremental")
+    else:
+        cronjob = CronJob("0","0","*","*","1-5","python3",f"{__file__}")
     if (not cronjob.active):
         cronjob.add_cronjob()
 
-    log_file = LogFile("syslog","/var/log")
+    rotated = ("--rotated" in sys.argv[1:])
+    severities = SEVERITIES
+    if ("--severities" in sys.argv[1:-1]):
+        value = sys.argv[sys.argv.index("--severities")+1]
+        severities = [level.upper() for level in value.split(",")]
+    facilities = ()
+    if ("--facilities" in sys.argv[1:-1]):
+        value = sys.argv[sys.argv.index("--facilities")+1]
+        facilities = value.split(",")
+    automaton = ("--automaton" in sys.argv[1:])
+    matcher = Matcher.from_names(severities,facilities,automaton)
+    log_file = LogFile("syslog","/var/log",rotated,matcher)
     user = User()
-    log_file.copy_log(user.home)
-    log_file.trim_log()
-
-    file_list = [f"{user.home}/syslog"]
-    perm_list = ["o+r"]
-    user.grant_permissions(file_list,perm_list)
+    if (incremental):
+        # new lines are read in place
+        log_file.set_output(user.home)
+        checkpoint = Checkpoint(f"{user.home}/.readable_logs_checkpoint")
+        log_file.trim_incremental(checkpoint)
+        return
+    if (rotated):
+        # rotation set is read in place
+        log_file.set_output(user.home)
+    else:
+        log_file.copy_log(user.home)
+    workers = 1
+    if ("--workers" in sys.argv[1:-1]):
+        workers = int(sys.argv[sys.argv.index("--workers")+1])
+    log_file.trim_log(workers)
+
+    if (not rotated):
+        file_list = [f"{user.home}/syslog"]
+        perm_list = ["o+r"]
+        user.grant_permissions(file_list,perm_list)
 
 
 if (__name__ == "__main__"):
@@ -6,10 +6,19 @@ Create-mode:
     *Runs a set of SQL-queries to check the database.
 Interactive-mode:
     Processes queries on created database.
+Clean-mode:
+    Writes a copy of the input with four-digit years
+    (overview_OOP.py --clean [input [output]]).
+
+Options:
+    --bulk
+        Fill relations in Create-mode with COPY instead of 
+        one prepared INSERT per relation and line.
 
 Classes:
 
     Relation
+    ConnectionPool
     Database
     User
 """
@@ -21,17 +30,27 @@ import csv
 import itertools
 import textwrap
 from functools import wraps
+from contextlib import contextmanager
 from datetime import date
+import re
 import readline
+import tempfile
+import time
 
 # Third-party libraries
 import psycopg2
 from psycopg2 import sql
+from psycopg2 import pool
 import rich
 from rich.table import Table
 from rich.console import Console
 
 
+# rows per page of query results, maximum width of a column
+PAGE_SIZE = 50
+MAX_COLUMN_WIDTH = 40
+
+
 class Relation:
     """
     A class to represent a relation.
@@ -60,13 +79,24 @@ class Relation:
         wrapped cstrs variable
     _attr_dict : dictionary
         translates lines of the input into attributes of the relation
+    _statements : dictionary
+        prepared statements of the relation by kind
+    _year_table : dictionary (class attribute)
+        expanded four-digit years by year of the input, 
+        filled once per run
 
     Instance Methods
     ----------------
     query_create():
         Constructs query to CREATE the relation.
-    query_insert():
+    query_insert(prepared=False):
         Constructs query to INSERT tuples into the relation.
+    statement(kind):
+        Returns the prepared statement of kind "insert".
+    query_staging():
+        Constructs queries to load the relation via a staging table.
+    unique_indices():
+        Returns indices of attributes with PRIMARY KEY or UNIQUE.
     fk_constraints():
         Sets foreign key constraints for the relation.
     create_attr_dict(src_attr):
@@ -74,23 +104,41 @@ class Relation:
         src_attr to match attributes of the relation.
     convert_line(line):
         Converts line of input to properly fit into the database.
+    convert_lines(lines):
+        Converts many lines of input column by column.
 
     Class Methods
     -------------
+    _placeholders(num,prepared):
+        Returns num placeholders for parameters of a query.
+    _expand_year(year):
+        Expand year to four digits while assuming the youngest 
+        timespan possible.
     _check_date(old_date):
         Expand year in old_date to four digits while assuming 
         the youngest timespan possible (e.g. 18 years rather 
         than 100 years).
-    create_table(header,content):
+    convert_dates(column):
+        Expand years of a whole DATE column to four digits.
+    create_table(header,content,widths=None):
         Creates table representation of a query with header and content.
     print_table(table):
         Displays table representation of a query.
     write_table(table,fname):
         Writes table representation of a query to file fname.
+    fetch_pages(cursor,page_size=PAGE_SIZE):
+        Fetches result of a query page by page.
+    column_widths(header,sample):
+        Returns column widths for a sample of rows.
+    print_pages(cursor,page_size=PAGE_SIZE):
+        Displays result of a query page by page.
     export_csv(content,fname):
         Export query as csv file.
     """
 
+    _year_table = {}
+
+
     def __init__(self,name,attrs,types,keys,cstrs):
         """Constructs necessary attributes of the Relation object."""
 
@@ -106,6 +154,7 @@ class Relation:
         self._sql_cstrs = tuple(map(sql.SQL,self.cstrs))
 
         self._attr_dict = {}
+        self._statements = {}
 
 
     def query_create(self):
@@ -129,18 +178,83 @@ class Relation:
         return query
 
 
-    def query_insert(self):
+    @staticmethod
+    def _placeholders(num,prepared):
+        """
+        Returns num placeholders for parameters of a query,
+        positional ($1, $2, ...) for prepared statements.
+        """
+
+        if (prepared):
+            placeholders = [sql.SQL(f"${ii+1}") for ii in range(num)]
+        else:
+            placeholders = sql.Placeholder() * num
+
+        return sql.SQL(', ').join(placeholders)
+
+
+    def query_insert(self,prepared=False):
         """Constructs query to INSERT tuples into the relation."""
        
         query = sql.SQL("""INSERT INTO {} ({}) VALUES ({}) 
                            ON CONFLICT DO NOTHING;""").format( \
                 sql.Identifier(self.name), \
                 sql.SQL(', ').join(self._sql_attrs), \
-                sql.SQL(', ').join(sql.Placeholder() * len(self.attrs)))
+                self._placeholders(len(self.attrs),prepared))
     
         return query
 
 
+    def statement(self,kind):
+        """
+        Returns the server-side prepared statement of kind "insert"
+        (see query_insert) as tuple of name, PREPARE query and 
+        number of parameters. The statement is constructed once 
+        per relation.
+        """
+
+        if (kind not in self._statements):
+            query = self.query_insert(prepared=True)
+            name = f"{kind}_{self.name}"
+            prepare = sql.SQL("PREPARE {} AS {}").format( \
+                      sql.Identifier(name),query)
+            self._statements[kind] = (name,prepare,len(self.attrs))
+
+        return self._statements[kind]
+
+
+    def query_staging(self):
+        """
+        Constructs queries to load the relation via a staging table:
+        CREATE the staging table, COPY tuples into it and INSERT them
+        into the relation.
+        """
+
+        staging = sql.Identifier("staging_"+self.name)
+        attrs = sql.SQL(', ').join(self._sql_attrs)
+
+        create = sql.SQL("""CREATE TEMPORARY TABLE {} (LIKE {}) 
+                            ON COMMIT DROP;""") \
+                .format(staging,self._sql_name)
+        copy = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv);") \
+              .format(staging,attrs)
+        insert = sql.SQL("""INSERT INTO {} ({}) SELECT {} FROM {} 
+                            ON CONFLICT DO NOTHING;""") \
+                .format(self._sql_name,attrs,attrs,staging)
+
+        return create,copy,insert
+
+
+    def unique_indices(self):
+        """Returns indices of attributes with PRIMARY KEY or UNIQUE."""
+
+        indices = [ii for ii in range(len(self.attrs)) \
+                   if (ii < len(self.keys) and self.keys[ii]=="PRIMARY KEY") \
+                   or "UNIQUE" in self.cstrs[ii]]
+
+        return indices
+
+
     def fk_constraints(self):
         """Sets foreign key constraints for the relation."""
    
@@ -165,6 +279,32 @@ class Relation:
             yield query
 
 
+    @staticmethod
+    def _expand_year(year):
+        """
+        Expand year to four digits while assuming the youngest
+        timespan possible. Results are kept in the year table.
+        """
+
+        new_year = Relation._year_table.get(year)
+        if (new_year is None):
+            new_year = year
+            # check if digits in year are missing
+            if (len(year)<4):
+                year_20 = int("20"+year)
+                current_year = date.today().year
+
+                # check if year has already passed
+                if ((year_20-current_year) > 0):
+                    new_year = "19"+year
+                else:
+                    new_year = str(year_20)
+
+            Relation._year_table[year] = new_year
+
+        return new_year
+
+
     @staticmethod
     def _check_date(old_date):
         """
@@ -173,23 +313,27 @@ class Relation:
         than 100 years).
         """
         
-        new_date = old_date
         date_list = old_date.split("/")
+        date_list[2] = Relation._expand_year(date_list[2])
+        new_date = "/".join(date_list)
+
+        return new_date
 
-        # check if digits in year are missing
-        if (len(date_list[2])<4):
-            year_20 = int("20"+date_list[2])
-            current_year = date.today().year
 
-            # check if year has already passed
-            if ((year_20-current_year) > 0):
-                date_list[2] = "19"+date_list[2]
-            else:
-                date_list[2] = year_20
+    @staticmethod
+    def convert_dates(column):
+        """
+        Expand years of a whole DATE column to four digits 
+        (see _check_date). Every distinct year is expanded once, 
+        the column is mapped through the year table.
+        """
 
-            new_date = "/".join(date_list)
+        parts = [old_date.rpartition("/") for old_date in column]
+        for year in set(part[2] for part in parts):
+            Relation._expand_year(year)
+        year_table = Relation._year_table
 
-        return new_date
+        return [head+sep+year_table[year] for head,sep,year in parts]
 
 
     def create_attr_dict(self,src_attr):
@@ -221,18 +365,34 @@ class Relation:
         return line_checked
 
 
+    def convert_lines(self,lines):
+        """
+        Converts many lines of input column by column
+        (see convert_line), DATE columns are converted at once.
+        """
+
+        columns = [[line[self._attr_dict[attr]] for line in lines] \
+                   for attr in self._attr_dict.keys()]
+        columns_checked = [Relation.convert_dates(columns[ii]) \
+                           if (self.types[ii]=="DATE") else columns[ii] \
+                           for ii in range(len(columns))]
+
+        return list(zip(*columns_checked))
+
+
     @staticmethod
-    def create_table(header,content):
+    def create_table(header,content,widths=None):
         """
         Creates table representation of a query with header 
-        and content.
+        and content (optional: fixed column widths).
         """
 
         # setup
         table = Table(box=rich.box.ASCII)
         # columns
-        for attr in header:
-            table.add_column(attr)
+        widths = widths or [None]*len(header)
+        for attr,width in zip(header,widths):
+            table.add_column(attr,width=width,overflow="fold")
         # add rows
         for entry in content:
             table.add_row(*entry)
@@ -255,6 +415,66 @@ class Relation:
         rich.print(table,file=fname)
 
 
+    @staticmethod
+    def fetch_pages(cursor,page_size=PAGE_SIZE):
+        """
+        Fetches result of a query from cursor (server-side for 
+        named cursors) in pages of page_size rows as strings.
+        """
+
+        while True:
+            page = cursor.fetchmany(page_size)
+            if (not bool(page)):
+                break
+            yield [tuple(map(str,entry)) for entry in page]
+
+
+    @staticmethod
+    def column_widths(header,sample):
+        """
+        Returns column widths for a sample of rows, at most 
+        MAX_COLUMN_WIDTH characters.
+        """
+
+        widths = [len(attr) for attr in header]
+        for entry in sample:
+            widths = [max(width,len(value)) \
+                      for width,value in zip(widths,entry)]
+
+        return [min(width,MAX_COLUMN_WIDTH) for width in widths]
+
+
+    @staticmethod
+    def print_pages(cursor,page_size=PAGE_SIZE):
+        """
+        Displays result of a query page by page as soon as a page
+        is fetched, column widths are taken from the first page.
+        On a terminal, the user is asked before every further page.
+        Returns the header of the query.
+        """
+
+        console = Console()
+        pages = Relation.fetch_pages(cursor,page_size)
+        first_page = next(pages,[])
+        # description of named cursors is set by the first fetch
+        header = tuple(name[0] for name in cursor.description)
+        widths = Relation.column_widths(header,first_page)
+
+        num_rows = 0
+        for page in itertools.chain([first_page],pages):
+            console.print(Relation.create_table(header,page,widths))
+            num_rows += len(page)
+            if (len(page) < page_size):
+                break
+            if (sys.stdin.isatty()):
+                answer = input(f"-- {num_rows} rows, Enter: next page, "+ \
+                               "q+Enter: stop -- ")
+                if (answer.strip()=="q"):
+                    break
+
+        return header
+
+
     @staticmethod
     def export_csv(content,fname):
         """Export query as csv file."""
@@ -270,6 +490,149 @@ class Relation:
             print(msg)
 
 
+class ConnectionPool:
+    """
+    A class to represent a pool of database connections.
+    Connections stay open between borrows, so their session 
+    state (e.g. prepared statements) is reused.
+
+    ...
+
+    Attributes
+    ----------
+    user : User object
+        login data for the SQL server
+    max_size : int
+        maximum number of connections per database
+    _pools : dictionary
+        psycopg2 connection pools by database name
+    _prepared : dictionary
+        EXECUTE queries of the prepared statements by connection 
+        and statement name
+    timings : dictionary
+        number of executions, PREPARE and EXECUTE time in seconds
+        by statement name
+
+    Instance Methods
+    ----------------
+    connection(dbname,autocommit=False):
+        Borrows a connection to dbname and returns it afterwards.
+    execute(cursor,statement,params):
+        Executes a prepared statement, prepares it once per connection.
+    report():
+        Returns PREPARE and EXECUTE timings of the prepared statements.
+    close(dbname):
+        Closes all connections to dbname.
+    close_all():
+        Closes all connections.
+    """
+
+    def __init__(self,user,max_size=2):
+        """Constructs necessary attributes of the ConnectionPool object."""
+
+        self.user = user
+        self.max_size = max_size
+        self._pools = dict()
+        self._prepared = dict()
+        self.timings = dict()
+
+
+    @contextmanager
+    def connection(self,dbname,autocommit=False):
+        """
+        Borrows a connection to dbname and returns it afterwards.
+        The transaction is committed on success and rolled back 
+        on errors.
+        """
+
+        if (dbname not in self._pools):
+            # one connection is opened right away and kept idle
+            self._pools[dbname] = pool.SimpleConnectionPool( \
+                                      1,self.max_size, \
+                                      dbname=dbname, \
+                                      host="localhost", \
+                                      port="5432", \
+                                      user=self.user.name, \
+                                      password=self.user.passwd)
+        conn_pool = self._pools[dbname]
+
+        conn = conn_pool.getconn()
+        conn.autocommit = autocommit
+        try:
+            yield conn
+            if (not autocommit):
+                conn.commit()
+        except BaseException:
+            if (not conn.closed):
+                conn.rollback()
+            raise
+        finally:
+            if (not conn.closed):
+                conn.autocommit = False
+            else:
+                # prepared statements are lost with the session
+                self._prepared.pop(conn,None)
+            conn_pool.putconn(conn,close=bool(conn.closed))
+
+
+    def execute(self,cursor,statement,params):
+        """
+        Executes statement (name, PREPARE query, number of parameters)
+        with params. The statement is parsed by the server once per 
+        connection (PREPARE), rows only EXECUTE it.
+        """
+
+        name,prepare,num_params = statement
+        prepared = self._prepared.setdefault(cursor.connection,dict())
+        timing = self.timings.setdefault(name,[0,0.0,0.0])
+
+        if (name not in prepared):
+            start = time.perf_counter()
+            cursor.execute(prepare)
+            timing[1] += time.perf_counter() - start
+            # EXECUTE query is rendered once as well
+            prepared[name] = sql.SQL("EXECUTE {} ({});").format( \
+                             sql.Identifier(name), \
+                             sql.SQL(', ').join( \
+                                 sql.Placeholder() * num_params)) \
+                            .as_string(cursor)
+
+        start = time.perf_counter()
+        cursor.execute(prepared[name],params)
+        timing[0] += 1
+        timing[2] += time.perf_counter() - start
+
+
+    def report(self):
+        """Returns PREPARE and EXECUTE timings of the prepared statements."""
+
+        msg = "Prepared statements:"
+        for name,(num_exec,t_prepare,t_execute) in self.timings.items():
+            t_mean = t_execute / max(num_exec,1)
+            msg += f"\n    {name}: PREPARE {t_prepare*1e3:.2f} ms once, " \
+                  +f"{num_exec} x EXECUTE {t_mean*1e3:.3f} ms " \
+                  +f"({t_execute:.2f} s)"
+
+        return msg
+
+
+    def close(self,dbname):
+        """Closes all connections to dbname."""
+
+        if (dbname in self._pools):
+            self._pools.pop(dbname).closeall()
+            # prepared statements are lost with the session
+            for conn in [conn for conn in self._prepared if conn.closed]:
+                self._prepared.pop(conn)
+
+
+    def close_all(self):
+        """Closes all connections."""
+
+        for dbname in list(self._pools.keys()):
+            self.close(dbname)
+
+
 def check_db_connection(function):
     """Decorator checking if the database exists."""
 
@@ -299,13 +662,27 @@ class Database:
         name of the file to store the Test-suite output
     relations : list of Relation objects
         relations contained in the Database
+    bulk : bool
+        fill relations with COPY instead of INSERT
+    pool : ConnectionPool object
+        connections shared by all methods (None until first use)
 
     Instance Methods
     ----------------
+    check_credentials(user):
+        Checks Username and Password.
+    connection(user,dbname=None,autocommit=False):
+        Borrows a pooled connection (default: to the Database).
+    close_connections():
+        Closes all pooled connections.
     create_database(user):
         Creates database.
     initialize_relations():
         Initializes relations for the database.
+    bulk_load(reader,cursor):
+        Fills relations with COPY in a single pass over the input.
+    clean_csv(fname_in,fname_out):
+        Writes input with four-digit years in all DATE columns.
     setup_relations(user):
         Creates and fills relations.
     add_constraints(user):
@@ -313,65 +690,79 @@ class Database:
     test_suite(user):
         Provides sample queries and their output to verify 
         the created database.
-
-    Class Methods
-    -------------
-    check_credentials(user):
-        Checks Username and Password.
     """
 
-    def __init__(self,name,fname,tests):
+    def __init__(self,name,fname,tests,bulk=False):
         """Constructs necessary attributes of the Database object."""
 
         self.name = name
         self.fname = fname
         self.tests = tests
         self.relations = None
+        self.bulk = bulk
+        self.pool = None
 
 
-    @staticmethod
-    def check_credentials(user):
-        """Checks Username and Password."""
+    def check_credentials(self,user):
+        """
+        Checks Username and Password. The connection pool is 
+        configured with the login data on success.
+        """
 
         connected = False
+        self.close_connections()
         try:
-            conn = psycopg2.connect(dbname="postgres",
-                                    host="localhost",
-                                    port="5432",
-                                    user=user.name,
-                                    password=user.passwd)
-            conn.close()
+            with self.connection(user,"postgres"):
+                pass
         except psycopg2.errors.OperationalError:
             msg = "Error: Wrong Username or Password."
             print(msg)
+            self.close_connections()
         else:
             connected = True
 
         return connected
 
 
+    def connection(self,user,dbname=None,autocommit=False):
+        """
+        Borrows a pooled connection to dbname (default: the 
+        Database) for a with-statement. The pool is configured
+        once from user.
+        """
+
+        if (self.pool is None):
+            self.pool = ConnectionPool(user)
+
+        return self.pool.connection(dbname or self.name,autocommit)
+
+
+    def close_connections(self):
+        """Closes all pooled connections."""
+
+        if (self.pool is not None):
+            self.pool.close_all()
+            self.pool = None
+
+
     def create_database(self,user):
         """Creates database."""
     
-        conn = psycopg2.connect(dbname="postgres",
-                                host="localhost",
-                                port="5432",
-                                user=user.name,
-                                password=user.passwd)
-        conn.autocommit = True
-        cursor = conn.cursor()
+        with self.connection(user,"postgres",autocommit=True) as conn:
+            cursor = conn.cursor()
    
-        # remove database if it exists already
-        query = sql.SQL("DROP DATABASE IF EXISTS {};") \
-               .format(sql.Identifier(self.name))
-        cursor.execute(query)
-        # create database
-        query = sql.SQL("CREATE DATABASE {};") \
-               .format(sql.Identifier(self.name))
-        cursor.execute(query)
-        
-        cursor.close()
-        conn.close()
+            # remove database if it exists already
+            # (idle pooled connections would block it)
+            self.pool.close(self.name)
+            query = sql.SQL("DROP DATABASE IF EXISTS {};") \
+                   .format(sql.Identifier(self.name))
+            cursor.execute(query)
+            # create database
+            query = sql.SQL("CREATE DATABASE {};") \
+                   .format(sql.Identifier(self.name))
+            cursor.execute(query)
+
+            cursor.close()
     
     
     def initialize_relations(self):
@@ -430,66 +821,148 @@ class Database:
                           projects,clients]
 
 
+    def bulk_load(self,reader,cursor):
+        """
+        Fills relations with COPY in a single pass over the input.
+        Tuples are deduplicated in memory on their PRIMARY KEY and
+        UNIQUE attributes (first occurrence wins, as with
+        ON CONFLICT DO NOTHING), spooled as csv and copied into 
+        staging tables, which are inserted into the relations.
+        """
+
+        # spool to disk beyond 64 MiB per relation
+        max_size = 64*1024**2
+        spools = [tempfile.SpooledTemporaryFile(max_size=max_size, \
+                                                mode="w+",newline="") \
+                  for relation in self.relations]
+        writers = [csv.writer(spool,quoting=csv.QUOTE_ALL) \
+                   for spool in spools]
+        uniques = [relation.unique_indices() for relation in self.relations]
+        seen = [[set() for ii in unique] for unique in uniques]
+
+        # single pass over the input, column-wise in chunks
+        chunk_size = 10000
+        while True:
+            chunk = list(itertools.islice(reader,chunk_size))
+            if (not bool(chunk)):
+                break
+            for jj,relation in enumerate(self.relations):
+                for line_converted in relation.convert_lines(chunk):
+                    keys = [line_converted[ii] for ii in uniques[jj]]
+                    if (any([key in seen[jj][kk] \
+                             for kk,key in enumerate(keys)])):
+                        continue
+                    for kk,key in enumerate(keys):
+                        seen[jj][kk].add(key)
+                    writers[jj].writerow(line_converted)
+
+        # load relations
+        for jj,relation in enumerate(self.relations):
+            create,copy,insert = relation.query_staging()
+            spools[jj].seek(0)
+            cursor.execute(create)
+            cursor.copy_expert(copy.as_string(cursor),spools[jj])
+            cursor.execute(insert)
+            spools[jj].close()
+
+
+    def clean_csv(self,fname_in,fname_out):
+        """
+        Writes input fname_in with four-digit years in all DATE 
+        columns of the relations to fname_out (replaces the awk 
+        pipeline of modify_date.sh). Returns True on success.
+        """
+
+        written = False
+        date_attrs = {attr for relation in self.relations \
+                      for attr,attr_type in zip(relation.attrs, \
+                                                relation.types) \
+                      if attr_type=="DATE"}
+
+        try:
+            with open(fname_in,newline="") as csvfile, \
+                 open(fname_out,"w",newline="") as cleanfile:
+                reader = csv.reader(csvfile,delimiter=",")
+                writer = csv.writer(cleanfile,delimiter=",",quotechar="\"", \
+                                    quoting=csv.QUOTE_MINIMAL)
+                header = next(reader)
+                writer.writerow(header)
+                date_indices = [header.index(attr) for attr in date_attrs \
+                                if attr in header]
+
+                chunk_size = 10000
+                while True:
+                    chunk = list(itertools.islice(reader,chunk_size))
+                    if (not bool(chunk)):
+                        break
+                    columns = [list(column) for column in zip(*chunk)]
+                    for ii in date_indices:
+                        columns[ii] = Relation.convert_dates(columns[ii])
+                    writer.writerows(zip(*columns))
+            written = True
+
+        except FileNotFoundError:
+            msg = f"Error: The file {fname_in} does not exist."
+            print(msg)
+        except PermissionError:
+            msg = f"Error: You lack permission to access {fname_out}."
+            print(msg)
+
+        return written
+
+
     @check_db_connection
     def setup_relations(self,user):
         """Creates and fills relations."""
     
-        conn = psycopg2.connect(dbname=self.name,
-                                host="localhost",
-                                port="5432",
-                                user=user.name,
-                                password=user.passwd)
-        cursor = conn.cursor()
+        with self.connection(user) as conn:
+            cursor = conn.cursor()
        
-        try:
-            with open(self.fname,newline="") as csvfile:
-                reader = csv.reader(csvfile, delimiter = ",")
-    
-                # create relations
-                header = next(reader)
-                for relation in self.relations:
-                    relation.create_attr_dict(header)
-                    query = relation.query_create()
-                    cursor.execute(query)
+            try:
+                with open(self.fname,newline="") as csvfile:
+                    reader = csv.reader(csvfile, delimiter = ",")
     
-                # fill relations
-                for line in reader:
+                    # create relations
+                    header = next(reader)
                     for relation in self.relations:
-                        line_converted = relation.convert_line(line)
-
-                        query = relation.query_insert()
-                        cursor.execute(query,line_converted)
+                        relation.create_attr_dict(header)
+                        query = relation.query_create()
+                        cursor.execute(query)
     
-        except FileNotFoundError:
-            msg = f"Error: The file {csvfile} does not exist."
-            print(msg)
-        except PermissionError:
-            msg = f"Error: You lack permission to read {csvfile}."
-            print(msg)
+                    # fill relations
+                    if (self.bulk):
+                        self.bulk_load(reader,cursor)
+                    else:
+                        for line in reader:
+                            for relation in self.relations:
+                                line_converted = relation.convert_line(line)
+
+                                self.pool.execute(cursor, \
+                                        relation.statement("insert"), \
+                                        line_converted)
     
-        conn.commit()
-        cursor.close()
-        conn.close()
+            except FileNotFoundError:
+                msg = f"Error: The file {csvfile} does not exist."
+                print(msg)
+            except PermissionError:
+                msg = f"Error: You lack permission to read {csvfile}."
+                print(msg)
+    
+            cursor.close()
     
     
     @check_db_connection
     def add_constraints(self,user):
         """Adds constraints to database."""
     
-        conn = psycopg2.connect(dbname=self.name,
-                                host="localhost",
-                                port="5432",
-                                user=user.name,
-                                password=user.passwd)
-        cursor = conn.cursor()
+        with self.connection(user) as conn:
+            cursor = conn.cursor()
       
-        for relation in self.relations:
-            for query in relation.fk_constraints():
-                cursor.execute(query)
+            for relation in self.relations:
+                for query in relation.fk_constraints():
+                    cursor.execute(query)
         
-        conn.commit()
-        cursor.close()
-        conn.close()
+            cursor.close()
     
     
     @check_db_connection
@@ -575,43 +1048,37 @@ class Database:
                    INNER JOIN positions ON employees.\"PositionID\"=positions.\"PositionID\";
                    """]
     
-        conn = psycopg2.connect(dbname=self.name,
-                                host="localhost",
-                                port="5432",
-                                user=user.name,
-                                password=user.passwd)
-        cursor = conn.cursor()
+        with self.connection(user) as conn:
+            cursor = conn.cursor()
    
-        # table representation
-        try:
-            with open(self.tests,"w",newline="") as test_file:
-                for ii in range(len(tasks)):
-                    test_file.write("\n" \
-                                   +textwrap.dedent(tasks[ii]).strip() \
-                                   +":\n")
-                    cursor.execute(queries[ii])
-                    header = tuple(name[0] for name in cursor.description)
-                    response = [tuple(map(str,entry)) \
-                                for entry in cursor.fetchall()]
-                    table = Relation.create_table(header,response)
-                    test_file.write(textwrap.dedent(queries[ii])+"\n")
-                    Relation.write_table(table,test_file)
+            # table representation
+            try:
+                with open(self.tests,"w",newline="") as test_file:
+                    for ii in range(len(tasks)):
+                        test_file.write("\n" \
+                                       +textwrap.dedent(tasks[ii]).strip() \
+                                       +":\n")
+                        cursor.execute(queries[ii])
+                        header = tuple(name[0] for name in cursor.description)
+                        response = [tuple(map(str,entry)) \
+                                    for entry in cursor.fetchall()]
+                        table = Relation.create_table(header,response)
+                        test_file.write(textwrap.dedent(queries[ii])+"\n")
+                        Relation.write_table(table,test_file)
     
-        except PermissionError:
-            msg = f"Error: You lack permission to create {fname}."
-            print(msg)
-
-        # csv file
-        cursor.execute(queries[0])
-        header = list(name[0] for name in cursor.description)
-        response = [list(map(str,entry)) \
-                    for entry in cursor.fetchall()]
-        Relation.export_csv([header,*response], \
-                            self.tests.split(".")[0]+".csv")
+            except PermissionError:
+                msg = f"Error: You lack permission to create {fname}."
+                print(msg)
+
+            # csv file
+            cursor.execute(queries[0])
+            header = list(name[0] for name in cursor.description)
+            response = [list(map(str,entry)) \
+                        for entry in cursor.fetchall()]
+            Relation.export_csv([header,*response], \
+                                self.tests.split(".")[0]+".csv")
     
-        conn.commit()
-        cursor.close()
-        conn.close()
+            cursor.close()
 
 
 class User:
@@ -648,54 +1115,57 @@ class User:
 
 
 @check_db_connection
-def interactive_queries(user,db_name):
+def interactive_queries(user,db):
     """Run queries interactively."""
 
-    conn = psycopg2.connect(dbname=db_name,
-                            host="localhost",
-                            port="5432",
-                            user=user.name,
-                            password=user.passwd)
-    cursor = conn.cursor()
+    with db.connection(user) as conn:
+        cursor = conn.cursor()
     
-    input_quit = ""
-    while (input_quit!="q"):
+        input_quit = ""
+        while (input_quit!="q"):
     
-        # read query
-        print("Enter query:")
-        input_list = []
-        while True:
-            line = input()
-            input_list.append(line)
-            if (";" in line):
-                line = line[:line.index(";")+1]
-                input_list[-1] = line
-                break
-        query = " ".join(input_list)
+            # read query
+            print("Enter query:")
+            input_list = []
+            while True:
+                line = input()
+                input_list.append(line)
+                if (";" in line):
+                    line = line[:line.index(";")+1]
+                    input_list[-1] = line
+                    break
+            query = " ".join(input_list)
+
+            # queries only reading rows run in a server-side cursor
+            # (DECLARE CURSOR refuses data-modifying WITH, SELECT INTO)
+            is_select = (query.split(None,1)[0].lower() \
+                         in ("select","with","values","table") and \
+                         not re.search(r"\b(insert|update|delete|" \
+                                       r"merge|into)\b",query,re.I))
+            result = conn.cursor(name="interactive") if (is_select) \
+                     else cursor
   
-        cursor.execute('SAVEPOINT sp;')
-        try:
-            cursor.execute(query)
-        except psycopg2.errors.UndefinedColumn:
-            msg = "Error: Cannot find attribute."
-            print(msg)
-            cursor.execute('ROLLBACK TO SAVEPOINT sp;')
-        except psycopg2.errors.UndefinedTable:
-            msg = "Error: Cannot find table."
-            print(msg)
-            cursor.execute('ROLLBACK TO SAVEPOINT sp;')
-        else:
-            # display table
-            header = tuple(name[0] for name in cursor.description)
-            response = [tuple(map(str,entry)) for entry in cursor.fetchall()]
-            table = Relation.create_table(header,response)
-            Relation.print_table(table)
+            cursor.execute('SAVEPOINT sp;')
+            try:
+                result.execute(query)
+            except psycopg2.errors.UndefinedColumn:
+                msg = "Error: Cannot find attribute."
+                print(msg)
+                cursor.execute('ROLLBACK TO SAVEPOINT sp;')
+            except psycopg2.errors.UndefinedTable:
+                msg = "Error: Cannot find table."
+                print(msg)
+                cursor.execute('ROLLBACK TO SAVEPOINT sp;')
+            else:
+                # display table page by page
+                if (is_select or result.description is not None):
+                    Relation.print_pages(result)
+                if (is_select):
+                    result.close()
     
-        input_quit = input("\nPress q+Enter to quit or Enter to continue... ")
+            input_quit = input("\nPress q+Enter to quit or Enter to continue... ")
     
-    conn.commit()
-    cursor.close()
-    conn.close()
+        cursor.close()
 
 
 def main():
@@ -705,6 +1175,8 @@ def main():
         *Runs a set of SQL-queries to check execution.
     Interactive-mode:
         Processes queries on created database.
+    Clean-mode:
+        Expands years of the input to four digits (no login).
     """
 
     print("\n| OverVIEW of AlphaTech Consulting |\n")
@@ -712,7 +1184,19 @@ def main():
     db_name = "alphatech"
     db_fname = "AlphaTechConsultigEmployees.csv"
     db_tests = "AlphaTech_tests.txt"
-    db = Database(db_name,db_fname,db_tests)
+    bulk = ("--bulk" in sys.argv[2:])
+    db = Database(db_name,db_fname,db_tests,bulk)
+
+    if (len(sys.argv)>=2 and sys.argv[1]=="--clean"):
+        print("| Clean-mode |\n")
+        fname_in = sys.argv[2] if (len(sys.argv)>=3) \
+                   else "AlphaTechConsultigEmployees_cleaned.csv"
+        fname_out = sys.argv[3] if (len(sys.argv)>=4) \
+                    else fname_in.rsplit(".",1)[0]+"_datefix.csv"
+        db.initialize_relations()
+        if (db.clean_csv(fname_in,fname_out)):
+            print(f"Written {fname_out}.")
+        return
 
     # get login data
     print("Provide login details for the database.")
@@ -722,7 +1206,7 @@ def main():
         user.get_login()
         connected = db.check_credentials(user)
 
-    if (len(sys.argv)==2):
+    if (len(sys.argv)>=2):
         mode = sys.argv[1]
     else:
         mode = "-i"
@@ -741,6 +1225,8 @@ def main():
             db.initialize_relations()
             db.setup_relations(user)
             print("Database relations created and filled.\n")
+            if (bool(db.pool.timings)):
+                print(db.pool.report()+"\n")
             
             # set foreign key constraints
             print("Adding constraints...")
@@ -762,7 +1248,10 @@ def main():
         print("\n| Interactive-mode |\n")
 
         # run queries
-        interactive_queries(user,db.name)
+        interactive_queries(user,db)
+
+    # clean up
+    db.close_connections()
 
 
 if (__name__ == "__main__"):
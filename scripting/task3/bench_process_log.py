@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of LogFile.process_log in checkLogins.
+Scales auth.log up (default x1000) and reports lines/second
+of the former per-line regex parsing (before) and of the
+precompiled single-pass matcher (after).
+
+Usage:
+    python3 bench_process_log.py [scale]
+"""
+
+# Python Standard Library
+import re
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime
+
+# Local
+from check_logins_OOP import LogFile
+
+
+class LegacyLogFile(LogFile):
+    """
+    LogFile with the parsing of process_log as before the
+    precompiled matcher (uncompiled patterns for each line).
+    """
+
+    @staticmethod
+    def legacy_filter(logged_sessions,pid,message,user_list):
+        """Filter a message for attributes."""
+
+        # IP address
+        pattern = r"("+r"[0-9]{1,3}\."*3+r"[0-9]{1,3})"
+        search = re.search(pattern,message)
+        if (bool(search)):
+            logged_sessions[pid]["ip_address"] = search.group(1)
+
+        # username, user existence
+        pattern = r"(password for |user |user=)(?!invalid|unknown)(\w+)"
+        search = re.search(pattern,message)
+        if (bool(search)):
+            logged_sessions[pid]["user_name"] = search.group(2)
+            logged_sessions[pid]["user_exists"] = \
+                    bool(logged_sessions[pid]["user_name"] in user_list)
+
+        # fail count
+        pattern = r"^Failed password"
+        search = re.search(pattern,message)
+        if (bool(search)):
+            logged_sessions[pid]["fail_count"] += 1
+        pattern = r"message repeated ([0-9]+) times: "+ \
+                  r"\[ Failed password"
+        search = re.search(pattern,message)
+        if (bool(search)):
+            logged_sessions[pid]["fail_count"] += int(search.group(1))
+
+        # login status
+        login_status = "Failed"
+        pattern = r"^Accepted password"
+        if (bool(re.search(pattern,message))):
+            login_status = "Success"
+
+        return logged_sessions,login_status
+
+
+    def process_log(self,user_list,buffer_time,break_time):
+        """Examines Log and extracts relevant data."""
+
+        header = ["pid","fail_count","login_status", \
+                  "first_date_time","last_date_time", \
+                  "ip_address", \
+                  "user_name","user_exists"]
+        yield header
+
+        logged_sessions = dict()
+        service_whitelist = ["sshd"]
+        message_blacklist = ["(sshd:session)","Server listening"]
+
+        for line_log in self._read_log():
+
+            pattern = r"^(.+?)T(.+?)\s(.+?)\s(.+?):\s(.+?)$"
+            line = re.findall(pattern,line_log)[0]
+            date_time = line[0]+" "+line[1].split("+")[0]
+            pid = "-1"
+            service = line[3]
+            message = line[4]
+
+            if (buffer_time > datetime.fromisoformat(date_time)):
+                continue
+
+            if ("[" in service):
+                pattern = r"^(.+?)\[(.+?)\]$"
+                service,pid = re.findall(pattern,service)[0]
+
+            if (service in service_whitelist and \
+                not any([bl_entry in message \
+                     for bl_entry in message_blacklist])):
+
+                if (pid not in logged_sessions.keys()):
+                    logged_sessions[pid] = dict()
+                    logged_sessions[pid]["fail_count"] = 0
+                    logged_sessions[pid]["first_date_time"] = date_time
+
+                logged_sessions,login_status = self.legacy_filter( \
+                                                    logged_sessions, \
+                                                    pid,message, \
+                                                    user_list)
+
+                if ("ip_address" not in logged_sessions[pid].keys() or \
+                    "user_name" not in logged_sessions[pid].keys()):
+                    continue
+
+                if (break_time >= datetime.fromisoformat(date_time)):
+                    continue
+
+                line_sorted = [pid, \
+                               logged_sessions[pid]["fail_count"], \
+                               login_status, \
+                               logged_sessions[pid]["first_date_time"], \
+                               date_time, \
+                               logged_sessions[pid]["ip_address"], \
+                               logged_sessions[pid]["user_name"], \
+                               logged_sessions[pid]["user_exists"]]
+                yield line_sorted
+
+
+def scale_log(src,dst,scale):
+    """Writes src scale times to dst, returns number of lines."""
+
+    with open(src,"r") as logfile:
+        content = logfile.read()
+    with open(dst,"w") as logfile:
+        for ii in range(scale):
+            logfile.write(content)
+
+    return content.count("\n")*scale
+
+
+def run(log_file,user_list):
+    """Consumes process_log, returns elapsed time in seconds."""
+
+    # process every line
+    buffer_time = datetime.min
+    break_time = datetime.min
+
+    start = time.perf_counter()
+    for line in log_file.process_log(user_list,buffer_time,break_time):
+        pass
+
+    return time.perf_counter() - start
+
+
+def main():
+    """Runs before/after benchmark of process_log."""
+
+    scale = int(sys.argv[1]) if (len(sys.argv)>1) else 1000
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), \
+                       "auth.log")
+    user_list = ["jan","ironman","mira","spiderman"]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        num_lines = scale_log(src,f"{tmpdir}/auth.log",scale)
+        print(f"auth.log x{scale}: {num_lines} lines")
+
+        for label,cls in (("before",LegacyLogFile),("after",LogFile)):
+            elapsed = run(cls("auth.log",tmpdir),user_list)
+            print(f"{label:>6}: {num_lines/elapsed:12.0f} lines/s " \
+                 +f"({elapsed:.2f} s)")
+
+
+if (__name__ == "__main__"):
+    main()
@@ -14,12 +14,79 @@ User-mode:
 Setup-mode: (Experimental)
     Setup a cronjob to run the script in
     Append-mode regularly.
+Follow-mode:
+    Reads newly appended lines of the Log continuously
+    and pushes them to the database.
+
+Options:
+    --batch_size N
+        Number of Log lines written per statement
+        (default 1000, 0 writes line by line with prepared 
+        statements and reports their timings in Create-mode).
+    --cache_size N
+        Maximum number of cached user and IP-address ids
+        (default 10000).
+    --poll N
+        Seconds to wait for new lines in Follow-mode (default 1).
+    --workers N
+        Number of processes parsing the Log in Create- and 
+        Append-mode (default 1), of hosts parsed at once with 
+        --hosts.
+    --flush_interval N
+        Seconds of Log time after which the states of open sessions
+        are written (default 0: once per session when it is closed
+        or expires).
+    --detect
+        Report sources (IP addresses, user names) with at least
+        --max_failures N (default 10) failed passwords within 
+        --window N seconds (default 60) while processing the Log.
+        Alerts are printed and written to the relation alerts.
+    --pipeline
+        Append in concurrent stages (read, parse, write) 
+        connected by bounded queues, stops cleanly on SIGTERM.
+    --queue_size N
+        Number of chunks queued between the stages of 
+        --pipeline (default 4).
+    --partition
+        Create the relation sessions range-partitioned by month
+        of first_date_time in Create-mode, partitions are added
+        while appending.
+    --retention N
+        Keep the sessions of the N months before the month of the
+        last database entry when appending, older partitions are
+        dropped (default 0: keep all).
+    --backend NAME
+        Database engine: postgresql (default, server on 
+        localhost:5432), duckdb or sqlite (embedded, file 
+        auth_logs.duckdb/auth_logs.sqlite in the home-directory,
+        no login). DuckDB falls back to SQLite if not installed.
+    --rotated
+        Read the rotation set of the Log in place (auth.log, 
+        auth.log.1, auth.log.2.gz, ...) instead of a copy of 
+        auth.log.
+    --hosts DIR
+        Read the Logs of many hosts in Create- and Append-mode
+        instead of the local Log: every directory of the tree DIR
+        holding an auth.log (rotation set) is a host named by its
+        path relative to DIR. Hosts are parsed concurrently by
+        --workers processes (default: number of CPUs). --pipeline
+        and Follow-mode read the local Log.
 
 Classes:
 
+    Checkpoint
+    Session
+    SessionAggregator
     LogFile
     CronJob
     Relation
+    IdCache
+    CountMinSketch
+    BruteForceDetector
+    ConnectionPool
+    EmbeddedCursor
+    EmbeddedConnection
+    EmbeddedBackend
     Database
     SQLUser
     User
@@ -34,18 +101,653 @@ import csv
 import itertools
 import textwrap
 from functools import wraps
+from contextlib import contextmanager
 import readline
 from datetime import datetime,timedelta
 import os
+import time
+import asyncio
+import signal
+import mmap
+import glob
+import gzip
+import io
+import threading
+import sqlite3
+import socket
+from collections import OrderedDict,namedtuple,deque
+from concurrent.futures import ProcessPoolExecutor,as_completed
 
 # Third-party libraries
+try:
+    import zstandard
+except ImportError:
+    # optional: only needed for zstd-compressed Log files
+    zstandard = None
+try:
+    import duckdb
+    ENGINE_ERRORS = (duckdb.Error,)
+except ImportError:
+    # optional: only needed for the embedded DuckDB backend
+    duckdb = None
+    ENGINE_ERRORS = ()
+try:
+    import pyarrow
+    import pyarrow.csv
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    # optional: only needed for Parquet and Arrow exports
+    pyarrow = None
 import psycopg2
 from psycopg2 import sql
+from psycopg2 import pool
+from psycopg2.extras import execute_values
 import rich
 from rich.table import Table
 from rich.console import Console
 
 
+# Log line: date, time (without timezone), host, service[pid]: message
+LINE_PATTERN = re.compile(r"^(?P<date>[^T]+)T(?P<time>[^\s+]+)\S*\s\S+\s" \
+                          r"(?P<service>[^\s\[:]+)(?:\[(?P<pid>[^\]]+)\])?" \
+                          r":\s(?P<message>.+)$")
+# ssh message: all attributes in one pass (lookaheads from the start)
+MESSAGE_PATTERN = re.compile(r"(?=(?:.*?(?P<ip_address>" \
+                             +r"[0-9]{1,3}\."*3+r"[0-9]{1,3}))?)" \
+                             r"(?=(?:.*?(?:password for |user |user=)" \
+                             r"(?!invalid|unknown)(?P<user_name>\w+))?)" \
+                             r"(?=(?:.*?message repeated (?P<repeated>[0-9]+)" \
+                             r" times: \[ Failed password)?)" \
+                             r"(?:(?P<status>Failed|Accepted) password)?")
+
+# attributes of processed lines of the Log
+HEADER = ["pid","fail_count","login_status", \
+          "first_date_time","last_date_time", \
+          "ip_address", \
+          "user_name","user_exists"]
+# attributes of processed lines tagged with the host of the Log
+HOST_HEADER = [*HEADER,"host_name"]
+
+# compact records of a Log line and of a ssh message
+LogRecord = namedtuple("LogRecord", \
+                       ["date_time","service","pid","message"])
+MessageRecord = namedtuple("MessageRecord", \
+                           ["ip_address","user_name","user_exists", \
+                            "fail_count","login_status"])
+
+# default parameters for ssh login-session
+# (see man sshd_config, CamelCase at underscore)
+MAX_AUTH_TRIES = 6
+LOGIN_GRACE_TIME = timedelta(minutes=2)
+DELAYS = timedelta(minutes=1)
+# lifetime of a ssh login session before authentication
+SESSION_LIFETIME = LOGIN_GRACE_TIME * MAX_AUTH_TRIES + DELAYS
+# time without messages after which an authenticated session is
+# given up (close messages lost to a restart, reboot or rotation)
+SESSION_MAX_AGE = timedelta(days=1)
+# ssh messages closing a session, the last ones of a session
+CLOSE_MESSAGES = ("Received disconnect from","Disconnected from", \
+                  "Disconnecting","Connection closed by")
+FINAL_MESSAGES = ("Disconnected from","Connection closed by")
+
+# rows per page of query results, maximum width of a column
+PAGE_SIZE = 50
+MAX_COLUMN_WIDTH = 40
+
+
+class Checkpoint:
+    """
+    A class to represent a persisted position in a Log file.
+
+    ...
+
+    Attributes
+    ----------
+    fname : str
+        file storing the checkpoint
+    inode : int
+        inode of the Log file (None if unknown)
+    offset : int
+        byte offset after the last processed line
+
+    Methods
+    -------
+    load():
+        Reads checkpoint from file.
+    save():
+        Writes checkpoint to file.
+    """
+
+    def __init__(self,fname):
+        """Constructs necessary attributes of the Checkpoint object."""
+
+        self.fname = fname
+        self.inode = None
+        self.offset = 0
+
+
+    def load(self):
+        """Reads checkpoint from file."""
+
+        try:
+            with open(self.fname,"r") as checkfile:
+                inode,offset = checkfile.read().split()
+                self.inode = int(inode)
+                self.offset = int(offset)
+        except (FileNotFoundError,ValueError):
+            self.inode = None
+            self.offset = 0
+
+
+    def save(self):
+        """Writes checkpoint to file."""
+
+        # replace atomically, a crash keeps the previous checkpoint
+        tmp_fname = self.fname+".tmp"
+        try:
+            with open(tmp_fname,"w") as checkfile:
+                checkfile.write(f"{self.inode} {self.offset}\n")
+            os.replace(tmp_fname,self.fname)
+        except PermissionError:
+            msg = f"You lack permission to create {self.fname}."
+            print(msg)
+
+
+class Session:
+    """
+    A class to represent the state of a ssh login session.
+
+    ...
+
+    Attributes
+    ----------
+    pid, fail_count, login_status, first_date_time, last_date_time,
+    ip_address, user_name, user_exists :
+        attributes of the session according to HEADER
+    line_time : datetime
+        time of the last message of the session
+    authenticated : bool
+        password of the session was accepted
+    closed : bool
+        session was closed
+    pending : bool
+        state after break_time was not yet emitted
+
+    Methods
+    -------
+    record():
+        Returns the state of the session according to HEADER.
+    """
+
+    __slots__ = ("pid","fail_count","login_status","first_date_time", \
+                 "last_date_time","ip_address","user_name","user_exists", \
+                 "line_time","authenticated","closed","pending")
+
+
+    def __init__(self,pid,date_time,line_time):
+        """Constructs necessary attributes of the Session object."""
+
+        self.pid = pid
+        self.fail_count = 0
+        self.login_status = "Failed"
+        self.first_date_time = date_time
+        self.last_date_time = date_time
+        self.ip_address = None
+        self.user_name = None
+        self.user_exists = None
+        self.line_time = line_time
+        self.authenticated = False
+        self.closed = False
+        self.pending = False
+
+
+    def record(self):
+        """Returns the state of the session according to HEADER."""
+
+        return [self.pid,self.fail_count,self.login_status, \
+                self.first_date_time,self.last_date_time, \
+                self.ip_address,self.user_name,self.user_exists]
+
+
+class SessionAggregator:
+    """
+    A class to accumulate ssh login sessions from ssh messages.
+    Every session is emitted once when it is evicted: sessions 
+    with a final close message after DELAYS, sessions still 
+    authenticating or closing (sshd logs the final message of 
+    a disconnect later) after SESSION_LIFETIME (LoginGraceTime 
+    x MaxAuthTries + delays) without messages. Authenticated 
+    sessions are kept until they are closed, at most max_age 
+    without messages (their close messages may never be logged),
+    which bounds the memory of Follow-mode.
+
+    ...
+
+    Attributes
+    ----------
+    user_list : set of str
+        users on the system
+    break_time : datetime
+        only states after break_time are emitted
+    flush_interval : timedelta
+        Log time after which pending states of all sessions are 
+        emitted (None: only on eviction)
+    detector : BruteForceDetector object
+        counts failed passwords (None: no detection)
+    max_age : timedelta
+        time without messages after which authenticated sessions
+        are evicted
+    _sessions : dictionary
+        Session objects by pid
+    _authenticating : OrderedDict
+        sessions before authentication, by time of last message
+    _authenticated : OrderedDict
+        authenticated open sessions, by time of last message
+    _closing : OrderedDict
+        sessions without final close message, by time of last 
+        message
+    _closed : OrderedDict
+        sessions with final close message, by time of last message
+    _last_flush : datetime
+        Log time of the last flush
+
+    Methods
+    -------
+    add(date_time,line_time,pid,message):
+        Adds a ssh message, returns states of evicted sessions.
+    _evict(now):
+        Evicts expired sessions, returns their states.
+    flush():
+        Returns pending states of all sessions.
+    close_all():
+        Evicts all sessions, returns their pending states.
+    """
+
+    def __init__(self,user_list,break_time,flush_interval=None, \
+                 detector=None,max_age=SESSION_MAX_AGE):
+        """Constructs necessary attributes of the SessionAggregator object."""
+
+        self.user_list = set(user_list)
+        self.break_time = break_time
+        self.flush_interval = flush_interval
+        self.detector = detector
+        self.max_age = max_age
+        self._sessions = dict()
+        self._authenticating = OrderedDict()
+        self._authenticated = OrderedDict()
+        self._closing = OrderedDict()
+        self._closed = OrderedDict()
+        self._last_flush = None
+
+
+    def __len__(self):
+        """Returns number of sessions held."""
+
+        return len(self._sessions)
+
+
+    def add(self,date_time,line_time,pid,message):
+        """
+        Adds a ssh message (see LogFile.ssh_lines) to the state 
+        of its session, returns states of evicted sessions.
+        """
+
+        records = self._evict(line_time)
+
+        session = self._sessions.get(pid)
+        if (session is None):
+            # initialization
+            session = Session(pid,date_time,line_time)
+            self._sessions[pid] = session
+            self._authenticating[pid] = session
+        elif (pid in self._closed):
+            self._closed.move_to_end(pid)
+        elif (session.closed):
+            self._closing.move_to_end(pid)
+        elif (not session.authenticated):
+            self._authenticating.move_to_end(pid)
+        else:
+            self._authenticated.move_to_end(pid)
+        session.line_time = line_time
+
+        message_record = LogFile.message_filter(message,self.user_list)
+        if (message_record.ip_address is not None):
+            session.ip_address = message_record.ip_address
+        if (message_record.user_name is not None):
+            session.user_name = message_record.user_name
+            session.user_exists = message_record.user_exists
+        session.fail_count += message_record.fail_count
+
+        if (self.detector is not None and message_record.fail_count > 0):
+            # alerts only after break time (earlier ones are reported)
+            self.detector.add(line_time,session.ip_address, \
+                              session.user_name,message_record.fail_count, \
+                              line_time > self.break_time)
+
+        if (message.startswith(FINAL_MESSAGES)):
+            if (pid not in self._closed):
+                self._authenticating.pop(pid,None)
+                self._authenticated.pop(pid,None)
+                self._closing.pop(pid,None)
+                self._closed[pid] = session
+                session.closed = True
+        elif (not session.closed):
+            if (message.startswith(CLOSE_MESSAGES)):
+                self._authenticating.pop(pid,None)
+                self._authenticated.pop(pid,None)
+                self._closing[pid] = session
+                session.closed = True
+            elif (message_record.login_status=="Success" and \
+                  not session.authenticated):
+                self._authenticating.pop(pid)
+                self._authenticated[pid] = session
+                session.authenticated = True
+
+        # state is emitted only if key-entries are present
+        # and the message is after break time
+        if (session.ip_address is not None and \
+            session.user_name is not None and \
+            line_time > self.break_time):
+            session.login_status = message_record.login_status
+            session.last_date_time = date_time
+            session.pending = True
+
+        if (self.flush_interval is not None):
+            if (self._last_flush is None):
+                self._last_flush = line_time
+            elif (line_time - self._last_flush >= self.flush_interval):
+                records.extend(self.flush())
+                self._last_flush = line_time
+
+        return records
+
+
+    def _evict(self,now):
+        """Evicts sessions expired at Log time now, returns their states."""
+
+        records = []
+        for queue,lifetime in ((self._authenticating,SESSION_LIFETIME), \
+                               (self._authenticated,self.max_age), \
+                               (self._closing,SESSION_LIFETIME), \
+                               (self._closed,DELAYS)):
+            while (bool(queue)):
+                pid,session = next(iter(queue.items()))
+                if (now - session.line_time <= lifetime):
+                    break
+                queue.popitem(last=False)
+                del self._sessions[pid]
+                if (session.pending):
+                    records.append(session.record())
+
+        return records
+
+
+    def flush(self):
+        """Returns pending states of all sessions."""
+
+        records = []
+        for session in self._sessions.values():
+            if (session.pending):
+                records.append(session.record())
+                session.pending = False
+
+        return records
+
+
+    def close_all(self):
+        """Evicts all sessions, returns their pending states."""
+
+        records = self.flush()
+        self._sessions.clear()
+        self._authenticating.clear()
+        self._authenticated.clear()
+        self._closing.clear()
+        self._closed.clear()
+
+        return records
+
+
+class CountMinSketch:
+    """
+    A class to represent a count-min sketch: approximate counts 
+    of arbitrarily many keys in fixed memory, never below the 
+    true count.
+
+    ...
+
+    Attributes
+    ----------
+    width : int
+        counters per row
+    depth : int
+        rows (independent hashes)
+    _rows : list of list of int
+        counters
+    _touched : set of tuple
+        (row, column) of the counters added to since the last 
+        clear, so that subtract and clear cost only those
+
+    Methods
+    -------
+    _columns(key):
+        Returns the counter of key in every row.
+    add(key,count,columns=None):
+        Adds count to key.
+    estimate(key,columns=None):
+        Returns the estimated count of key.
+    subtract(other):
+        Subtracts the counters of the sketch other.
+    clear():
+        Resets all counters added to.
+    """
+
+    def __init__(self,width,depth):
+        """Constructs necessary attributes of the CountMinSketch object."""
+
+        self.width = width
+        self.depth = depth
+        self._rows = [[0]*width for ii in range(depth)]
+        self._touched = set()
+
+
+    def _columns(self,key):
+        """Returns the counter of key in every row."""
+
+        return [hash((row,key)) % self.width for row in range(self.depth)]
+
+
+    def add(self,key,count,columns=None):
+        """Adds count to key."""
+
+        columns = columns or self._columns(key)
+        for row,column in zip(self._rows,columns):
+            row[column] += count
+        self._touched.update(enumerate(columns))
+
+
+    def estimate(self,key,columns=None):
+        """Returns the estimated count of key."""
+
+        columns = columns or self._columns(key)
+
+        return min([row[column] for row,column in zip(self._rows,columns)])
+
+
+    def subtract(self,other):
+        """Subtracts the counters of the sketch other."""
+
+        for row,column in other._touched:
+            self._rows[row][column] -= other._rows[row][column]
+
+
+    def clear(self):
+        """Resets all counters added to."""
+
+        for row,column in self._touched:
+            self._rows[row][column] = 0
+        self._touched.clear()
+
+
+class BruteForceDetector:
+    """
+    A class to detect brute-force attempts: sources (IP addresses, 
+    user names) with at least max_failures failed passwords within 
+    window. Failures are counted in num_buckets time buckets 
+    (sliding window with a resolution of window/num_buckets):
+    *exactly for up to max_tracked recently active sources per kind
+     (ring buffer of bucket counts per source)
+    *approximately for all sources (count-min sketch per bucket), 
+     used for sources not tracked exactly (long tail)
+
+    ...
+
+    Attributes
+    ----------
+    max_failures : int
+        failures within window raising an alert
+    window : timedelta
+        length of the sliding window
+    num_buckets : int
+        time buckets per window
+    max_tracked : int
+        maximum number of sources counted exactly per kind
+    alerts : deque of tuple
+        alerts not yet written (kind, source, failures, 
+        window_start, detected, estimated)
+    _width : float
+        length of a bucket in seconds
+    _bucket : int
+        index of the current bucket
+    _sketches : list of CountMinSketch objects
+        failures of all sources per bucket
+    _window_sketch : CountMinSketch object
+        failures of all sources within window
+    _tracked : dictionary
+        OrderedDict per kind: [last bucket, bucket counts, first 
+        bucket with complete counts] by source, least recently 
+        active first
+    _alerted : OrderedDict
+        bucket of the last alert by (kind, source)
+
+    Methods
+    -------
+    _advance(bucket):
+        Expires buckets older than window.
+    _count(kind,source,bucket,count):
+        Counts failures of a source, returns failures within window.
+    add(line_time,ip_address,user_name,count,report=True):
+        Counts failures, raises alerts.
+    """
+
+    def __init__(self,max_failures,window,num_buckets=12, \
+                 max_tracked=10000,sketch_width=4096,sketch_depth=4):
+        """Constructs necessary attributes of the BruteForceDetector object."""
+
+        self.max_failures = max_failures
+        self.window = window
+        self.num_buckets = num_buckets
+        self.max_tracked = max_tracked
+        self.alerts = deque()
+
+        self._width = window.total_seconds() / num_buckets
+        self._bucket = None
+        self._sketches = [CountMinSketch(sketch_width,sketch_depth) \
+                          for ii in range(num_buckets)]
+        self._window_sketch = CountMinSketch(sketch_width,sketch_depth)
+        self._tracked = {"ip_address": OrderedDict(), \
+                         "user_name": OrderedDict()}
+        self._alerted = OrderedDict()
+
+
+    def _advance(self,bucket):
+        """Expires buckets older than window when bucket starts."""
+
+        if (self._bucket is None):
+            self._bucket = bucket
+        for expired in range(max(self._bucket+1,bucket-self.num_buckets+1), \
+                             bucket+1):
+            sketch = self._sketches[expired % self.num_buckets]
+            self._window_sketch.subtract(sketch)
+            sketch.clear()
+        self._bucket = max(self._bucket,bucket)
+
+
+    def _count(self,kind,source,bucket,count):
+        """
+        Counts count failures of source in bucket, returns failures 
+        within window and whether they are estimated.
+        """
+
+        key = (kind,source)
+        columns = self._window_sketch._columns(key)
+        # unseen within window: exact count complete right away,
+        # otherwise once the ring covers a whole window
+        is_new = (self._window_sketch.estimate(key,columns) == 0)
+        self._sketches[bucket % self.num_buckets].add(key,count,columns)
+        self._window_sketch.add(key,count,columns)
+
+        tracked = self._tracked[kind]
+        state = tracked.get(source)
+        if (state is None):
+            complete_bucket = bucket if (is_new) else bucket+self.num_buckets
+            state = [bucket,[0]*self.num_buckets,complete_bucket]
+            tracked[source] = state
+            if (len(tracked) > self.max_tracked):
+                # least recently active source to the sketch only
+                tracked.popitem(last=False)
+        else:
+            tracked.move_to_end(source)
+        # clear buckets of the ring passed since the last failure
+        last_bucket,counts,complete_bucket = state
+        for passed in range(max(last_bucket+1,bucket-self.num_buckets+1), \
+                            bucket+1):
+            counts[passed % self.num_buckets] = 0
+        counts[bucket % self.num_buckets] += count
+        state[0] = max(last_bucket,bucket)
+
+        if (bucket >= complete_bucket):
+            return sum(counts),False
+
+        return self._window_sketch.estimate(key,columns),True
+
+
+    def add(self,line_time,ip_address,user_name,count,report=True):
+        """
+        Counts count failures of ip_address and user_name at 
+        line_time, raises alerts (stdout, alerts) if report.
+        """
+
+        bucket = int(line_time.timestamp() // self._width)
+        self._advance(bucket)
+
+        for kind,source in (("ip_address",ip_address), \
+                            ("user_name",user_name)):
+            if (source is None):
+                continue
+            failures,estimated = self._count(kind,source,bucket,count)
+            if (not report or failures < self.max_failures):
+                continue
+
+            # one alert per source and window
+            last_alert = self._alerted.get((kind,source))
+            if (last_alert is not None and \
+                bucket - last_alert < self.num_buckets):
+                continue
+            self._alerted[(kind,source)] = bucket
+            self._alerted.move_to_end((kind,source))
+            if (len(self._alerted) > self.max_tracked):
+                self._alerted.popitem(last=False)
+
+            window_start = line_time - self.window
+            self.alerts.append((kind,source,failures,window_start, \
+                                line_time,estimated))
+            approx = "~" if (estimated) else ""
+            print(f"Alert: {approx}{failures} failed passwords for " \
+                 +f"{kind} {source} within {self.window} " \
+                 +f"before {line_time}.")
+
+
 class LogFile:
     """
     A class to represent a Log file.
@@ -58,6 +760,11 @@ class LogFile:
         name of the Log file
     _location : str
         path to the Log file
+    rotated : bool
+        read the rotation set of the Log (name, name.1, name.2.gz, 
+        ...) or all files matching name as glob pattern
+    host : str
+        name of the host writing the Log (default: this host)
 
     Methods
     -------
@@ -65,19 +772,64 @@ class LogFile:
         Copies Log to destination.
     rm_log():
         Removes Log file.
-    _read_log():
+    log_files():
+        Returns Log file or its rotation set, oldest first.
+    size():
+        Returns size of the Log files in bytes.
+    host_logs(root,name):
+        Returns the Logs of the hosts in a directory tree.
+    _open_log(fname,mode="r"):
+        Opens plain, gzip- or zstd-compressed Log file.
+    _first_time(fname):
+        Returns time of the first line of a Log file.
+    _relevant_files(start_time):
+        Returns Log files with lines at or after start_time.
+    _line_time(line):
+        Returns time of a line of the Log.
+    _seek_log(mm,start_time):
+        Finds first line at or after start_time by binary search.
+    _seek_file(fname,start_time):
+        Returns offset of the first line at or after start_time.
+    _read_log(start_time=None):
         Reads from Log file, one line at a time.
-    message_filter(logged_sessions,pid,message,user_list):
+    _read_from(logfile,checkpoint):
+        Reads complete lines from logfile after the checkpoint.
+    follow_log(checkpoint,poll_interval,start_time=None):
+        Reads newly appended lines from Log file, one line at a time.
+    parse_line(line_log):
+        Splits a line of the Log into its parts.
+    message_filter(message,user_list):
         Filter a message for attributes.
-    process_log(user_list,buffer_time,break_time):
+    ssh_lines(lines,buffer_time):
+        Filters lines of the Log for ssh messages.
+    ssh_chunk(lines,buffer_time):
+        Returns the ssh messages of a chunk of lines as list.
+    process_log(user_list,buffer_time,break_time,lines=None,
+                flush_interval=None,detector=None):
         Examines Log and extracts relevant data.
+    track_sessions(ssh_lines,user_list,break_time,flush_interval=None,
+                   detector=None):
+        Accumulates the attributes of every session.
+    _shards(num_shards,buffer_time):
+        Splits Log into byte ranges aligned on newlines.
+    _parse_shard(fname,start,end,user_list,buffer_time,break_time):
+        Aggregates sessions of a byte range of the Log.
+    process_log_parallel(user_list,buffer_time,break_time,workers):
+        Examines Log in parallel and extracts relevant data.
+    tag_host(log_processed):
+        Appends the host to the processed lines.
+    process_host(user_list,buffer_time,break_time,flush_interval=None,
+                 detector=None):
+        Examines Log of a host in a worker process.
     """
 
-    def __init__(self,name,location):
+    def __init__(self,name,location,rotated=False,host=None):
         """Constructs necessary attributes of the LogFile object."""
 
         self._name = name
         self._location = location
+        self.rotated = rotated or glob.has_magic(name)
+        self.host = host or socket.gethostname()
 
 
     def copy_log(self,destination):
@@ -100,14 +852,297 @@ class LogFile:
         subprocess.call(cmd,shell=True)
 
 
-    def _read_log(self):
-        """Reads from Log file, one line at a time."""
+    def log_files(self):
+        """
+        Returns Log file or its rotation set, oldest first
+        (highest rotation number first, current Log last).
+        """
+
+        if (not self.rotated):
+            return [f"{self._location}/{self._name}"]
+
+        if (glob.has_magic(self._name)):
+            fnames = glob.glob(f"{self._location}/{self._name}")
+        else:
+            pattern = re.escape(self._name)+r"(\.[0-9]+)?(\.gz|\.zst)?$"
+            fnames = [fname for fname \
+                      in glob.glob(f"{self._location}/{self._name}*") \
+                      if re.match(pattern,os.path.basename(fname))]
+
+        def rotation_number(fname):
+            search = re.search(r"\.([0-9]+)(\.gz|\.zst)?$",fname)
+            return int(search.group(1)) if bool(search) else 0
+
+        return sorted(fnames,key=lambda fname: (-rotation_number(fname), \
+                                                fname))
+
+
+    def size(self):
+        """Returns size of the Log files in bytes (compressed)."""
+
+        return sum([os.path.getsize(fname) for fname in self.log_files() \
+                    if os.path.exists(fname)])
+
+
+    @staticmethod
+    def host_logs(root,name):
+        """
+        Returns a LogFile object for the rotation set of Log name
+        in every directory of the tree root, named by the path of
+        the directory relative to root (files in root: name of root).
+        """
+
+        log_files = []
+        for dirpath,dirnames,fnames in os.walk(root):
+            dirnames.sort()
+            host = os.path.relpath(dirpath,root)
+            if (host == "."):
+                host = os.path.basename(os.path.abspath(root))
+            log_file = LogFile(name,dirpath,True,host.replace(os.sep,"/"))
+            if (bool(log_file.log_files())):
+                log_files.append(log_file)
+
+        return log_files
+
+
+    @staticmethod
+    def _open_log(fname,mode="r"):
+        """
+        Opens plain, gzip- or zstd-compressed Log file 
+        in mode "r" (text) or "rb" (binary).
+        """
+
+        if (fname.endswith(".gz")):
+            return gzip.open(fname,"rt" if mode=="r" else mode)
+        if (fname.endswith(".zst")):
+            if (zstandard is None):
+                raise ImportError(f"Reading {fname} requires " \
+                                  +"the zstandard package.")
+            if (mode=="r"):
+                return zstandard.open(fname,"rt")
+            # line-wise reading needs a buffered reader
+            return io.BufferedReader(zstandard.open(fname,mode))
+
+        return open(fname,mode)
+
+
+    @staticmethod
+    def _first_time(fname):
+        """Returns time of the first line of a Log file."""
+
+        try:
+            with LogFile._open_log(fname,"rb") as logfile:
+                return LogFile._line_time(logfile.readline())
+        except (OSError,ImportError):
+            return None
+
+
+    def _relevant_files(self,start_time):
+        """
+        Returns Log files with lines at or after start_time,
+        files are skipped if the next one starts before start_time.
+        """
+
+        fnames = self.log_files()
+        if (start_time is None):
+            return fnames
+
+        relevant = []
+        for ii,fname in enumerate(fnames):
+            if (ii+1 < len(fnames)):
+                next_time = self._first_time(fnames[ii+1])
+                if (next_time is not None and next_time < start_time):
+                    continue
+            relevant.append(fname)
+
+        return relevant
+
+
+    @staticmethod
+    def _line_time(line):
+        """Returns time of a line of the Log, None if malformed."""
+
+        record = LogFile.parse_line(line.decode(errors="replace"))
+        if (record is None):
+            return None
+        try:
+            return datetime.fromisoformat(record.date_time)
+        except ValueError:
+            return None
+
+
+    @staticmethod
+    def _seek_log(mm,start_time):
+        """
+        Finds byte offset of the first line at or after start_time
+        by binary search over the memory-mapped Log mm (lines are 
+        ordered by time). Positions between line starts are 
+        resynchronized to the next newline.
+        """
+
+        size = len(mm)
+
+        def next_start(pos):
+            # first line start at or after pos
+            if (pos == 0):
+                return 0
+            newline = mm.find(b"\n",pos-1)
+            return size if (newline < 0) else newline+1
+
+        def is_before(pos):
+            # malformed lines count as before start_time
+            line_time = LogFile._line_time(mm[pos:next_start(pos+1)])
+            return (line_time is None or line_time < start_time)
+
+        # lines before lo are before start_time,
+        # line at hi is at or after start_time (or end of file)
+        lo,hi = 0,size
+        while (lo < hi):
+            mid = next_start((lo+hi)//2)
+            if (mid >= hi):
+                # no line start between lo and hi besides lo
+                if (is_before(lo)):
+                    lo = next_start(lo+1)
+                else:
+                    hi = lo
+            elif (is_before(mid)):
+                lo = next_start(mid+1)
+            else:
+                hi = mid
+
+        return lo
+
+
+    def _seek_file(self,fname,start_time):
+        """
+        Returns byte offset of the first line at or after
+        start_time in a plain Log file (0 if compressed).
+        """
+
+        offset = 0
+        if (start_time is not None and \
+            not fname.endswith((".gz",".zst")) and \
+            os.path.getsize(fname) > 0):
+            with open(fname,"rb") as logfile, \
+                 mmap.mmap(logfile.fileno(),0,access=mmap.ACCESS_READ) \
+                 as mm:
+                offset = self._seek_log(mm,start_time)
+
+        return offset
+
+
+    def _read_log(self,start_time=None):
+        """
+        Reads from Log file, or its rotation set in chronological
+        order, one line at a time. Compressed files are decompressed
+        on the fly. Starts at the first line at or after start_time 
+        if given.
+        """
+
+        for fname in self._relevant_files(start_time):
+            try:
+                offset = self._seek_file(fname,start_time)
+                with self._open_log(fname,"r") as logfile:
+                    if (offset > 0):
+                        logfile.seek(offset)
+                    for line in logfile:
+                        yield line
+            except FileNotFoundError:
+                msg = f"The file {fname} does not exist."
+                print(msg)
+            except PermissionError:
+                msg = f"You lack permission to read {fname}."
+                print(msg)
+            except ImportError as error:
+                print(error)
+
+
+    @staticmethod
+    def _read_from(logfile,checkpoint):
+        """
+        Reads complete lines from the open binary logfile
+        and advances checkpoint behind every line read.
+        Stops at the end of the file, an incomplete last line 
+        is left for the next call.
+        """
+
+        while True:
+            line = logfile.readline()
+            if (not line.endswith(b"\n")):
+                # incomplete line: writer has not finished yet
+                logfile.seek(checkpoint.offset)
+                break
+            checkpoint.offset = logfile.tell()
+            yield line.decode(errors="replace")
+
+
+    def follow_log(self,checkpoint,poll_interval,start_time=None):
+        """
+        Reads newly appended lines from Log file, one line at a time,
+        starting at checkpoint (inode, byte offset), or before it at 
+        the first line at or after start_time if given (sessions open
+        at the checkpoint are read again from their start).
+        Follows the Log through rotation (Log moved to Log.1, 
+        new inode) and truncation. Yields None whenever it 
+        waits poll_interval seconds for new data.
+        """
 
         fname = f"{self._location}/{self._name}"
+        checkpoint.load()
+
         try:
-            with open(fname,"r") as logfile:
-                for line in logfile:
-                    yield line
+            # resume within the file the checkpoint points to
+            if (checkpoint.inode is not None and start_time is not None):
+                for candidate in (fname,fname+".1"):
+                    if (os.path.exists(candidate) and \
+                        os.stat(candidate).st_ino == checkpoint.inode):
+                        offset = self._seek_file(candidate,start_time)
+                        checkpoint.offset = min(checkpoint.offset,offset)
+                        break
+
+            # finish rotated Log if the checkpoint points to it
+            rotated = fname+".1"
+            if (checkpoint.inode is not None and \
+                os.stat(fname).st_ino != checkpoint.inode and \
+                os.path.exists(rotated) and \
+                os.stat(rotated).st_ino == checkpoint.inode):
+                with open(rotated,"rb") as logfile:
+                    logfile.seek(checkpoint.offset)
+                    yield from self._read_from(logfile,checkpoint)
+
+            logfile = open(fname,"rb")
+            inode = os.fstat(logfile.fileno()).st_ino
+            if (inode != checkpoint.inode):
+                checkpoint.inode = inode
+                checkpoint.offset = 0
+            logfile.seek(checkpoint.offset)
+
+            while True:
+                yield from self._read_from(logfile,checkpoint)
+                yield None
+
+                # rotation: name refers to a new file
+                try:
+                    rotated = (os.stat(fname).st_ino != checkpoint.inode)
+                except FileNotFoundError:
+                    rotated = False
+                if (rotated):
+                    # lines written before the rotation
+                    yield from self._read_from(logfile,checkpoint)
+                    logfile.close()
+                    logfile = open(fname,"rb")
+                    checkpoint.inode = os.fstat(logfile.fileno()).st_ino
+                    checkpoint.offset = 0
+                    continue
+
+                # truncation (copytruncate)
+                if (os.fstat(logfile.fileno()).st_size < checkpoint.offset):
+                    checkpoint.offset = 0
+                    logfile.seek(0)
+                    continue
+
+                time.sleep(poll_interval)
+
         except FileNotFoundError:
             msg = f"The file {fname} does not exist."
             print(msg)
@@ -115,132 +1150,354 @@ class LogFile:
             msg = f"You lack permission to read {fname}."
             print(msg)
 
+
+    @staticmethod
+    def parse_line(line_log):
+        """
+        Splits a line of the Log into its parts.
+        Returns LogRecord, None for malformed lines.
+        """
+
+        match = LINE_PATTERN.match(line_log)
+        if (match is None):
+            return None
+
+        date,time,service,pid,message = match.group("date","time", \
+                                                    "service","pid", \
+                                                    "message")
+        if (pid is None):
+            pid = "-1"
+
+        return LogRecord(date+" "+time,service,pid,message)
+
+
     @staticmethod
-    def message_filter(logged_sessions,pid,message,user_list):
-        """Filter a message for attributes."""
-
-        # IP address
-        pattern = r"("+r"[0-9]{1,3}\."*3+r"[0-9]{1,3})"
-        search = re.search(pattern,message)
-        if (bool(search)):
-            logged_sessions[pid]["ip_address"] = search.group(1)
-
-        # username, user existence
-        pattern = r"(password for |user |user=)(?!invalid|unknown)(\w+)"
-        search = re.search(pattern,message)
-        if (bool(search)):
-            logged_sessions[pid]["user_name"] = search.group(2)
-            logged_sessions[pid]["user_exists"] = \
-                    bool(logged_sessions[pid]["user_name"] in user_list)
+    def message_filter(message,user_list):
+        """
+        Filter a message for attributes.
+        Returns MessageRecord, attributes missing in the
+        message are None, fail_count is the increment.
+        """
+
+        match = MESSAGE_PATTERN.match(message)
+        ip_address,user_name,repeated,status = match.group("ip_address", \
+                                                           "user_name", \
+                                                           "repeated", \
+                                                           "status")
+
+        # user existence
+        user_exists = None
+        if (user_name is not None):
+            user_exists = bool(user_name in user_list)
 
         # fail count
-        pattern = r"^Failed password"
-        search = re.search(pattern,message)
-        if (bool(search)):
-            logged_sessions[pid]["fail_count"] += 1
-        pattern = r"message repeated ([0-9]+) times: "+ \
-                  r"\[ Failed password"
-        search = re.search(pattern,message)
-        if (bool(search)):
-            logged_sessions[pid]["fail_count"] += int(search.group(1))
+        fail_count = 0
+        if (status=="Failed"):
+            fail_count += 1
+        if (repeated is not None):
+            fail_count += int(repeated)
 
         # login status
         login_status = "Failed"
-        pattern = r"^Accepted password"
-        if (bool(re.search(pattern,message))):
+        if (status=="Accepted"):
             login_status = "Success"
 
-        return logged_sessions,login_status
+        return MessageRecord(ip_address,user_name,user_exists, \
+                             fail_count,login_status)
 
 
-    def process_log(self,user_list,buffer_time,break_time):
-        """Examines Log and extracts relevant data."""
-
-        header = ["pid","fail_count","login_status", \
-                  "first_date_time","last_date_time", \
-                  "ip_address", \
-                  "user_name","user_exists"]
-        yield header
-
-
-        # purpose:  enforce key-entries, allow cumulative 
-        # entries (e.g. counters) and initial values (e.g. start time) 
-        # for each session
-        logged_sessions = dict()
+    @staticmethod
+    def ssh_lines(lines,buffer_time):
+        """
+        Filters lines of the Log for ssh messages at or after
+        buffer_time. Yields date_time, line_time, pid and message,
+        None in lines is passed on as None.
+        """
 
         # filter lists
-        service_whitelist = ["sshd"]
+        service_whitelist = {"sshd"}
         message_blacklist = ["(sshd:session)","Server listening"]
 
-        for line_log in self._read_log():
+        for line_log in lines:
+
+            if (line_log is None):
+                yield None
+                continue
 
             # rough filter
-            pattern = r"^(.+?)T(.+?)\s(.+?)\s(.+?):\s(.+?)$"
-            line = re.findall(pattern,line_log)[0]
-            # remove timezone
-            date_time = line[0]+" "+line[1].split("+")[0]
-            pid = "-1"
-            service = line[3]
-            message = line[4]
+            record = LogFile.parse_line(line_log)
+            if (record is None):
+                continue
 
 
             # start accumulating entries after buffer time
             # (lifetime of ssh login-session before break_time)
-            if (buffer_time > datetime.fromisoformat(date_time)):
+            line_time = datetime.fromisoformat(record.date_time)
+            if (buffer_time > line_time):
                 continue
 
 
-            # resolve service, pid
-            if ("[" in service):
-                pattern = r"^(.+?)\[(.+?)\]$"
-                service,pid = re.findall(pattern,service)[0]
-
             # filter service, messages
-            if (service in service_whitelist and \
-                not any([bl_entry in message \
+            if (record.service in service_whitelist and \
+                not any([bl_entry in record.message \
                      for bl_entry in message_blacklist])):
+                yield record.date_time,line_time,record.pid,record.message
 
-                if (pid not in logged_sessions.keys()):
-                    # initialization
-                    logged_sessions[pid] = dict()
-                    logged_sessions[pid]["fail_count"] = 0
-                    logged_sessions[pid]["first_date_time"] = date_time
-
-                logged_sessions,login_status = self.message_filter( \
-                                                    logged_sessions, \
-                                                    pid,message, \
-                                                    user_list)
 
-                # pass line only if key-entries are present
-                if ("ip_address" not in logged_sessions[pid].keys() or \
-                    "user_name" not in logged_sessions[pid].keys()):
-                    continue
+    @staticmethod
+    def ssh_chunk(lines,buffer_time):
+        """
+        Returns the ssh messages of a chunk of lines as list
+        (see ssh_lines), to be run by a pool of parsers.
+        """
 
+        return list(LogFile.ssh_lines(lines,buffer_time))
 
-                # pass entries after break time
-                if (break_time >= datetime.fromisoformat(date_time)):
-                    continue
 
+    def process_log(self,user_list,buffer_time,break_time,lines=None, \
+                    flush_interval=None,detector=None):
+        """
+        Examines Log and extracts relevant data.
+        Reads lines instead of the Log file if given, None
+        in lines (no new data) is passed on as None.
+        Failed passwords are counted by detector if given.
+        """
 
-                # line according to header
-                line_sorted = [pid, \
-                               logged_sessions[pid]["fail_count"], \
-                               login_status, \
-                               logged_sessions[pid]["first_date_time"], \
-                               date_time, \
-                               logged_sessions[pid]["ip_address"], \
-                               logged_sessions[pid]["user_name"], \
-                               logged_sessions[pid]["user_exists"]]
-                yield line_sorted
+        yield HEADER
 
+        if (lines is None):
+            lines = self._read_log(buffer_time)
 
-class CronJob:
-    """
-    A class to represent a cronjob.
+        yield from self.track_sessions(self.ssh_lines(lines,buffer_time), \
+                                       user_list,break_time,flush_interval, \
+                                       detector)
 
-    ...
 
-    Attributes
+    @staticmethod
+    def track_sessions(ssh_lines,user_list,break_time,flush_interval=None, \
+                       detector=None):
+        """
+        Accumulates the attributes of every session from ssh
+        messages (see ssh_lines) and yields one state per session
+        after break_time (see SessionAggregator). None in ssh_lines
+        (no new data) flushes pending states and is passed on 
+        as None.
+        """
+
+        aggregator = SessionAggregator(user_list,break_time,flush_interval, \
+                                       detector)
+
+        for ssh_line in ssh_lines:
+            if (ssh_line is None):
+                yield from aggregator.flush()
+                yield None
+                continue
+            yield from aggregator.add(*ssh_line)
+
+        yield from aggregator.close_all()
+
+
+    def _shards(self,num_shards,buffer_time):
+        """
+        Splits every plain Log file into num_shards byte ranges 
+        (fname,start,end) from the first line at or after buffer_time 
+        on. Ranges are aligned on newlines by the readers. Compressed 
+        files form one shard each (end None).
+        """
+
+        shards = []
+        for fname in self._relevant_files(buffer_time):
+            if (fname.endswith((".gz",".zst"))):
+                shards.append((fname,0,None))
+                continue
+
+            size = os.path.getsize(fname)
+            start = self._seek_file(fname,buffer_time)
+            step = max((size-start)//num_shards,1)
+            bounds = [*range(start,size,step),size]
+            bounds[-1] = size
+
+            shards = [*shards, \
+                      *[(fname,bounds[ii],bounds[ii+1]) \
+                        for ii in range(len(bounds)-1) \
+                        if bounds[ii]<bounds[ii+1]]]
+
+        return shards
+
+
+    @staticmethod
+    def _parse_shard(fname,start,end,user_list,buffer_time,break_time):
+        """
+        Aggregates sessions of the lines starting in the byte range
+        [start,end) of the Log (whole file if end is None). Returns partial sessions by pid:
+        summed fail_count, first and last date_time, login_status
+        of the last line, last seen attributes (None if unseen) and 
+        the attribute states of lines after break_time.
+        """
+
+        def read_shard():
+            if (end is None):
+                # compressed file: whole file
+                with LogFile._open_log(fname,"rb") as logfile:
+                    for line in logfile:
+                        yield line.decode(errors="replace")
+                return
+            with open(fname,"rb") as logfile:
+                if (start > 0):
+                    # resync to the next line start
+                    logfile.seek(start-1)
+                    logfile.readline()
+                while (logfile.tell() < end):
+                    line = logfile.readline()
+                    if (not bool(line)):
+                        break
+                    yield line.decode(errors="replace")
+
+        partial_sessions = dict()
+        user_list = set(user_list)
+
+        for date_time,line_time,pid,message in \
+            LogFile.ssh_lines(read_shard(),buffer_time):
+
+            if (pid not in partial_sessions):
+                partial_sessions[pid] = {"fail_count":0, \
+                                         "first_date_time":date_time, \
+                                         "ip_address":None, \
+                                         "user_name":None, \
+                                         "user_exists":None, \
+                                         "states":[]}
+            session = partial_sessions[pid]
+
+            message_record = LogFile.message_filter(message,user_list)
+            if (message_record.ip_address is not None):
+                session["ip_address"] = message_record.ip_address
+            if (message_record.user_name is not None):
+                session["user_name"] = message_record.user_name
+                session["user_exists"] = message_record.user_exists
+            session["fail_count"] += message_record.fail_count
+            session["last_date_time"] = date_time
+            session["login_status"] = message_record.login_status
+
+            # attributes a line after break time would pass on
+            if (break_time < line_time):
+                state = (session["ip_address"],session["user_name"], \
+                         session["user_exists"])
+                if (not bool(session["states"]) or \
+                    session["states"][-1] != state):
+                    session["states"].append(state)
+
+        return partial_sessions
+
+
+    def process_log_parallel(self,user_list,buffer_time,break_time,workers):
+        """
+        Examines Log in parallel and extracts relevant data.
+        Byte ranges of the Log are aggregated by a pool of workers
+        and merged in order with the cumulative semantics of 
+        process_log. Yields the attribute states of every session,
+        the last line of a session is its final state, so that the
+        database ends up as with process_log.
+        """
+
+        yield HEADER
+
+        shards = self._shards(workers*4,buffer_time)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._parse_shard,*shard, \
+                                       user_list,buffer_time,break_time) \
+                       for shard in shards]
+
+            # merge partial sessions in order of the shards
+            logged_sessions = dict()
+            for future in futures:
+                for pid,partial in future.result().items():
+                    if (pid not in logged_sessions):
+                        logged_sessions[pid] = {"fail_count":0, \
+                                                "first_date_time": \
+                                                partial["first_date_time"], \
+                                                "ip_address":None, \
+                                                "user_name":None, \
+                                                "user_exists":None, \
+                                                "states":[]}
+                    session = logged_sessions[pid]
+
+                    # states resolved with attributes of previous shards
+                    for ip_address,user_name,user_exists in partial["states"]:
+                        if (ip_address is None):
+                            ip_address = session["ip_address"]
+                        if (user_name is None):
+                            user_name = session["user_name"]
+                            user_exists = session["user_exists"]
+                        state = (ip_address,user_name,user_exists)
+                        if (ip_address is not None and \
+                            user_name is not None and \
+                            (not bool(session["states"]) or \
+                             session["states"][-1] != state)):
+                            session["states"].append(state)
+
+                    if (partial["ip_address"] is not None):
+                        session["ip_address"] = partial["ip_address"]
+                    if (partial["user_name"] is not None):
+                        session["user_name"] = partial["user_name"]
+                        session["user_exists"] = partial["user_exists"]
+                    session["fail_count"] += partial["fail_count"]
+                    session["last_date_time"] = partial["last_date_time"]
+                    session["login_status"] = partial["login_status"]
+
+        for pid,session in logged_sessions.items():
+            for ip_address,user_name,user_exists in session["states"]:
+                # line according to header
+                line_sorted = [pid, \
+                               session["fail_count"], \
+                               session["login_status"], \
+                               session["first_date_time"], \
+                               session["last_date_time"], \
+                               ip_address, \
+                               user_name, \
+                               user_exists]
+                yield line_sorted
+
+
+    def tag_host(self,log_processed):
+        """
+        Appends the host to the header (see HOST_HEADER) and to 
+        every processed line of log_processed, None is passed on.
+        """
+
+        next(log_processed)
+        yield HOST_HEADER
+
+        for line in log_processed:
+            yield line if (line is None) else [*line,self.host]
+
+
+    def process_host(self,user_list,buffer_time,break_time, \
+                     flush_interval=None,detector=None):
+        """
+        Examines Log of a host (see process_log) in a worker process.
+        Returns the processed lines tagged with the host and the 
+        alerts of detector (a copy of the worker, None: no detection).
+        """
+
+        log_processed = self.tag_host(self.process_log(user_list, \
+                                                       buffer_time, \
+                                                       break_time,None, \
+                                                       flush_interval, \
+                                                       detector))
+        next(log_processed)
+        lines = list(log_processed)
+        alerts = list(detector.alerts) if (detector is not None) else []
+
+        return lines,alerts
+
+
+class CronJob:
+    """
+    A class to represent a cronjob.
+
+    ...
+
+    Attributes
     ----------
     _m : str
         value of minute field in crontab
@@ -311,255 +1568,1483 @@ class CronJob:
         cmd = "crontab -e"
         subprocess.call(cmd,shell=True)
 
-        # store credentials in environment variable
-        print("Please store your SQL-user credentials \n"+\
-              "in the following way:\n"+ \
-             f"export CHECK_LOGIN_USR=<username>\n"+ \
-             f"export CHECK_LOGIN_PWD=<password>")
+        # store credentials in environment variable
+        print("Please store your SQL-user credentials \n"+\
+              "in the following way:\n"+ \
+             f"export CHECK_LOGIN_USR=<username>\n"+ \
+             f"export CHECK_LOGIN_PWD=<password>")
+
+
+class Relation:
+    """
+    A class to represent a relation.
+    
+    ...
+
+    Attributes
+    ----------
+    name : str
+        name of the relation
+    attrs : tuple of str
+        attributes of the relation
+    types : tuple of str
+        data types of the attributes
+    keys : tuple of str
+        primary and foreign keys of the relation
+    cstrs : tuple of str
+        further constraints (e.g. NOT NULL, UNIQUE)
+    level : str
+        *"child": relation has foreign key values
+         depending on the primary key of other relations
+        *"parent": relation has no foreign key values
+         depending on the primary key of other relations
+        *"summary": relation aggregates sessions by its 
+         primary key
+    indexes : tuple of tuple of str
+        attributes of the indexes of the relation
+    partition : str
+        attribute the relation is range-partitioned on by month
+        (None: not partitioned)
+    unique : tuple of str
+        attributes of a composite UNIQUE constraint, the natural 
+        key of the relation (empty: UNIQUE attribute in cstrs)
+    _sql_name : Identifier
+        wrapped name variable
+    _sql_attrs : tuple of Identifier
+        wrapped attrs variable
+    _sql_types : tuple of SQL-conform strings
+        wrapped types variable
+    _sql_cstrs : tuple of SQL-conform strings
+        wrapped cstrs variable
+    _attr_dict : dictionary
+        translates lines of the input into attributes of the relation
+    _statements : dictionary
+        prepared statements of the relation by kind
+
+    Instance Methods
+    ----------------
+    safe_attrs(is_sql=False):
+        Returns non-key attributes.
+    query_create():
+        Constructs query to CREATE the relation.
+    pkey_attr():
+        Returns primary key attribute.
+    unique_attr():
+        Returns first attribute with UNIQUE constraint.
+    unique_attrs():
+        Returns attributes of the natural key.
+    key_attrs(parents):
+        Returns attributes of processed lines forming the natural key.
+    insert_attrs():
+        Returns attributes set by query_insert.
+    query_insert(prepared=False):
+        Constructs query to INSERT tuples into the relation.
+    query_lookup(prepared=False):
+        Constructs query to SELECT the primary key of a tuple
+        by its unique attribute.
+    statement(kind):
+        Returns the prepared statement of kind "insert" or "lookup".
+    query_insert_batch(header,parents):
+        Constructs query to INSERT many tuples into the relation
+        with a single statement.
+    fk_constraints():
+        Sets foreign key constraints for the relation.
+    query_indexes():
+        Constructs queries to CREATE the indexes of the relation.
+    query_partition(month):
+        Constructs query to CREATE the partition of a month.
+    query_refresh(key):
+        Constructs query to refresh a summary relation incrementally.
+    create_attr_dict(src_attr):
+        Creates dictionary to sort lines of input with attributes 
+        src_attr to match attributes of the relation.
+    convert_line(line):
+        Converts line of input to properly fit into the database.
+
+    Class Methods
+    -------------
+    _placeholders(num,prepared):
+        Returns num placeholders for parameters of a query.
+    create_table(header,content,widths=None):
+        Creates table representation of a query with header and content.
+    print_table(table):
+        Displays table representation of a query.
+    write_table(table,fname):
+        Writes table representation of a query to file fname.
+    fetch_pages(cursor,page_size=PAGE_SIZE):
+        Fetches result of a query page by page.
+    column_widths(header,sample):
+        Returns column widths for a sample of rows.
+    print_pages(cursor,page_size=PAGE_SIZE):
+        Displays result of a query page by page.
+    export_copy(cursor,query,fname):
+        Exports result of query with COPY as csv, gzip-compressed
+        csv, Parquet or Arrow file.
+    _export_arrow(cursor,query,copy,fname):
+        Streams csv output of COPY into a Parquet or Arrow file.
+    """
+
+    def __init__(self,name,attrs,types,keys,cstrs,level,indexes=(), \
+                 partition=None,unique=()):
+        """Constructs necessary attributes of the Relation object."""
+
+        self.name = name
+        self.attrs = attrs
+        self.types = types
+        self.keys = keys
+        self.cstrs = cstrs
+        self.level = level
+        self.indexes = indexes
+        self.partition = partition
+        self.unique = unique
+
+        self._sql_name = sql.Identifier(self.name)
+        self._sql_attrs = tuple(map(sql.Identifier,self.attrs))
+        self._sql_types = tuple(map(sql.SQL,self.types))
+        self._sql_cstrs = tuple(map(sql.SQL,self.cstrs))
+
+        self._attr_dict = {}
+        self._statements = {}
+
+
+    def safe_attrs(self,is_sql=False):
+        """Returns non-key attributes."""
+
+        serial_indices = [self.keys.index(key) for key in self.keys 
+                          if key!=""]
+        if (is_sql):
+            attrs = [attr for attr in self._sql_attrs 
+                     if self._sql_attrs.index(attr) not in serial_indices]
+        else:
+            attrs = [attr for attr in self.attrs 
+                     if self.attrs.index(attr) not in serial_indices]
+
+        return attrs
+
+
+    def pkey_attr(self):
+        """Returns primary key attribute."""
+
+        pkey_attr = tuple(self.attrs[ii]
+                          for ii,key in enumerate(self.keys)
+                          if key=="PRIMARY KEY")[0]
+
+        return pkey_attr
+
+
+    def unique_attr(self):
+        """Returns first attribute with UNIQUE constraint."""
+
+        unique_attr = tuple(self.attrs[ii]
+                            for ii,cstr in enumerate(self.cstrs)
+                            if "UNIQUE" in cstr)[0]
+
+        return unique_attr
+
+
+    def unique_attrs(self):
+        """
+        Returns attributes of the natural key: the composite UNIQUE 
+        constraint, else the first attribute with UNIQUE constraint.
+        """
+
+        if (bool(self.unique)):
+            return self.unique
+
+        return (self.unique_attr(),)
+
+
+    def key_attrs(self,parents):
+        """
+        Returns attributes of processed lines forming the natural key
+        (see unique_attrs), foreign keys are given by the unique 
+        attribute of their parent relation in parents.
+        """
+
+        fkeys = {self.attrs[self.keys.index(key)]:key.split()[0] \
+                 for key in self.keys if key not in ("","PRIMARY KEY")}
+        key_attrs = []
+        for attr in self.unique_attrs():
+            if (attr in fkeys):
+                attr = [rel for rel in parents \
+                        if rel.name==fkeys[attr]][0].unique_attr()
+            key_attrs.append(attr)
+
+        return tuple(key_attrs)
+
+
+    def query_create(self):
+        """Constructs query to CREATE the relation."""
+
+        # get primary key
+        # (of partitioned relations: including the partition key)
+        pkey = tuple(key for key in self.keys if key=="PRIMARY KEY")
+        if (self.partition is not None):
+            pkey = ()
+        sql_pkey = tuple(map(sql.SQL,pkey))
+        # combine parts of arguments
+        args_zip = tuple(itertools.zip_longest(self._sql_attrs, \
+                                               self._sql_types, \
+                                               sql_pkey, \
+                                               self._sql_cstrs, \
+                                               fillvalue=sql.SQL("")))
+        args_flat = sql.Composed(sql.SQL(', ').join( \
+                                [sql.SQL(' ').join(tpl) for tpl in args_zip]))
+        if (bool(self.unique)):
+            args_flat = sql.SQL("{}, UNIQUE ({})").format(args_flat, \
+                        sql.SQL(', ').join(map(sql.Identifier,self.unique)))
+
+        if (self.partition is not None):
+            query = sql.SQL("""CREATE TABLE IF NOT EXISTS {} 
+                               ({}, PRIMARY KEY ({}, {})) 
+                               PARTITION BY RANGE ({});""").format( \
+                    self._sql_name,args_flat, \
+                    sql.Identifier(self.pkey_attr()), \
+                    sql.Identifier(self.partition), \
+                    sql.Identifier(self.partition))
+        else:
+            query = sql.SQL("CREATE TABLE IF NOT EXISTS {} ({});") \
+                   .format(self._sql_name,args_flat)
+    
+        return query
+
+
+    @staticmethod
+    def _placeholders(num,prepared):
+        """
+        Returns num placeholders for parameters of a query,
+        positional ($1, $2, ...) for prepared statements.
+        """
+
+        if (prepared):
+            placeholders = [sql.SQL(f"${ii+1}") for ii in range(num)]
+        else:
+            placeholders = sql.Placeholder() * num
+
+        return sql.SQL(', ').join(placeholders)
+
+
+    def insert_attrs(self):
+        """
+        Returns attributes set by query_insert: the remaining 
+        attributes, followed by the foreign keys for child relations.
+        """
+
+        # get attributes not directly or indirectly set via serial
+        attrs = self.safe_attrs(is_sql=True)
+
+        if (self.level == "child"):
+            fkeys = tuple(key for key in self.keys if key!="PRIMARY KEY")
+            attrs = [*attrs, \
+                     *[sql.Identifier(fkey.split()[1]) for fkey in fkeys]]
+
+        return attrs
+
+
+    def query_insert(self,prepared=False):
+        """
+        Constructs query to INSERT tuples into the relation.
+        Parent relations return the primary key of new tuples,
+        child relations expect the foreign keys after the 
+        remaining attributes.
+        """
+
+        attrs = self.insert_attrs()
+        placeholders = self._placeholders(len(attrs),prepared)
+
+        if (self.name != "sessions"):
+            # parent relations
+            query = sql.SQL("""INSERT INTO {} ({}) VALUES ({}) 
+                               ON CONFLICT DO NOTHING RETURNING {};""").format( \
+                    sql.Identifier(self.name), \
+                    sql.SQL(', ').join(attrs), \
+                    placeholders, \
+                    sql.Identifier(self.pkey_attr()))
+        else:
+            # child relation, the natural key is kept
+            unique_attrs = tuple(map(sql.Identifier,self.unique_attrs()))
+            updated = [attr for attr in attrs if attr not in unique_attrs]
+            query = sql.SQL("""INSERT INTO {} ({}) VALUES ({}) 
+                               ON CONFLICT ({}) 
+                               DO UPDATE SET ({}) = ({});""").format( \
+                    sql.Identifier(self.name), \
+                    sql.SQL(', ').join(attrs), \
+                    placeholders, \
+                    sql.SQL(', ').join(unique_attrs), \
+                    sql.SQL(', ').join(updated),
+                    sql.SQL(', ').join([sql.SQL('EXCLUDED.')+entry \
+                            for entry in updated]))
+    
+        return query
+
+
+    def query_lookup(self,prepared=False):
+        """
+        Constructs query to SELECT the primary key of a tuple
+        by its unique attribute.
+        """
+
+        query = sql.SQL("SELECT {} FROM {} WHERE {} = {};").format( \
+                sql.Identifier(self.pkey_attr()), \
+                sql.Identifier(self.name), \
+                sql.Identifier(self.unique_attr()), \
+                self._placeholders(1,prepared))
+
+        return query
+
+
+    def statement(self,kind):
+        """
+        Returns the server-side prepared statement of kind 
+        "insert" (see query_insert) or "lookup" (see query_lookup)
+        as tuple of name, PREPARE query and number of parameters.
+        The statement is constructed once per relation.
+        """
+
+        if (kind not in self._statements):
+            if (kind == "insert"):
+                query = self.query_insert(prepared=True)
+                num_params = len(self.insert_attrs())
+            else:
+                query = self.query_lookup(prepared=True)
+                num_params = 1
+            name = f"{kind}_{self.name}"
+            prepare = sql.SQL("PREPARE {} AS {}").format( \
+                      sql.Identifier(name),query)
+            self._statements[kind] = (name,prepare,num_params)
+
+        return self._statements[kind]
+
+
+    def query_insert_batch(self,header,parents):
+        """
+        Constructs query to INSERT many tuples into the relation
+        with a single statement (see psycopg2.extras.execute_values).
+        Foreign keys of child relations are resolved set-based by
+        joining the parent relations on their unique attributes.
+        Parent relations return primary and unique key of new tuples.
+        """
+
+        # get attributes not directly or indirectly set via serial
+        attrs = self.safe_attrs(is_sql=True)
+
+        if (self.level == "parent"):
+            query = sql.SQL("""INSERT INTO {} ({}) VALUES %s 
+                               ON CONFLICT DO NOTHING RETURNING {}, {};""").format( \
+                    sql.Identifier(self.name), \
+                    sql.SQL(', ').join(attrs), \
+                    sql.Identifier(self.pkey_attr()), \
+                    sql.Identifier(self.unique_attr()))
+        else:
+            # data types of the processed lines
+            types = {attr:rel.types[rel.attrs.index(attr)] \
+                     for rel in [self,*parents] \
+                     for attr in rel.attrs}
+            values = [sql.SQL("{}::{}").format( \
+                      sql.Identifier("v",attr), \
+                      sql.SQL(types[attr])) \
+                      for attr in self.safe_attrs(is_sql=False)]
+
+            # foreign keys from parent relations
+            fkeys = tuple(key for key in self.keys if key!="PRIMARY KEY")
+            fkey_attrs = []
+            join_clause = []
+            for fkey in fkeys:
+                rel_parent,pkey_attr_parent = fkey.split()
+                parent = [rel for rel in parents \
+                          if rel.name==rel_parent][0]
+                unique_attr = parent.unique_attr()
+                fkey_attrs.append(sql.Identifier(pkey_attr_parent))
+                values.append(sql.Identifier(rel_parent,pkey_attr_parent))
+                join_clause.append(sql.SQL( \
+                                   " INNER JOIN {} ON {} = {}::{}").format( \
+                                   sql.Identifier(rel_parent), \
+                                   sql.Identifier(rel_parent,unique_attr), \
+                                   sql.Identifier("v",unique_attr), \
+                                   sql.SQL(types[unique_attr])))
+            attrs = [*attrs,*fkey_attrs]
+            # the natural key is kept
+            unique_attrs = tuple(map(sql.Identifier,self.unique_attrs()))
+            updated = [attr for attr in attrs if attr not in unique_attrs]
+
+            # (WHERE TRUE separates the join from ON CONFLICT for SQLite)
+            query = sql.SQL("""WITH v ({}) AS (VALUES %s) 
+                               INSERT INTO {} ({}) SELECT {} 
+                               FROM v {} WHERE TRUE 
+                               ON CONFLICT ({}) 
+                               DO UPDATE SET ({}) = ({});""").format( \
+                    sql.SQL(', ').join(map(sql.Identifier,header)), \
+                    sql.Identifier(self.name), \
+                    sql.SQL(', ').join(attrs), \
+                    sql.SQL(', ').join(values), \
+                    sql.SQL(' ').join(join_clause), \
+                    sql.SQL(', ').join(unique_attrs), \
+                    sql.SQL(', ').join(updated), \
+                    sql.SQL(', ').join([sql.SQL('EXCLUDED.')+entry \
+                            for entry in updated]))
+
+        return query
+
+
+    def fk_constraints(self):
+        """Sets foreign key constraints for the relation."""
+   
+        # get foreign keys
+        fkeys = tuple(key for key in self.keys if key!="PRIMARY KEY")
+        for fkey in fkeys:
+            # name, primary key of other relation
+            pkey_rel,pkey_attr = fkey.split()
+            # foreign key of self
+            fkey_attr = self.attrs[self.keys.index(fkey)]
+
+            query = sql.SQL("""ALTER TABLE {} ADD CONSTRAINT {} 
+                               FOREIGN KEY ({}) REFERENCES {} ({});""") \
+                   .format(self._sql_name, \
+                           sql.Identifier("fk_"+fkey_attr), \
+                           sql.Identifier(fkey_attr), \
+                           sql.Identifier(pkey_rel), \
+                           sql.Identifier(pkey_attr))
+
+            yield query
+
+
+    def query_indexes(self):
+        """Constructs queries to CREATE the indexes of the relation."""
+
+        queries = []
+        for attrs in self.indexes:
+            index_name = "_".join([self.name,*attrs,"idx"])
+            query = sql.SQL("CREATE INDEX IF NOT EXISTS {} ON {} ({});") \
+                   .format(sql.Identifier(index_name), \
+                           self._sql_name, \
+                           sql.SQL(', ').join(map(sql.Identifier,attrs)))
+            queries.append(query)
+
+        return queries
+
+
+    def query_partition(self,month):
+        """
+        Constructs query to CREATE the partition of month (yyyy-mm)
+        of a partitioned relation, named relation_yyyy_mm.
+        """
+
+        year,month = map(int,month.split("-"))
+        lower = f"{year:04d}-{month:02d}-01"
+        upper = f"{year+month//12:04d}-{month%12+1:02d}-01"
+        query = sql.SQL("""CREATE TABLE IF NOT EXISTS {} PARTITION OF {} 
+                           FOR VALUES FROM ({}) TO ({});""").format( \
+                sql.Identifier(f"{self.name}_{year:04d}_{month:02d}"), \
+                self._sql_name, \
+                sql.Literal(lower), \
+                sql.Literal(upper))
+
+        return query
+
+
+    def query_refresh(self,key):
+        """
+        Constructs query to refresh a summary relation: sessions are 
+        aggregated by the expression key (primary key of the summary) 
+        for all keys of sessions with last_date_time at or after the 
+        given time only.
+        """
+
+        attrs = sql.SQL(', ').join(self._sql_attrs)
+        values = sql.SQL(', ').join(self._sql_attrs[1:])
+        excluded = sql.SQL(', ').join([sql.SQL('EXCLUDED.')+attr \
+                                       for attr in self._sql_attrs[1:]])
+
+        query = sql.SQL("""INSERT INTO {} ({}) 
+                           SELECT {}, COUNT(*), 
+                           COUNT(*) FILTER (WHERE login_status = 'Failed'), 
+                           SUM(fail_count) 
+                           FROM sessions WHERE {} IN 
+                           (SELECT {} FROM sessions 
+                            WHERE last_date_time >= {}) 
+                           GROUP BY 1 
+                           ON CONFLICT ({}) 
+                           DO UPDATE SET ({}) = ({});""").format( \
+                self._sql_name,attrs, \
+                key,key,key,sql.Placeholder(), \
+                sql.Identifier(self.pkey_attr()), \
+                values,excluded)
+
+        return query
+
+
+    def create_attr_dict(self,src_attr):
+        """
+        Creates dictionary to sort lines of input with attributes
+        src_attr to match attributes of the relation.
+        """
+
+        # get attributes not directly or indirectly set via serial
+        attrs = self.safe_attrs(is_sql=False)
+
+        self._attr_dict = {attr:src_attr.index(attr) for attr in attrs}
+    
+
+    def convert_line(self,line):
+        """
+        Converts line of input to properly fit into the database.
+        Task: Sorts line to match attributes of the relation.
+        """
+
+        line_sorted = [line[self._attr_dict[attr]] \
+                       for attr in self._attr_dict.keys()]
+
+        return line_sorted
+
+
+    @staticmethod
+    def create_table(header,content,widths=None):
+        """
+        Creates table representation of a query with header 
+        and content (optional: fixed column widths).
+        """
+
+        # setup
+        table = Table(box=rich.box.ASCII)
+        # columns
+        widths = widths or [None]*len(header)
+        for attr,width in zip(header,widths):
+            table.add_column(attr,width=width,overflow="fold")
+        # add rows
+        for entry in content:
+            table.add_row(*entry)
+
+        return table
+
+
+    @staticmethod
+    def print_table(table):
+        """Displays table representation of a query."""
+
+        console = Console()
+        console.print(table)
+
+
+    @staticmethod
+    def write_table(table,fname):
+        """Writes table representation of a query to file fname."""
+
+        rich.print(table,file=fname)
+
+
+    @staticmethod
+    def fetch_pages(cursor,page_size=PAGE_SIZE):
+        """
+        Fetches result of a query from cursor (server-side for 
+        named cursors) in pages of page_size rows as strings.
+        """
+
+        while True:
+            page = cursor.fetchmany(page_size)
+            if (not bool(page)):
+                break
+            yield [tuple(map(str,entry)) for entry in page]
+
+
+    @staticmethod
+    def column_widths(header,sample):
+        """
+        Returns column widths for a sample of rows, at most 
+        MAX_COLUMN_WIDTH characters.
+        """
+
+        widths = [len(attr) for attr in header]
+        for entry in sample:
+            widths = [max(width,len(value)) \
+                      for width,value in zip(widths,entry)]
+
+        return [min(width,MAX_COLUMN_WIDTH) for width in widths]
+
+
+    @staticmethod
+    def print_pages(cursor,page_size=PAGE_SIZE):
+        """
+        Displays result of a query page by page as soon as a page
+        is fetched, column widths are taken from the first page.
+        On a terminal, the user is asked before every further page.
+        Returns the header of the query.
+        """
+
+        console = Console()
+        pages = Relation.fetch_pages(cursor,page_size)
+        first_page = next(pages,[])
+        # description of named cursors is set by the first fetch
+        header = tuple(name[0] for name in cursor.description)
+        widths = Relation.column_widths(header,first_page)
+
+        num_rows = 0
+        for page in itertools.chain([first_page],pages):
+            console.print(Relation.create_table(header,page,widths))
+            num_rows += len(page)
+            if (len(page) < page_size):
+                break
+            if (sys.stdin.isatty()):
+                answer = input(f"-- {num_rows} rows, Enter: next page, "+ \
+                               "q+Enter: stop -- ")
+                if (answer.strip()=="q"):
+                    break
+
+        return header
+
+
+    @staticmethod
+    def export_copy(cursor,query,fname):
+        """
+        Exports result of query (str or Composable) with 
+        COPY (query) TO STDOUT, streamed by the server straight 
+        into fname: csv (.csv), gzip-compressed csv (.csv.gz), 
+        Parquet (.parquet) or Arrow IPC (.arrow) file.
+        """
+
+        if (isinstance(cursor,EmbeddedCursor)):
+            query = cursor.render(query)
+        elif (isinstance(query,sql.Composable)):
+            query = query.as_string(cursor)
+        query = query.strip().rstrip(";")
+        copy = sql.SQL("COPY ({}) TO STDOUT WITH (FORMAT csv, HEADER true)") \
+              .format(sql.SQL(query))
+
+        try:
+            if (fname.endswith((".parquet",".arrow"))):
+                Relation._export_arrow(cursor,query,copy,fname)
+            elif (fname.endswith(".gz")):
+                with gzip.open(fname,"wb") as outfile:
+                    cursor.copy_expert(copy,outfile)
+            else:
+                with open(fname,"wb") as outfile:
+                    cursor.copy_expert(copy,outfile)
+        except PermissionError:
+            msg = f"Error: You lack permission to create {fname}."
+            print(msg)
+
+
+    @staticmethod
+    def _export_arrow(cursor,query,copy,fname):
+        """
+        Streams csv output of COPY through a pipe into a Parquet
+        or Arrow file, one record batch per block of csv. Column
+        types are taken from the result of query.
+        """
+
+        if (pyarrow is None):
+            raise ImportError(f"Exporting {fname} requires "+ \
+                              "the pyarrow package.")
+
+        # column types of the result by OID of PostgreSQL 
+        # or name of DuckDB (SQLite: text)
+        arrow_types = {16:pyarrow.bool_(),20:pyarrow.int64(), \
+                       21:pyarrow.int16(),23:pyarrow.int32(), \
+                       700:pyarrow.float32(),701:pyarrow.float64(), \
+                       1082:pyarrow.date32(),1114:pyarrow.timestamp("us"), \
+                       "BOOLEAN":pyarrow.bool_(),"BIGINT":pyarrow.int64(), \
+                       "SMALLINT":pyarrow.int16(),"INTEGER":pyarrow.int32(), \
+                       "FLOAT":pyarrow.float32(),"DOUBLE":pyarrow.float64(), \
+                       "DATE":pyarrow.date32(), \
+                       "TIMESTAMP":pyarrow.timestamp("us")}
+        cursor.execute(sql.SQL("SELECT * FROM ({}) AS result LIMIT 0;") \
+                       .format(sql.SQL(query)))
+        column_types = {column[0]:arrow_types.get( \
+                        column[1] if (isinstance(column[1],int)) \
+                        else str(column[1]),pyarrow.string()) \
+                        for column in cursor.description}
+        convert_options = pyarrow.csv.ConvertOptions( \
+                                column_types=column_types, \
+                                strings_can_be_null=True, \
+                                quoted_strings_can_be_null=False, \
+                                true_values=["t"],false_values=["f"])
+
+        # COPY writes into the pipe while the batches are read
+        read_fd,write_fd = os.pipe()
+        errors = []
+        def copy_to_pipe():
+            try:
+                with os.fdopen(write_fd,"wb") as pipe:
+                    cursor.copy_expert(copy,pipe)
+            except Exception as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=copy_to_pipe)
+        thread.start()
+        with os.fdopen(read_fd,"rb") as pipe:
+            try:
+                reader = pyarrow.csv.open_csv(pipe, \
+                                              convert_options=convert_options)
+                if (fname.endswith(".parquet")):
+                    writer = pyarrow.parquet.ParquetWriter(fname, \
+                                                           reader.schema)
+                else:
+                    writer = pyarrow.ipc.new_file(fname,reader.schema)
+                with writer:
+                    for batch in reader:
+                        writer.write_batch(batch)
+            finally:
+                # unblock the writing thread on errors
+                pipe.close()
+                thread.join()
+        if (bool(errors)):
+            raise errors[0]
+
+
+class IdCache:
+    """
+    A class to represent a bounded cache of surrogate keys
+    (SERIAL ids of parent relations) with LRU eviction.
+
+    ...
+
+    Attributes
+    ----------
+    max_size : int
+        maximum number of cached ids
+    hits : int
+        number of successful lookups
+    misses : int
+        number of failed lookups
+    _ids : OrderedDict
+        ids by (relation name, unique value), least recently used first
+
+    Methods
+    -------
+    get(key):
+        Returns id of key, None if not cached.
+    put(key,value):
+        Stores id of key.
+    report():
+        Returns summary of cache usage.
+    """
+
+    def __init__(self,max_size):
+        """Constructs necessary attributes of the IdCache object."""
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._ids = OrderedDict()
+
+
+    def get(self,key):
+        """Returns id of key, None if not cached."""
+
+        value = self._ids.get(key)
+        if (value is None):
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._ids.move_to_end(key)
+
+        return value
+
+
+    def put(self,key,value):
+        """Stores id of key."""
+
+        self._ids[key] = value
+        self._ids.move_to_end(key)
+        # evict least recently used
+        while (len(self._ids) > self.max_size):
+            self._ids.popitem(last=False)
+
+
+    def report(self):
+        """Returns summary of cache usage."""
+
+        lookups = self.hits + self.misses
+        ratio = self.hits/lookups if (lookups > 0) else 0.
+        msg = f"Id cache: {self.hits} hits, {self.misses} misses " \
+             +f"({ratio:.1%} hit rate), {len(self._ids)} ids cached."
+
+        return msg
+
+
+class ConnectionPool:
+    """
+    A class to represent a pool of database connections.
+    Connections stay open between borrows, so their session 
+    state (e.g. prepared statements) is reused.
+
+    ...
+
+    Attributes
+    ----------
+    sql_user : SQLUser object
+        login data for the SQL server
+    max_size : int
+        maximum number of connections per database
+    _pools : dictionary
+        psycopg2 connection pools by database name
+    _prepared : dictionary
+        EXECUTE queries of the prepared statements by connection 
+        and statement name
+    timings : dictionary
+        number of executions, PREPARE and EXECUTE time in seconds
+        by statement name
+
+    Instance Methods
+    ----------------
+    connection(dbname,autocommit=False):
+        Borrows a connection to dbname and returns it afterwards.
+    execute(cursor,statement,params):
+        Executes a prepared statement, prepares it once per connection.
+    execute_values(cursor,query,rows,page_size=100,fetch=False):
+        Executes query with many rows in a VALUES list.
+    report():
+        Returns PREPARE and EXECUTE timings of the prepared statements.
+    close(dbname):
+        Closes all connections to dbname.
+    close_all():
+        Closes all connections.
+    """
+
+    def __init__(self,sql_user,max_size=2):
+        """Constructs necessary attributes of the ConnectionPool object."""
+
+        self.sql_user = sql_user
+        self.max_size = max_size
+        self._pools = dict()
+        self._prepared = dict()
+        self.timings = dict()
+
+
+    @contextmanager
+    def connection(self,dbname,autocommit=False):
+        """
+        Borrows a connection to dbname and returns it afterwards.
+        The transaction is committed on success and rolled back 
+        on errors.
+        """
+
+        if (dbname not in self._pools):
+            # one connection is opened right away and kept idle
+            self._pools[dbname] = pool.SimpleConnectionPool( \
+                                      1,self.max_size, \
+                                      dbname=dbname, \
+                                      host="localhost", \
+                                      port="5432", \
+                                      user=self.sql_user.name, \
+                                      password=self.sql_user.passwd)
+        conn_pool = self._pools[dbname]
+
+        conn = conn_pool.getconn()
+        conn.autocommit = autocommit
+        try:
+            yield conn
+            if (not autocommit):
+                conn.commit()
+        except BaseException:
+            if (not conn.closed):
+                conn.rollback()
+            raise
+        finally:
+            if (not conn.closed):
+                conn.autocommit = False
+            else:
+                # prepared statements are lost with the session
+                self._prepared.pop(conn,None)
+            conn_pool.putconn(conn,close=bool(conn.closed))
+
+
+    def execute(self,cursor,statement,params):
+        """
+        Executes statement (name, PREPARE query, number of parameters)
+        with params. The statement is parsed by the server once per 
+        connection (PREPARE), rows only EXECUTE it.
+        """
+
+        name,prepare,num_params = statement
+        prepared = self._prepared.setdefault(cursor.connection,dict())
+        timing = self.timings.setdefault(name,[0,0.0,0.0])
+
+        if (name not in prepared):
+            start = time.perf_counter()
+            cursor.execute(prepare)
+            timing[1] += time.perf_counter() - start
+            # EXECUTE query is rendered once as well
+            prepared[name] = sql.SQL("EXECUTE {} ({});").format( \
+                             sql.Identifier(name), \
+                             sql.SQL(', ').join( \
+                                 sql.Placeholder() * num_params)) \
+                            .as_string(cursor)
+
+        start = time.perf_counter()
+        cursor.execute(prepared[name],params)
+        timing[0] += 1
+        timing[2] += time.perf_counter() - start
+
+
+    @staticmethod
+    def execute_values(cursor,query,rows,page_size=100,fetch=False):
+        """
+        Executes query with the VALUES list %s filled by rows,
+        page_size rows per statement (see psycopg2.extras).
+        Returns the rows returned by the query if fetch is True.
+        """
+
+        return execute_values(cursor,query,rows,page_size=page_size, \
+                              fetch=fetch)
+
+
+    def report(self):
+        """Returns PREPARE and EXECUTE timings of the prepared statements."""
+
+        msg = "Prepared statements:"
+        for name,(num_exec,t_prepare,t_execute) in self.timings.items():
+            t_mean = t_execute / max(num_exec,1)
+            msg += f"\n    {name}: PREPARE {t_prepare*1e3:.2f} ms once, " \
+                  +f"{num_exec} x EXECUTE {t_mean*1e3:.3f} ms " \
+                  +f"({t_execute:.2f} s)"
 
+        return msg
 
-class Relation:
+
+    def close(self,dbname):
+        """Closes all connections to dbname."""
+
+        if (dbname in self._pools):
+            self._pools.pop(dbname).closeall()
+            # prepared statements are lost with the session
+            for conn in [conn for conn in self._prepared if conn.closed]:
+                self._prepared.pop(conn)
+
+
+    def close_all(self):
+        """Closes all connections."""
+
+        for dbname in list(self._pools.keys()):
+            self.close(dbname)
+
+
+class EmbeddedCursor:
     """
-    A class to represent a relation.
-    
+    A class to represent a cursor of an embedded database with 
+    the interface of a psycopg2 cursor used by Database and 
+    Relation. Queries (str or Composable) are written in the 
+    dialect of PostgreSQL and translated by the connection.
+
     ...
 
     Attributes
     ----------
-    name : str
-        name of the relation
-    attrs : tuple of str
-        attributes of the relation
-    types : tuple of str
-        data types of the attributes
-    keys : tuple of str
-        primary and foreign keys of the relation
-    cstrs : tuple of str
-        further constraints (e.g. NOT NULL, UNIQUE)
-    level : str
-        *"child": relation has foreign key values
-         depending on the primary key of other relations
-        *"parent": relation has no foreign key values
-         depending on the primary key of other relations
-    _sql_name : Identifier
-        wrapped name variable
-    _sql_attrs : tuple of Identifier
-        wrapped attrs variable
-    _sql_types : tuple of SQL-conform strings
-        wrapped types variable
-    _sql_cstrs : tuple of SQL-conform strings
-        wrapped cstrs variable
-    _attr_dict : dictionary
-        translates lines of the input into attributes of the relation
+    connection : EmbeddedConnection object
+        connection of the cursor
+    itersize : int
+        rows per fetch of named cursors (results are streamed 
+        by the engine anyway)
+    description : list of tuple
+        names (and types) of the columns of the last result
+    _cursor : cursor of the engine
+        cursor executing the translated statements
 
     Instance Methods
     ----------------
-    safe_attrs(is_sql=False):
-        Returns non-key attributes.
-    query_create():
-        Constructs query to CREATE the relation.
-    query_insert():
-        Constructs query to INSERT tuples into the relation.
-    fk_constraints():
-        Sets foreign key constraints for the relation.
-    create_attr_dict(src_attr):
-        Creates dictionary to sort lines of input with attributes 
-        src_attr to match attributes of the relation.
-    convert_line(line):
-        Converts line of input to properly fit into the database.
+    execute(query,params=None):
+        Executes query with params.
+    fetchone(), fetchmany(size=None), fetchall():
+        Fetches rows of the result.
+    copy_expert(query,file):
+        Writes the result of COPY (query) TO STDOUT as csv to file.
+    close():
+        Closes the cursor.
 
     Class Methods
     -------------
-    create_table(header,content):
-        Creates table representation of a query with header and content.
-    print_table(table):
-        Displays table representation of a query.
-    write_table(table,fname):
-        Writes table representation of a query to file fname.
-    export_csv(content,fname):
-        Export query as csv file.
+    render(query):
+        Renders Composable query as str without a server.
     """
 
-    def __init__(self,name,attrs,types,keys,cstrs,level):
-        """Constructs necessary attributes of the Relation object."""
+    def __init__(self,connection):
+        """Constructs necessary attributes of the EmbeddedCursor object."""
 
-        self.name = name
-        self.attrs = attrs
-        self.types = types
-        self.keys = keys
-        self.cstrs = cstrs
-        self.level = level
+        self.connection = connection
+        self.itersize = PAGE_SIZE
+        self.description = None
+        if (connection.engine == "sqlite"):
+            self._cursor = connection._con.cursor()
+        else:
+            # results of DuckDB belong to the connection
+            self._cursor = connection._con
 
-        self._sql_name = sql.Identifier(self.name)
-        self._sql_attrs = tuple(map(sql.Identifier,self.attrs))
-        self._sql_types = tuple(map(sql.SQL,self.types))
-        self._sql_cstrs = tuple(map(sql.SQL,self.cstrs))
 
-        self._attr_dict = {}
+    @staticmethod
+    def render(query):
+        """
+        Renders query (str or Composable) as str: identifiers 
+        are double-quoted, literals single-quoted, placeholders 
+        become "?".
+        """
 
+        if (isinstance(query,sql.Composed)):
+            return "".join(map(EmbeddedCursor.render,query.seq))
+        elif (isinstance(query,sql.Identifier)):
+            return ".".join(['"'+string.replace('"','""')+'"' \
+                             for string in query.strings])
+        elif (isinstance(query,sql.Literal)):
+            value = query.wrapped
+            if (value is None):
+                return "NULL"
+            elif (isinstance(value,bool)):
+                return str(value).upper()
+            elif (isinstance(value,(int,float))):
+                return str(value)
+            return "'"+str(value).replace("'","''")+"'"
+        elif (isinstance(query,sql.Placeholder)):
+            return "?"
+        elif (isinstance(query,sql.SQL)):
+            return query.string
 
-    def safe_attrs(self,is_sql=False):
-        """Returns non-key attributes."""
+        return query
 
-        serial_indices = [self.keys.index(key) for key in self.keys 
-                          if key!=""]
-        if (is_sql):
-            attrs = [attr for attr in self._sql_attrs 
-                     if self._sql_attrs.index(attr) not in serial_indices]
-        else:
-            attrs = [attr for attr in self.attrs 
-                     if self.attrs.index(attr) not in serial_indices]
 
-        return attrs
+    def execute(self,query,params=None):
+        """
+        Executes query with params, errors of the engine are 
+        raised as the errors of psycopg2.
+        """
 
+        self.description = None
+        for statement in self.connection.translate(self.render(query)):
+            self.connection.run(self._cursor,statement,params)
+            self.description = self._cursor.description
 
-    def query_create(self):
-        """Constructs query to CREATE the relation."""
 
-        # get primary key
-        pkey = tuple(key for key in self.keys if key=="PRIMARY KEY")
-        sql_pkey = tuple(map(sql.SQL,pkey))
-        # combine parts of arguments
-        args_zip = tuple(itertools.zip_longest(self._sql_attrs, \
-                                               self._sql_types, \
-                                               sql_pkey, \
-                                               self._sql_cstrs, \
-                                               fillvalue=sql.SQL("")))
-        args_flat = sql.Composed(sql.SQL(', ').join( \
-                                [sql.SQL(' ').join(tpl) for tpl in args_zip]))
+    def fetchone(self):
+        """Fetches next row of the result."""
 
-        query = sql.SQL("CREATE TABLE IF NOT EXISTS {} ({});") \
-               .format(self._sql_name,args_flat)
-    
-        return query
+        return self._cursor.fetchone()
 
 
-    def query_insert(self):
-        """Constructs query to INSERT tuples into the relation."""
+    def fetchmany(self,size=None):
+        """Fetches next size rows (default itersize) of the result."""
 
-        # get attributes not directly or indirectly set via serial
-        attrs = self.safe_attrs(is_sql=True)
+        return self._cursor.fetchmany(size or self.itersize)
 
-        if (self.name != "sessions"):
-            # parent relations
-            query = sql.SQL("""INSERT INTO {} ({}) VALUES ({}) 
-                               ON CONFLICT DO NOTHING;""").format( \
-                    sql.Identifier(self.name), \
-                    sql.SQL(', ').join(attrs), \
-                    sql.SQL(', ').join(sql.Placeholder() * len(attrs)))
-        else:
-            # child relation
-            query = sql.SQL("""INSERT INTO {} ({}) VALUES ({}) 
-                               ON CONFLICT ({}) 
-                               DO UPDATE SET ({}) = ({});""").format( \
-                    sql.Identifier(self.name), \
-                    sql.SQL(', ').join(attrs), \
-                    sql.SQL(', ').join(sql.Placeholder() * len(attrs)), \
-                    sql.SQL('first_date_time'), \
-                    sql.SQL(', ').join(attrs),
-                    sql.SQL(', ').join([sql.SQL('EXCLUDED.')+entry \
-                            for entry in attrs]))
-    
-        return query
 
+    def fetchall(self):
+        """Fetches remaining rows of the result."""
 
-    def fk_constraints(self):
-        """Sets foreign key constraints for the relation."""
-   
-        # get foreign keys
-        fkeys = tuple(key for key in self.keys if key!="PRIMARY KEY")
-        for fkey in fkeys:
-            # name, primary key of other relation
-            pkey_rel,pkey_attr = fkey.split()
-            # foreign key of self
-            fkey_attr = self.attrs[self.keys.index(fkey)]
+        return self._cursor.fetchall()
 
-            query = sql.SQL("""ALTER TABLE {} ADD CONSTRAINT {} 
-                               FOREIGN KEY ({}) REFERENCES {} ({});""") \
-                   .format(self._sql_name, \
-                           sql.Identifier("fk_"+fkey_attr), \
-                           sql.Identifier(fkey_attr), \
-                           sql.Identifier(pkey_rel), \
-                           sql.Identifier(pkey_attr))
 
-            yield query
+    def __iter__(self):
+        """Iterates over the rows of the result."""
 
+        return iter(self.fetchone,None)
 
-    def create_attr_dict(self,src_attr):
+
+    def copy_expert(self,query,file):
         """
-        Creates dictionary to sort lines of input with attributes
-        src_attr to match attributes of the relation.
+        Writes the result of COPY (query) TO STDOUT WITH 
+        (FORMAT csv, HEADER true) to the binary file, in the 
+        text format of PostgreSQL (t/f, empty NULL).
         """
 
-        # get attributes not directly or indirectly set via serial
-        attrs = self.safe_attrs(is_sql=False)
+        match = re.fullmatch(r"\s*COPY \((.*)\) TO STDOUT WITH " \
+                             r"\(FORMAT csv, HEADER true\)\s*", \
+                             self.render(query),re.S)
+        if (match is None):
+            raise psycopg2.NotSupportedError("Only COPY (query) TO STDOUT "+ \
+                                             "as csv is supported.")
+        self.execute(match.group(1))
+
+        def text_format(value):
+            if (value is None):
+                return ""
+            elif (isinstance(value,bool)):
+                return "t" if (value) else "f"
+            elif (isinstance(value,datetime) and value.microsecond > 0):
+                return str(value).rstrip("0")
+            return value
+
+        text = io.TextIOWrapper(file,encoding="utf-8",newline="")
+        writer = csv.writer(text,lineterminator="\n")
+        writer.writerow([column[0] for column in self.description])
+        while True:
+            rows = self.fetchmany(PAGE_SIZE*20)
+            if (not bool(rows)):
+                break
+            writer.writerows([list(map(text_format,row)) for row in rows])
+        # the file is closed by the caller
+        text.flush()
+        text.detach()
 
-        self._attr_dict = {attr:src_attr.index(attr) for attr in attrs}
-    
 
-    def convert_line(self,line):
+    def close(self):
+        """Closes the cursor."""
+
+        if (self.connection.engine == "sqlite"):
+            self._cursor.close()
+
+
+class EmbeddedConnection:
+    """
+    A class to represent a connection to a file-based database
+    of an embedded engine with the interface of a psycopg2 
+    connection: unless in autocommit mode, a transaction begins 
+    with the first statement and lasts until commit or rollback.
+    Statements in the dialect of PostgreSQL are translated by
+    REWRITES outside of string literals. DuckDB has no savepoints,
+    rolling back to one rolls back the transaction.
+
+    ...
+
+    Attributes
+    ----------
+    engine : str
+        "duckdb" or "sqlite"
+    autocommit : bool
+        every statement is committed right away
+    closed : bool
+        connection was closed
+    _con : connection of the engine
+        connection to the database file
+    _in_transaction : bool
+        a transaction was begun
+
+    Instance Methods
+    ----------------
+    cursor(name=None):
+        Returns a new cursor.
+    translate(query):
+        Translates query into statements of the engine.
+    run(cursor,statement,params):
+        Executes a translated statement in the transaction.
+    commit():
+        Commits the transaction.
+    rollback():
+        Rolls back the transaction.
+    close():
+        Closes the connection.
+    """
+
+    # string literal of PostgreSQL
+    LITERAL = re.compile(r"'(?:[^']|'')*'")
+    # rewrites of PostgreSQL statements: pattern, replacement
+    # (None: statement is skipped), literals are masked as '<index>'
+    REGEX_MATCH = r"((?:(?:\"[^\"]*\"|\w+)\.)*(?:\"[^\"]*\"|\w+))\s*~\s*" \
+                  r"('(?:[^']|'')*')"
+    REWRITES = {"duckdb": \
+                # constraints are not added to existing tables
+                [(r"^\s*ALTER TABLE .* FOREIGN KEY",None), \
+                 # upserts cannot update indexed attributes,
+                 # scans are pruned by min-max indexes anyway
+                 (r"^\s*CREATE INDEX",None), \
+                 (r"^\s*(RELEASE )?SAVEPOINT",None), \
+                 (r"^\s*ROLLBACK TO SAVEPOINT.*","ROLLBACK"), \
+                 (r"\bINET\b","VARCHAR"), \
+                 (REGEX_MATCH,r"regexp_matches(\1, \2)")], \
+                "sqlite": \
+                [(r"^\s*ALTER TABLE .* FOREIGN KEY",None), \
+                 # INTEGER PRIMARY KEY is generated
+                 (r"\bSERIAL\b","INTEGER"), \
+                 # values are stored with their type
+                 (r"::\w+",""), \
+                 (r"CAST\(([^()]*) AS DATE\)",r"date(\1)"), \
+                 (REGEX_MATCH,r"\1 REGEXP \2")]}
+
+    def __init__(self,engine,fname):
+        """Constructs necessary attributes of the EmbeddedConnection object."""
+
+        self.engine = engine
+        self.autocommit = False
+        self.closed = False
+        self._in_transaction = False
+        self._rewrites = [(re.compile(pattern,re.S),replacement) \
+                          for pattern,replacement in self.REWRITES[engine]]
+
+        if (engine == "duckdb"):
+            self._con = duckdb.connect(fname)
+        else:
+            # types of the relations are restored on reading
+            sqlite3.register_adapter(datetime, \
+                                     lambda value: value.isoformat(" "))
+            sqlite3.register_converter("TIMESTAMP", \
+                    lambda value: datetime.fromisoformat(value.decode()))
+            sqlite3.register_converter("DATE", \
+                    lambda value: datetime.fromisoformat( \
+                                  value.decode()).date())
+            sqlite3.register_converter("BOOLEAN", \
+                                       lambda value: value==b"1")
+            self._con = sqlite3.connect(fname,isolation_level=None, \
+                                        check_same_thread=False, \
+                                        detect_types=sqlite3.PARSE_DECLTYPES)
+            self._con.create_function("regexp",2,lambda pattern,value: \
+                                      value is not None and \
+                                      re.search(pattern,str(value)) \
+                                      is not None)
+
+
+    def cursor(self,name=None):
+        """Returns a new cursor (name is ignored)."""
+
+        return EmbeddedCursor(self)
+
+
+    def translate(self,query):
         """
-        Converts line of input to properly fit into the database.
-        Task: Sorts line to match attributes of the relation.
+        Translates query of PostgreSQL into a list of statements 
+        of the engine (empty for statements without equivalent).
         """
 
-        line_sorted = [line[self._attr_dict[attr]] \
-                       for attr in self._attr_dict.keys()]
+        statements = []
 
-        return line_sorted
+        literals = []
+        def mask(match):
+            literals.append(match.group(0))
+            return f"'{len(literals)-1}'"
+        masked = False
 
+        for pattern,replacement in self._rewrites:
+            if (pattern.search(query) is None):
+                continue
+            if (replacement is None):
+                return statements
+            # mask literals once a rewrite applies (e.g. '2001:db8::1'
+            # is not a type cast), inlined VALUES are mostly kept
+            if (not masked):
+                query = self.LITERAL.sub(mask,query)
+                masked = True
+            query = pattern.sub(replacement,query)
+
+        # DuckDB generates SERIAL attributes from a sequence
+        table = re.match(r"\s*CREATE TABLE IF NOT EXISTS \"(\w+)\"",query)
+        if (self.engine == "duckdb" and table is not None):
+            table = table.group(1)
+            for attr in re.findall(r"\"(\w+)\" SERIAL",query):
+                sequence = f"{table}_{attr}_seq"
+                statements.append(f"CREATE SEQUENCE IF NOT EXISTS " \
+                                 +f"\"{sequence}\";")
+                query = query.replace(f"\"{attr}\" SERIAL", \
+                                      f"\"{attr}\" INTEGER " \
+                                     +f"DEFAULT nextval('{sequence}')")
+
+        if (bool(literals)):
+            query = re.sub(r"'([0-9]+)'", \
+                           lambda match: literals[int(match.group(1))],query)
+        statements.append(query)
+
+        return statements
+
+
+    def run(self,cursor,statement,params):
+        """
+        Executes a translated statement with the engine cursor
+        in the transaction, errors of the engine are raised as 
+        the errors of psycopg2.
+        """
 
-    @staticmethod
-    def create_table(header,content):
+        if (statement == "ROLLBACK"):
+            self.rollback()
+            return
+        if (not self.autocommit and not self._in_transaction):
+            self._con.execute("BEGIN TRANSACTION;")
+            self._in_transaction = True
+
+        try:
+            cursor.execute(statement,params or ())
+        except (sqlite3.Error,*ENGINE_ERRORS) as error:
+            msg = str(error)
+            if (re.search(r"no such column|[Cc]olumn .* not found|" \
+                          r"does not have a column",msg)):
+                raise psycopg2.errors.UndefinedColumn(msg) from error
+            elif (re.search(r"no such table|Table with name",msg)):
+                raise psycopg2.errors.UndefinedTable(msg) from error
+            elif (re.search(r"UNIQUE|[Cc]onstraint",msg)):
+                raise psycopg2.IntegrityError(msg) from error
+            raise psycopg2.ProgrammingError(msg) from error
+
+
+    def commit(self):
+        """Commits the transaction."""
+
+        if (self._in_transaction):
+            self._con.execute("COMMIT;")
+            self._in_transaction = False
+
+
+    def rollback(self):
+        """Rolls back the transaction."""
+
+        if (self._in_transaction):
+            self._con.execute("ROLLBACK;")
+            self._in_transaction = False
+
+
+    def close(self):
+        """Closes the connection, an open transaction is rolled back."""
+
+        if (not self.closed):
+            self.rollback()
+            self._con.close()
+            self.closed = True
+
+
+class EmbeddedBackend(ConnectionPool):
+    """
+    A class to represent an embedded, file-based database engine 
+    in place of the PostgreSQL server, with the interface of 
+    ConnectionPool: DuckDB (columnar) if installed, SQLite 
+    otherwise. Every database is a file dbname.engine in location.
+
+    ...
+
+    Attributes
+    ----------
+    engine : str
+        "duckdb" or "sqlite"
+    location : str
+        directory of the database files
+    _pools : dictionary
+        open EmbeddedConnection objects by database name
+    _prepared : dictionary
+        translated queries of the prepared statements by name
+    timings : dictionary
+        number of executions, PREPARE and EXECUTE time in seconds
+        by statement name
+
+    Instance Methods
+    ----------------
+    path(dbname):
+        Returns path to the file of database dbname.
+    create(dbname):
+        Creates an empty database dbname, replacing an old one.
+    connection(dbname,autocommit=False):
+        Borrows the connection to dbname.
+    execute(cursor,statement,params):
+        Executes a prepared statement.
+    execute_values(cursor,query,rows,page_size=100,fetch=False):
+        Executes query with many rows in a VALUES list.
+    close(dbname):
+        Closes the connection to dbname.
+    """
+
+    def __init__(self,location,engine="duckdb"):
+        """Constructs necessary attributes of the EmbeddedBackend object."""
+
+        super().__init__(None)
+        if (engine == "duckdb" and duckdb is None):
+            print("DuckDB is not installed, using SQLite.")
+            engine = "sqlite"
+        self.engine = engine
+        self.location = location
+
+
+    def path(self,dbname):
+        """Returns path to the file of database dbname."""
+
+        return os.path.join(self.location,f"{dbname}.{self.engine}")
+
+
+    def create(self,dbname):
+        """Creates an empty database dbname, replacing an old one."""
+
+        self.close(dbname)
+        fname = self.path(dbname)
+        for suffix in ("",".wal","-journal","-wal","-shm"):
+            if (os.path.exists(fname+suffix)):
+                os.remove(fname+suffix)
+        EmbeddedConnection(self.engine,fname).close()
+
+
+    @contextmanager
+    def connection(self,dbname,autocommit=False):
         """
-        Creates table representation of a query with header 
-        and content.
+        Borrows the connection to dbname, opened once. The 
+        transaction is committed on success and rolled back 
+        on errors.
         """
 
-        # setup
-        table = Table(box=rich.box.ASCII)
-        # columns
-        for attr in header:
-            table.add_column(attr)
-        # add rows
-        for entry in content:
-            table.add_row(*entry)
+        conn = self._pools.get(dbname)
+        if (conn is None):
+            if (not os.path.exists(self.path(dbname))):
+                raise psycopg2.OperationalError(f"database \"{dbname}\" " \
+                                               +"does not exist")
+            conn = EmbeddedConnection(self.engine,self.path(dbname))
+            self._pools[dbname] = conn
 
-        return table
+        conn.autocommit = autocommit
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.autocommit = False
 
 
-    @staticmethod
-    def print_table(table):
-        """Displays table representation of a query."""
+    def execute(self,cursor,statement,params):
+        """
+        Executes statement (name, PREPARE query, number of parameters)
+        with params. The query is rendered and translated once, the 
+        engines cache its plan.
+        """
 
-        console = Console()
-        console.print(table)
+        name,prepare,num_params = statement
+        timing = self.timings.setdefault(name,[0,0.0,0.0])
+
+        if (name not in self._prepared):
+            start = time.perf_counter()
+            query = re.sub(r"^\s*PREPARE \S+ AS ","", \
+                           cursor.render(prepare))
+            if (self.engine == "sqlite"):
+                query = re.sub(r"\$([0-9]+)",r"?\1",query)
+            self._prepared[name] = query
+            timing[1] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        cursor.execute(self._prepared[name],params)
+        timing[0] += 1
+        timing[2] += time.perf_counter() - start
 
 
     @staticmethod
-    def write_table(table,fname):
-        """Writes table representation of a query to file fname."""
+    def execute_values(cursor,query,rows,page_size=100,fetch=False):
+        """
+        Executes query with the VALUES list %s filled by rows,
+        page_size rows per statement bound as parameters (inlined 
+        as literals for DuckDB, which probes for pandas on every 
+        bound parameter).
+        Returns the rows returned by the query if fetch is True.
+        """
 
-        rich.print(table,file=fname)
+        head,tail = cursor.render(query).split("%s",1)
+        inline = (cursor.connection.engine == "duckdb")
+        returned = []
+        for start in range(0,len(rows),page_size):
+            page = rows[start:start+page_size]
+            if (inline):
+                values = ", ".join(["("+", ".join( \
+                    [cursor.render(sql.Literal(value)) for value in row]) \
+                    +")" for row in page])
+                cursor.execute(head+values+tail)
+            else:
+                values = ", ".join(["("+", ".join(["?"]*len(row))+")" \
+                                    for row in page])
+                cursor.execute(head+values+tail, \
+                               [value for row in page for value in row])
+            if (fetch):
+                returned.extend(cursor.fetchall())
 
+        return returned if (fetch) else None
 
-    @staticmethod
-    def export_csv(content,fname):
-        """Export query as csv file."""
 
-        try:
-            with open(fname,"w",newline="") as csvfile:
-                writer = csv.writer(csvfile,delimiter=",",quotechar="\"", \
-                                    quoting=csv.QUOTE_MINIMAL)
-                for line in content:
-                    writer.writerow(line)
-        except PermissionError:
-            msg = f"Error: You lack permission to create {fname}."
-            print(msg)
+    def close(self,dbname):
+        """Closes the connection to dbname."""
+
+        if (dbname in self._pools):
+            self._pools.pop(dbname).close()
+        self._prepared.clear()
 
 
 def check_db_exists(function):
-    """Decorator checking if the database exists."""
+    """
+    Decorator checking if the database exists and has the 
+    relations of this version.
+    """
 
     @wraps(function)
     def decorated(*args):
@@ -568,6 +3053,13 @@ def check_db_exists(function):
         except psycopg2.errors.OperationalError:
             msg = "Error: Cannot find database."
             print(msg)
+        except (psycopg2.errors.UndefinedTable, \
+                psycopg2.errors.UndefinedColumn) as error:
+            # database of an older version (e.g. without hosts)
+            msg = "Error: The database has an outdated schema " \
+                 +f"({str(error).splitlines()[0]}), " \
+                 +"recreate it with --create."
+            print(msg)
     return decorated
 
 
@@ -587,20 +3079,90 @@ class Database:
         name of the file to store the Test-suite output
     relations : list of Relation objects
         relations contained in the Database
+    batch_size : int
+        number of processed lines written per statement
+        (0: one statement per line and relation)
+    id_cache : IdCache object
+        ids of parent relations by their unique attribute
+    workers : int
+        number of processes parsing the Log (1: serial), 
+        of hosts parsed at once with hosts
+    flush_interval : timedelta
+        Log time after which pending session states are written
+        (None: once per session)
+    detector : BruteForceDetector object
+        counts failed passwords while processing the Log
+        (None: no detection)
+    alerts : Relation object
+        alerts of the detector
+    partitioned : bool
+        sessions are created range-partitioned by month of 
+        first_date_time
+    retention : int
+        months of sessions kept before the month of the last
+        database entry, older partitions are dropped (0: all)
+    partitions : set of str
+        months (yyyy-mm) with a partition created in this run
+    backend : EmbeddedBackend object
+        embedded database in place of the PostgreSQL server
+        (None: server)
+    hosts : list of LogFile objects
+        Logs of many hosts read in place of file (None: file)
+    summaries : list of tuple (Relation object, Composable)
+        summary relations of sessions with the expression 
+        aggregated by
+    pool : ConnectionPool object
+        connections shared by all methods (None until first use)
 
     Instance Methods
     ----------------
+    check_credentials(sql_user):
+        Checks Username and Password.
+    connection(sql_user,dbname=None,autocommit=False):
+        Borrows a pooled connection (default: to the Database).
+    close_connections():
+        Closes all pooled connections.
     create_database(sql_user):
         Creates database.
     initialize_relations():
         Initializes relations for the database.
+    warm_cache(cursor):
+        Fills id cache from the parent relations.
+    create_summaries(cursor):
+        Creates indexes and summary relations.
+    create_partitions(header,chunk,cursor):
+        Creates the partitions of sessions needed for a chunk.
+    maintain_partitions(cursor,last_entry):
+        Detects partitioning, drops partitions past retention.
+    write_alerts(cursor):
+        Writes pending alerts of the detector.
+    refresh_summaries(cursor,since):
+        Refreshes summaries for sessions updated since a given time.
+    insert_parent(relation,header,line,cursor):
+        Inserts line into parent relation unless its id is cached.
     fetch_fk(child_relation,header,line,cursor):
         Fetch primary key values from parent relations 
         to insert them into foreign keys of child relations.
+    insert_batch(header,chunk,cursor):
+        Inserts a chunk of processed lines into all relations.
+    fill_relations(header,log_processed,cursor):
+        Fills relations with the processed Log file.
     setup_relations(sql_user,user_list):
         Creates and fills relations.
+    process_file(user_list,buffer_time,break_time):
+        Starts processing the Log file, in parallel if requested.
+    process_hosts(user_list,windows):
+        Processes the Logs of all hosts concurrently.
+    time_window(cursor,host=None):
+        Returns buffer_time and break_time of the database.
     append(sql_user,user_list):
         Appends data to the database.
+    _pipeline(sql_user,user_list,queue_size):
+        Reads, parses and writes the Log in concurrent stages.
+    append_pipeline(sql_user,user_list,queue_size=4):
+        Appends data to the database with an asyncio pipeline.
+    follow(sql_user,user_list,checkpoint,poll_interval):
+        Appends newly logged data to the database continuously.
     _if_instructions():
         Instructions for interface.
     _if_minmax(input_flat):
@@ -616,8 +3178,6 @@ class Database:
 
     Class Methods
     -------------
-    check_credentials(sql_user):
-        Checks Username and Password.
     _if_read(input_quit):
         Read input from user.
     _if_export(input_flat,header,response):
@@ -631,58 +3191,98 @@ class Database:
         Includes minmax statements.
     """
 
-    def __init__(self,name,file,tests):
+    def __init__(self,name,file,tests,batch_size=1000,cache_size=10000, \
+                 workers=1,flush_interval=None,detector=None, \
+                 partitioned=False,retention=0,backend=None,hosts=None):
         """Constructs necessary attributes of the Database object."""
 
         self.name = name
         self.file = file
         self.tests = tests
         self.relations = None
+        self.summaries = None
+        self.batch_size = batch_size
+        self.id_cache = IdCache(cache_size)
+        self.workers = workers
+        self.flush_interval = flush_interval
+        self.detector = detector
+        self.alerts = None
+        self.partitioned = partitioned
+        self.retention = retention
+        self.partitions = set()
+        self.backend = backend
+        self.hosts = hosts
+        self.pool = None
+
+
+    def check_credentials(self,sql_user):
+        """
+        Checks Username and Password. The connection pool is 
+        configured with the login data on success. Embedded 
+        databases need no login.
+        """
 
-
-    @staticmethod
-    def check_credentials(sql_user):
-        """Checks Username and Password."""
+        if (self.backend is not None):
+            return True
 
         connected = False
+        self.close_connections()
         try:
-            conn = psycopg2.connect(dbname="postgres",
-                                    host="localhost",
-                                    port="5432",
-                                    user=sql_user.name,
-                                    password=sql_user.passwd)
-            conn.close()
+            with self.connection(sql_user,"postgres"):
+                pass
         except psycopg2.errors.OperationalError:
             msg = "Error: Wrong Username or Password."
             print(msg)
+            self.close_connections()
         else:
             connected = True
 
-        return connected
+        return connected
+
+
+    def connection(self,sql_user,dbname=None,autocommit=False):
+        """
+        Borrows a pooled connection to dbname (default: the 
+        Database) for a with-statement. The pool is configured
+        once from sql_user.
+        """
+
+        if (self.pool is None):
+            self.pool = self.backend or ConnectionPool(sql_user)
+
+        return self.pool.connection(dbname or self.name,autocommit)
+
+
+    def close_connections(self):
+        """Closes all pooled connections."""
+
+        if (self.pool is not None):
+            self.pool.close_all()
+            self.pool = None
 
 
     def create_database(self,sql_user):
         """Creates database."""
+
+        if (self.backend is not None):
+            self.backend.create(self.name)
+            return
     
-        conn = psycopg2.connect(dbname="postgres",
-                                host="localhost",
-                                port="5432",
-                                user=sql_user.name,
-                                password=sql_user.passwd)
-        conn.autocommit = True
-        cursor = conn.cursor()
+        with self.connection(sql_user,"postgres",autocommit=True) as conn:
+            cursor = conn.cursor()
    
-        # remove database if it exists already
-        query = sql.SQL("DROP DATABASE IF EXISTS {};") \
-               .format(sql.Identifier(self.name))
-        cursor.execute(query)
-        # create database
-        query = sql.SQL("CREATE DATABASE {};") \
-               .format(sql.Identifier(self.name))
-        cursor.execute(query)
-        
-        cursor.close()
-        conn.close()
+            # remove database if it exists already
+            # (idle pooled connections would block it)
+            self.pool.close(self.name)
+            query = sql.SQL("DROP DATABASE IF EXISTS {};") \
+                   .format(sql.Identifier(self.name))
+            cursor.execute(query)
+            # create database
+            query = sql.SQL("CREATE DATABASE {};") \
+                   .format(sql.Identifier(self.name))
+            cursor.execute(query)
+
+            cursor.close()
     
     
     def initialize_relations(self):
@@ -691,14 +3291,32 @@ class Database:
         # initialize Relation objects
         # sessions
         name = "sessions"
-        attrs = ("session_id","ip_id","user_id","pid","fail_count", \
-                 "login_status","first_date_time","last_date_time")
+        attrs = ("session_id","host_id","ip_id","user_id","pid", \
+                 "fail_count","login_status","first_date_time", \
+                 "last_date_time")
         types = ("SERIAL","INTEGER","INTEGER","INTEGER","INTEGER", \
-                 "TEXT","TIMESTAMP","TIMESTAMP")
-        keys = ("PRIMARY KEY","ip_addresses ip_id","users user_id")
-        cstrs = (*[""]*3,*["NOT NULL"]*3,"NOT NULL UNIQUE","NOT NULL")
+                 "INTEGER","TEXT","TIMESTAMP","TIMESTAMP")
+        keys = ("PRIMARY KEY","hosts host_id","ip_addresses ip_id", \
+                "users user_id")
+        cstrs = ("","NOT NULL",*[""]*2,*["NOT NULL"]*5)
         level = "child"
-        sessions = Relation(name,attrs,types,keys,cstrs,level)
+        indexes = (("last_date_time",),("host_id","last_date_time"), \
+                   ("user_id","login_status"),("ip_id",))
+        # (range partitions of the PostgreSQL server only)
+        partitioned = (self.partitioned and self.backend is None)
+        partition = "first_date_time" if (partitioned) else None
+        # natural key: pids are unique per host at a time
+        unique = ("host_id","pid","first_date_time")
+        sessions = Relation(name,attrs,types,keys,cstrs,level,indexes, \
+                            partition,unique)
+        # hosts
+        name = "hosts"
+        attrs = ("host_id","host_name")
+        types = ("SERIAL","TEXT")
+        keys = ("PRIMARY KEY",)
+        cstrs = ("","NOT NULL UNIQUE")
+        level = "parent"
+        hosts = Relation(name,attrs,types,keys,cstrs,level)
         # users
         name = "users"
         attrs = ("user_id","user_name","user_exists")
@@ -716,163 +3334,656 @@ class Database:
         level = "parent"
         ip_addresses = Relation(name,attrs,types,keys,cstrs,level)
         # relations
-        self.relations = [users,ip_addresses,sessions]
+        self.relations = [hosts,users,ip_addresses,sessions]
+
+        # summaries of sessions per day, IP address, user and host
+        attrs = ("sessions","failed_sessions","fail_count")
+        types = ("INTEGER","INTEGER","INTEGER")
+        keys = ("PRIMARY KEY",)
+        cstrs = ("",*["NOT NULL"]*3)
+        level = "summary"
+        self.summaries = []
+        for name,key_attr,key_type,key in \
+            (("failures_per_day","day","DATE", \
+              sql.SQL("CAST(first_date_time AS DATE)")), \
+             ("failures_per_ip","ip_id","INTEGER",sql.Identifier("ip_id")), \
+             ("failures_per_user","user_id","INTEGER", \
+              sql.Identifier("user_id")), \
+             ("failures_per_host","host_id","INTEGER", \
+              sql.Identifier("host_id"))):
+            summary = Relation(name,(key_attr,*attrs),(key_type,*types), \
+                               keys,cstrs,level)
+            self.summaries.append((summary,key))
+
+        # alerts of brute-force detection
+        name = "alerts"
+        attrs = ("alert_id","kind","source","failures","window_start", \
+                 "detected","estimated")
+        types = ("SERIAL","TEXT","TEXT","INTEGER","TIMESTAMP","TIMESTAMP", \
+                 "BOOLEAN")
+        keys = ("PRIMARY KEY",)
+        cstrs = ("",*["NOT NULL"]*6)
+        level = "alert"
+        indexes = (("kind","source","detected"),)
+        self.alerts = Relation(name,attrs,types,keys,cstrs,level,indexes)
+
+
+    def create_summaries(self,cursor):
+        """
+        Creates indexes and summary relations unless they exist.
+        Returns True if the summaries are empty.
+        """
+
+        for relation in self.relations:
+            for query in relation.query_indexes():
+                cursor.execute(query)
+
+        for summary,key in self.summaries:
+            cursor.execute(summary.query_create())
+
+        # summaries of an existing database are filled completely
+        query = sql.SQL("SELECT NOT EXISTS (SELECT 1 FROM {});") \
+               .format(sql.Identifier(self.summaries[0][0].name))
+        cursor.execute(query)
+
+        return cursor.fetchone()[0]
+
+
+    def create_partitions(self,header,chunk,cursor):
+        """
+        Creates the monthly partitions of sessions for the 
+        first_date_time of a chunk of processed lines, unless
+        created before in this run.
+        """
+
+        sessions = [relation for relation in self.relations \
+                    if relation.name=="sessions"][0]
+        if (sessions.partition is None):
+            return
+
+        index = header.index(sessions.partition)
+        months = set([str(line[index])[:7] for line in chunk])
+        for month in sorted(months - self.partitions):
+            cursor.execute(sessions.query_partition(month))
+            self.partitions.add(month)
+
+
+    def maintain_partitions(self,cursor,last_entry):
+        """
+        Detects whether sessions of an existing database is 
+        partitioned. Drops the partitions of months more than 
+        retention months before the month of last_entry, the 
+        summaries are dropped with them to be rebuilt by 
+        create_summaries.
+        """
+
+        sessions = [relation for relation in self.relations \
+                    if relation.name=="sessions"][0]
+        if (self.backend is not None):
+            sessions.partition = None
+            if (self.retention > 0):
+                msg = "Error: Retention requires the PostgreSQL server."
+                print(msg)
+            return
+
+        query = """SELECT relkind = 'p' FROM pg_class 
+                   WHERE oid = to_regclass('sessions');"""
+        cursor.execute(query)
+        partitioned = cursor.fetchone()
+        if (partitioned is not None and partitioned[0]):
+            sessions.partition = "first_date_time"
+        else:
+            sessions.partition = None
+
+        if (self.retention <= 0 or last_entry == datetime.min):
+            return
+        if (sessions.partition is None):
+            msg = "Error: Retention requires partitioned sessions " \
+                 +"(Create-mode with --partition)."
+            print(msg)
+            return
+
+        # oldest month kept
+        oldest = last_entry.year*12 + last_entry.month-1 - self.retention
+        query = """SELECT c.relname FROM pg_inherits AS i 
+                   INNER JOIN pg_class AS c ON c.oid = i.inhrelid 
+                   WHERE i.inhparent = 'sessions'::regclass 
+                   ORDER BY 1;"""
+        cursor.execute(query)
+        dropped = []
+        for (name,) in cursor.fetchall():
+            match = re.fullmatch(r"sessions_([0-9]{4})_([0-9]{2})",name)
+            if (match is not None and \
+                int(match.group(1))*12 + int(match.group(2))-1 < oldest):
+                query = sql.SQL("DROP TABLE {};") \
+                       .format(sql.Identifier(name))
+                cursor.execute(query)
+                dropped.append(name)
+
+        if (bool(dropped)):
+            for summary,key in self.summaries:
+                query = sql.SQL("DROP TABLE IF EXISTS {};") \
+                       .format(summary._sql_name)
+                cursor.execute(query)
+            print(f"Dropped partitions {', '.join(dropped)}.")
+
+
+    def write_alerts(self,cursor):
+        """
+        Writes pending alerts of the detector to the alerts relation,
+        alerts already written (same kind, source and time) 
+        are skipped.
+        """
+
+        if (self.detector is None or not bool(self.detector.alerts)):
+            return
+
+        cursor.execute(self.alerts.query_create())
+        for query in self.alerts.query_indexes():
+            cursor.execute(query)
+
+        alerts = []
+        while (bool(self.detector.alerts)):
+            alerts.append(self.detector.alerts.popleft())
+
+        attrs = sql.SQL(', ').join(self.alerts._sql_attrs[1:])
+        query = sql.SQL("""WITH v ({}) AS (VALUES %s) 
+                           INSERT INTO {} ({}) SELECT * FROM v 
+                           WHERE NOT EXISTS (SELECT 1 FROM {} AS a 
+                           WHERE a.kind = v.kind AND a.source = v.source 
+                           AND a.detected = v.detected);""").format( \
+                attrs,self.alerts._sql_name,attrs,self.alerts._sql_name)
+        self.pool.execute_values(cursor,query,alerts)
+
+
+    def refresh_summaries(self,cursor,since):
+        """
+        Refreshes the summaries for all days, IP addresses and users
+        of sessions updated at or after since.
+        """
+
+        for summary,key in self.summaries:
+            cursor.execute(summary.query_refresh(key),(since,))
+
+
+    def warm_cache(self,cursor):
+        """Fills id cache from the parent relations."""
+
+        for relation in self.relations:
+            if (relation.level=="parent"):
+                query = sql.SQL("SELECT {}, {} FROM {} LIMIT {};").format( \
+                        sql.Identifier(relation.pkey_attr()), \
+                        sql.Identifier(relation.unique_attr()), \
+                        sql.Identifier(relation.name), \
+                        sql.Literal(self.id_cache.max_size))
+                cursor.execute(query)
+                for parent_id,unique_val in cursor.fetchall():
+                    self.id_cache.put((relation.name,unique_val),parent_id)
+
+
+    def insert_parent(self,relation,header,line,cursor):
+        """Inserts line into parent relation unless its id is cached."""
+
+        unique_val = line[header.index(relation.unique_attr())]
+        if (self.id_cache.get((relation.name,unique_val)) is None):
+            line_converted = relation.convert_line(line)
+            self.pool.execute(cursor,relation.statement("insert"), \
+                              line_converted)
+            # nothing returned if tuple exists already
+            parent_id = cursor.fetchone()
+            if (parent_id is not None):
+                self.id_cache.put((relation.name,unique_val),parent_id[0])
 
 
     def fetch_fk(self,child_relation,header,line,cursor):
         """
         Fetch primary key values from parent relations 
         to insert them into foreign keys of child relations.
+        Served from the id cache, parent relations are only
+        queried on a miss.
         """
 
-        if (child_relation.level=="child"):
-
-            # get child_id from child relation
-            pkey_attr_child = tuple(child_relation.attrs[ii] 
-                                    for ii,key in enumerate(child_relation.keys) 
-                                    if key=="PRIMARY KEY")[0]
-            unique_attr = tuple(child_relation.attrs[ii]
-                                for ii,cstr in enumerate(child_relation.cstrs)
-                                if "UNIQUE" in cstr)[0]
-            query = sql.SQL("SELECT {} FROM {} WHERE {} = {};").format( \
-                    sql.Identifier(pkey_attr_child), \
-                    sql.Identifier(child_relation.name), \
-                    sql.Identifier(unique_attr), \
-                    sql.Placeholder())
+        fkey_vals = []
+        fkeys = tuple(key for key in child_relation.keys 
+                      if key!="PRIMARY KEY")
+        for fkey in fkeys:
+            rel_parent = fkey.split()[0]
+            parent = [rel for rel in self.relations \
+                      if rel.name==rel_parent][0]
+            unique_attr = parent.unique_attr()
             unique_val = line[header.index(unique_attr)]
-            cursor.execute(query,(unique_val,))
-            child_id = cursor.fetchone()
 
+            parent_id = self.id_cache.get((rel_parent,unique_val))
+            if (parent_id is None):
+                # get foreign key IDs
+                self.pool.execute(cursor,parent.statement("lookup"), \
+                                  (unique_val,))
+                parent_id = cursor.fetchone()[0]
+                self.id_cache.put((rel_parent,unique_val),parent_id)
 
-            fkeys = tuple(key for key in child_relation.keys 
-                          if key!="PRIMARY KEY")
-            for fkey in fkeys:
-                rel_parent,pkey_attr_parent = fkey.split() 
+            fkey_vals.append(parent_id)
 
-                # get foreign key IDs
-                unique_attr = tuple(rel.attrs[ii] \
-                                    for rel in self.relations \
-                                    for ii,cstr in enumerate(rel.cstrs) \
-                                    if rel.name==rel_parent \
-                                       and "UNIQUE" in cstr)[0]
-                query = sql.SQL("SELECT {} FROM {} WHERE {} = {};").format( \
-                        sql.Identifier(pkey_attr_parent), \
-                        sql.Identifier(rel_parent), \
-                        sql.Identifier(unique_attr), \
-                        sql.Placeholder())
-                unique_val = line[header.index(unique_attr)]
-                cursor.execute(query,(unique_val,))
-                parent_id = cursor.fetchone()
-
-                # set foreign key IDs
-                query = sql.SQL("UPDATE {} SET {} = {} WHERE {} = {};").format( \
-                        sql.Identifier(child_relation.name), \
-                        sql.Identifier(pkey_attr_parent), \
-                        sql.Placeholder(), \
-                        sql.Identifier(pkey_attr_child), \
-                        sql.Placeholder())
-                cursor.execute(query,(parent_id,child_id))
+        return fkey_vals
+
+
+    def insert_batch(self,header,chunk,cursor):
+        """
+        Inserts a chunk of processed lines into all relations,
+        using one multi-row statement per relation.
+        """
+
+        parents = [rel for rel in self.relations if rel.level=="parent"]
+        self.create_partitions(header,chunk,cursor)
+
+        for relation in self.relations:
+            # one tuple per natural key, since a statement
+            # must not affect the same row twice
+            key_indices = [header.index(attr) \
+                           for attr in relation.key_attrs(parents)]
+            rows = dict()
+            for line in chunk:
+                key = tuple([line[index] for index in key_indices])
+                if (relation.level=="parent"):
+                    # first occurrence, as ON CONFLICT DO NOTHING,
+                    # skip tuples with cached id
+                    if (key not in rows and \
+                        self.id_cache.get((relation.name,*key)) is None):
+                        rows[key] = tuple(relation.convert_line(line))
+                else:
+                    # latest state of the session, as DO UPDATE
+                    rows[key] = tuple(line)
+
+            if (not bool(rows)):
+                continue
+            query = relation.query_insert_batch(header,parents)
+            is_parent = (relation.level=="parent")
+            returned = self.pool.execute_values(cursor,query, \
+                                                list(rows.values()), \
+                                                page_size=len(rows), \
+                                                fetch=is_parent)
+            if (is_parent):
+                for parent_id,unique_val in returned:
+                    self.id_cache.put((relation.name,unique_val),parent_id)
+
+
+    def fill_relations(self,header,log_processed,cursor):
+        """
+        Fills relations with the processed Log file,
+        in chunks of batch_size lines.
+        """
+
+        self.warm_cache(cursor)
+
+        if (self.batch_size > 0):
+            while True:
+                chunk = list(itertools.islice(log_processed, \
+                                              self.batch_size))
+                if (not bool(chunk)):
+                    break
+                self.insert_batch(header,chunk,cursor)
+        else:
+            for line in log_processed:
+                for relation in self.relations:
+                    if (relation.level=="parent"):
+                        self.insert_parent(relation,header,line,cursor)
+                    else:
+                        self.create_partitions(header,[line],cursor)
+                        # fetch primary key values to foreign keys
+                        line_converted = [*relation.convert_line(line), \
+                                          *self.fetch_fk(relation,header, \
+                                                         line,cursor)]
+                        self.pool.execute(cursor, \
+                                          relation.statement("insert"), \
+                                          line_converted)
+
+
+    def process_file(self,user_list,buffer_time,break_time):
+        """Starts processing the Log file, in parallel if requested."""
+
+        # failed passwords are detected in order of the Log
+        if (self.workers > 1 and self.detector is None):
+            log_processed = self.file.process_log_parallel(user_list, \
+                                                           buffer_time, \
+                                                           break_time, \
+                                                           self.workers)
+        else:
+            log_processed = self.file.process_log(user_list, \
+                                                  buffer_time,break_time, \
+                                                  None,self.flush_interval, \
+                                                  self.detector)
+
+        return self.file.tag_host(log_processed)
+
+
+    def process_hosts(self,user_list,windows):
+        """
+        Processes the Logs of all hosts concurrently, one host per
+        task of a pool of worker processes, largest Logs first.
+        windows holds buffer_time and break_time by host. Yields 
+        HOST_HEADER, then the processed lines of every host as 
+        soon as the host is completed. Failed passwords are 
+        detected per host, the alerts are collected by detector.
+        """
+
+        yield HOST_HEADER
+
+        log_files = sorted(self.hosts,key=lambda log_file: log_file.size(), \
+                           reverse=True)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(log_file.process_host,user_list, \
+                                       *windows[log_file.host], \
+                                       self.flush_interval,self.detector) \
+                       for log_file in log_files]
+            for future in as_completed(futures):
+                # lines of a host are released once written
+                futures.remove(future)
+                lines,alerts = future.result()
+                if (self.detector is not None):
+                    self.detector.alerts.extend(alerts)
+                yield from lines
 
 
     @check_db_exists
     def setup_relations(self,sql_user,user_list):
         """Creates and fills relations."""
     
-        conn = psycopg2.connect(dbname=self.name,
-                                host="localhost",
-                                port="5432",
-                                user=sql_user.name,
-                                password=sql_user.passwd)
-        cursor = conn.cursor()
+        with self.connection(sql_user) as conn:
+            cursor = conn.cursor()
       
-        # dummy value for time of last database entry
-        buffer_time = datetime.now() - timedelta(days=14)
-        # dummy value for lifetime of a ssh login session
-        break_time = datetime.now() - timedelta(days=14)
-
-        # start generator
-        log_processed = self.file.process_log(user_list, \
-                                              buffer_time,break_time)
-
-        # create relations
-        header = next(log_processed)
-        for relation in self.relations:
-            relation.create_attr_dict(header)
-            query = relation.query_create()
-            cursor.execute(query)
+            # dummy value for time of last database entry
+            buffer_time = datetime.now() - timedelta(days=14)
+            # dummy value for lifetime of a ssh login session
+            break_time = datetime.now() - timedelta(days=14)
+
+            # start generator
+            if (self.hosts is not None):
+                windows = {log_file.host:(buffer_time,break_time) \
+                           for log_file in self.hosts}
+                log_processed = self.process_hosts(user_list,windows)
+            else:
+                log_processed = self.process_file(user_list,buffer_time, \
+                                                  break_time)
 
-        # add constraints
-        for relation in self.relations:
-            for query in relation.fk_constraints():
+            # create relations
+            header = next(log_processed)
+            for relation in self.relations:
+                relation.create_attr_dict(header)
+                query = relation.query_create()
                 cursor.execute(query)
-    
-        # fill relations
-        for line in log_processed:
+
+            # add constraints
             for relation in self.relations:
-                line_converted = relation.convert_line(line)
-                query = relation.query_insert()
-                cursor.execute(query,line_converted)
-                
-                # fetch primary key values to foreign keys
-                self.fetch_fk(relation,header,line,cursor)
+                for query in relation.fk_constraints():
+                    cursor.execute(query)
     
-        conn.commit()
-        cursor.close()
-        conn.close()
+            # fill relations
+            self.fill_relations(header,log_processed,cursor)
+
+            # indexes and summaries after filling
+            self.create_summaries(cursor)
+            self.refresh_summaries(cursor,datetime.min)
+            self.write_alerts(cursor)
+
+            cursor.close()
     
     
-    @check_db_exists
-    def append(self,sql_user,user_list):
-        """Appends data to the database."""
-
-        conn = psycopg2.connect(dbname=self.name,
-                                host="localhost",
-                                port="5432",
-                                user=sql_user.name,
-                                password=sql_user.passwd)
-        cursor = conn.cursor()
+    @staticmethod
+    def time_window(cursor,host=None):
+        """
+        Returns buffer_time (start of the lifetime of a ssh 
+        login session before the last database entry) and 
+        break_time (time of the last database entry) of host
+        (None: of all hosts).
+        """
 
         # time of last database entry
-        query = """
-                SELECT last_date_time from sessions 
-                WHERE last_date_time = 
-                (SELECT MAX(last_date_time) FROM sessions);
-                """
-        cursor.execute(query)
-        break_time = cursor.fetchone()[0]
-
-        # default parameters for ssh login-session
-        # (see man sshd_config, CamelCase at underscore)
-        max_auth_tries = 6
-        login_grace_time = timedelta(minutes=2)
-        delays = timedelta(minutes=1)
-        dt = login_grace_time * max_auth_tries + delays
+        # (served by the indexes on last_date_time)
+        if (host is None):
+            query = "SELECT MAX(last_date_time) FROM sessions;"
+            cursor.execute(query)
+        else:
+            query = sql.SQL("""SELECT MAX(sessions.last_date_time) 
+                               FROM sessions INNER JOIN hosts 
+                               ON sessions.host_id = hosts.host_id 
+                               WHERE hosts.host_name = {};""").format( \
+                    sql.Placeholder())
+            cursor.execute(query,(host,))
+        last_entry = cursor.fetchone()
+        if (last_entry[0] is None):
+            # empty database
+            return datetime.min,datetime.min
+        break_time = last_entry[0]
+        if (isinstance(break_time,str)):
+            # aggregates of SQLite are not converted
+            break_time = datetime.fromisoformat(break_time)
+
         # lifetime of a ssh login session before
         # time of last database entry
-        buffer_time = break_time - dt
+        buffer_time = break_time - SESSION_LIFETIME
+
+        return buffer_time,break_time
+
+
+    @check_db_exists
+    def append(self,sql_user,user_list):
+        """Appends data to the database."""
+
+        with self.connection(sql_user) as conn:
+            cursor = conn.cursor()
+
+            last_entry = self.time_window(cursor)[1]
+            self.maintain_partitions(cursor,last_entry)
+            # every host continues after its last entry
+            log_files = self.hosts or [self.file]
+            windows = {log_file.host:self.time_window(cursor,log_file.host) \
+                       for log_file in log_files}
+            since = min([window[1] for window in windows.values()])
+            if (self.create_summaries(cursor)):
+                since = datetime.min
        
-        # start generator
-        log_processed = self.file.process_log(user_list, \
-                                              buffer_time,break_time)
+            # start generator
+            if (self.hosts is not None):
+                log_processed = self.process_hosts(user_list,windows)
+            else:
+                log_processed = self.process_file(user_list, \
+                                                  *windows[self.file.host])
 
-        # create association between Log file and relations
-        header = next(log_processed)
-        for relation in self.relations:
-            relation.create_attr_dict(header)
+            # create association between Log file and relations
+            header = next(log_processed)
+            for relation in self.relations:
+                relation.create_attr_dict(header)
 
-        # append to relations
-        for line in log_processed:
+            # append to relations
+            self.fill_relations(header,log_processed,cursor)
+            self.refresh_summaries(cursor,since)
+            self.write_alerts(cursor)
+
+            cursor.close()
+
+
+    async def _pipeline(self,sql_user,user_list,queue_size):
+        """
+        Reads, parses and writes the Log in concurrent stages 
+        connected by bounded queues of queue_size chunks:
+        *reader: reads chunks of batch_size lines, hands them 
+         to the parser pool (processes if workers > 1)
+        *sessions: accumulates the sessions of parsed chunks 
+         in order
+        *writer: inserts and commits chunks of sessions
+        Full queues hold back the stages before them. SIGTERM and
+        SIGINT stop the reader, chunks already read are written.
+        """
+
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for signum in (signal.SIGTERM,signal.SIGINT):
+            loop.add_signal_handler(signum,stop.set)
+
+        # Log lines per chunk
+        chunk_size = self.batch_size if (self.batch_size > 0) else 1000
+        parsed = asyncio.Queue(queue_size)
+        processed = asyncio.Queue(queue_size)
+
+        if (self.workers > 1):
+            parser_pool = ProcessPoolExecutor(self.workers)
+        else:
+            parser_pool = None
+
+        with self.connection(sql_user) as conn:
+            cursor = conn.cursor()
+
+            last_entry = (await loop.run_in_executor( \
+                                 None,self.time_window,cursor))[1]
+            buffer_time,break_time = await loop.run_in_executor( \
+                                            None,self.time_window,cursor, \
+                                            self.file.host)
+            self.maintain_partitions(cursor,last_entry)
+            if (self.create_summaries(cursor)):
+                self.refresh_summaries(cursor,datetime.min)
+
+            # create association between Log file and relations
             for relation in self.relations:
-                line_converted = relation.convert_line(line)
-                query = relation.query_insert()
-                cursor.execute(query,line_converted)
+                relation.create_attr_dict(HOST_HEADER)
+            await loop.run_in_executor(None,self.warm_cache,cursor)
+
+            async def reader():
+                lines = self.file._read_log(buffer_time)
+                while (not stop.is_set()):
+                    chunk = await loop.run_in_executor(None,list, \
+                                    itertools.islice(lines,chunk_size))
+                    if (not bool(chunk)):
+                        break
+                    # chunks are parsed concurrently, queued in order
+                    await parsed.put(loop.run_in_executor( \
+                                     parser_pool,LogFile.ssh_chunk, \
+                                     chunk,buffer_time))
+                await parsed.put(None)
+
+            async def sessions():
+                pending = []
+
+                def feed():
+                    while True:
+                        yield from pending
+                        pending.clear()
+                        # end of chunk
+                        yield None
+
+                log_processed = self.file.tag_host(itertools.chain([HEADER], \
+                                LogFile.track_sessions(feed(),user_list, \
+                                                       break_time, \
+                                                       self.flush_interval, \
+                                                       self.detector)))
+                next(log_processed)
+                while True:
+                    future = await parsed.get()
+                    if (future is None):
+                        break
+                    pending.extend(await future)
+                    chunk = await loop.run_in_executor(None,list, \
+                                    iter(log_processed.__next__,None))
+                    if (bool(chunk)):
+                        await processed.put(chunk)
+                await processed.put(None)
+
+            def write(chunk):
+                self.insert_batch(HOST_HEADER,chunk,cursor)
+                index = HOST_HEADER.index("last_date_time")
+                self.refresh_summaries(cursor,min([line[index] \
+                                                   for line in chunk]))
+                self.write_alerts(cursor)
+                conn.commit()
+
+            async def writer():
+                while True:
+                    chunk = await processed.get()
+                    if (chunk is None):
+                        break
+                    await loop.run_in_executor(None,write,chunk)
+
+            try:
+                await asyncio.gather(reader(),sessions(),writer())
+            finally:
+                if (parser_pool is not None):
+                    parser_pool.shutdown()
+            self.write_alerts(cursor)
 
-                # fetch primary key values to foreign keys
-                self.fetch_fk(relation,header,line,cursor)
+            if (stop.is_set()):
+                print("Stopped reading, written chunks are committed.")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
+            cursor.close()
+
+
+    @check_db_exists
+    def append_pipeline(self,sql_user,user_list,queue_size=4):
+        """
+        Appends data to the database with an asyncio pipeline
+        (see _pipeline), so parsing the next chunk of the Log
+        overlaps with committing the last one.
+        """
+
+        asyncio.run(self._pipeline(sql_user,user_list,queue_size))
+
+
+    @check_db_exists
+    def follow(self,sql_user,user_list,checkpoint,poll_interval):
+        """
+        Appends newly logged data to the database continuously.
+        Lines are read from the checkpoint on, chunks are committed
+        when batch_size lines are collected or no new data arrives,
+        the checkpoint is saved after every commit.
+        """
+
+        with self.connection(sql_user) as conn:
+            cursor = conn.cursor()
+
+            last_entry = self.time_window(cursor)[1]
+            buffer_time,break_time = self.time_window(cursor,self.file.host)
+            self.maintain_partitions(cursor,last_entry)
+            if (self.create_summaries(cursor)):
+                self.refresh_summaries(cursor,datetime.min)
+
+            # start generators
+            # (lines of sessions open at the checkpoint are read again
+            # from buffer_time on, their states are upserted)
+            lines = self.file.follow_log(checkpoint,poll_interval, \
+                                         buffer_time)
+            log_processed = self.file.process_log(user_list, \
+                                                  buffer_time,break_time, \
+                                                  lines,self.flush_interval, \
+                                                  self.detector)
+            log_processed = self.file.tag_host(log_processed)
+
+            # create association between Log file and relations
+            header = next(log_processed)
+            for relation in self.relations:
+                relation.create_attr_dict(header)
+
+            self.warm_cache(cursor)
+
+            # append to relations
+            chunk = []
+            try:
+                for line in log_processed:
+                    if (line is not None):
+                        chunk.append(line)
+                        if (len(chunk) < max(self.batch_size,1)):
+                            continue
+                    if (bool(chunk)):
+                        self.insert_batch(header,chunk,cursor)
+                        index = header.index("last_date_time")
+                        self.refresh_summaries(cursor, \
+                                               min([line[index] \
+                                                    for line in chunk]))
+                        self.write_alerts(cursor)
+                        conn.commit()
+                        chunk = []
+                    checkpoint.save()
+            except KeyboardInterrupt:
+                print("\nStopped following.")
+            self.write_alerts(cursor)
+
+            cursor.close()
 
 
     def _if_instructions(self):
@@ -904,7 +4015,8 @@ class Database:
                   > Case-sensitive Regex: arg ~ regex
                   """
         print(textwrap.dedent(filters))
-        print("Export previous output to csv: export filename")
+        print("Export previous output: export filename" \
+             +"[.csv|.csv.gz|.parquet|.arrow]")
         print("Syntax: statement_1, statement_2, ... statment_n;\n")
         print("Press q+Enter to quit.\n")
 
@@ -941,26 +4053,39 @@ class Database:
 
 
     @staticmethod
-    def _if_export(input_flat,header,response):
-        """Export last query as csv file."""
+    def _if_export(cursor,input_flat,header,query):
+        """
+        Export last query as csv (default), gzip-compressed csv,
+        Parquet or Arrow file, the query is run again with COPY.
+        """
 
         exported = False
         if ("export" in input_flat[0][0]):
             fname = input_flat[0][0].split()[1].lstrip(".")
             file_type = ""
-            pattern = r"\.csv$"
+            pattern = r"\.(csv|csv\.gz|parquet|arrow)$"
             search = re.search(pattern,fname)
             if (not bool(search)):
                 file_type = ".csv"
 
-            if (not bool(header) or not bool(response)):
+            if (not bool(header) or query is None):
                 print(f"Cannot export to {fname+file_type} "+ \
                        "without query.")
             elif (fname==""):
                 print("Invalid filename.")
             else:
-                Relation.export_csv([header,*response],fname+file_type)
-                print(f"Query exported as {fname+file_type}.")
+                # conversion errors of pyarrow as well (e.g. DateStyle)
+                errors = (ImportError,psycopg2.Error)
+                if (pyarrow is not None):
+                    errors += (pyarrow.ArrowException,)
+                cursor.execute('SAVEPOINT sp;')
+                try:
+                    Relation.export_copy(cursor,query,fname+file_type)
+                except errors as error:
+                    print(f"Error: {error}".strip())
+                    cursor.execute('ROLLBACK TO SAVEPOINT sp;')
+                else:
+                    print(f"Query exported as {fname+file_type}.")
 
             exported = True
 
@@ -1052,7 +4177,8 @@ class Database:
     def _if_where(input_flat,minmax_exist,minmax_clause):
         """
         Extract where statements from input.
-        Includes minmax statements.
+        Includes minmax statements. Upper bounds of last_date_time
+        bound first_date_time as well (partition pruning).
         """
 
         ops = ("<",">","<=",">=","=","!=","~")
@@ -1072,6 +4198,14 @@ class Database:
                            sql.SQL(flt[2]), \
                            sql.SQL(flt[1])) \
                            for flt in input_flat if (len(flt)==3)]
+            # sessions end after they start
+            comparisons.extend([sql.SQL("{} {} {}").format( \
+                                sql.Identifier("first_date_time"), \
+                                sql.SQL("<=" if (flt[2]=="=") else flt[2]), \
+                                sql.SQL(flt[1])) \
+                                for flt in input_flat if (len(flt)==3 and \
+                                flt[0]=="last_date_time" and \
+                                flt[2] in ("<","<=","="))])
    
             if (minmax_exist):
                 where_clause = sql.SQL("WHERE {} AND ({})").format( \
@@ -1143,64 +4277,70 @@ class Database:
     def interface(self,sql_user):
         """User command line interface."""
     
-        conn = psycopg2.connect(dbname=self.name,
-                                host="localhost",
-                                port="5432",
-                                user=sql_user.name,
-                                password=sql_user.passwd)
-        cursor = conn.cursor()
+        with self.connection(sql_user) as conn:
+            cursor = conn.cursor()
         
-        input_quit = ""
-        header = ()
-        response = []
+            input_quit = ""
+            header = ()
+            # server-side cursor and last query
+            result = None
+            last_query = None
 
-        while (input_quit!="q"):
+            while (input_quit!="q"):
       
-            self._if_instructions()
-
-            input_flat,input_quit = self._if_read(input_quit)
-            if (input_quit=="q"):
-                continue
-
-            exported = self._if_export(input_flat,header,response)
-            if (exported):
-                continue
-
-            input_flat,count_exist = self._if_count(input_flat)
-            input_flat,minmax_exist,minmax_clause = self._if_minmax(input_flat)
-            input_flat,sort_clause = self._if_sort(input_flat)
-            input_flat,where_clause = self._if_where(input_flat, \
-                                                     minmax_exist, \
-                                                     minmax_clause)
+                self._if_instructions()
 
-            # unique attributes
-            user_attrs = list(set([flt[0] for flt in input_flat]))
-
-            query = self._if_assemble_query(user_attrs,where_clause, \
-                                            sort_clause,count_exist)
+                input_flat,input_quit = self._if_read(input_quit)
+                if (input_quit=="q"):
+                    continue
 
-            # execute query
-            cursor.execute('SAVEPOINT sp;')
-            try:
-                cursor.execute(query)
-            except psycopg2.errors.UndefinedColumn:
-                msg = "Error: Cannot find attribute."
-                print(msg)
-                cursor.execute('ROLLBACK TO SAVEPOINT sp;')
-            except psycopg2.errors.UndefinedTable:
-                msg = "Error: Cannot find table."
-                print(msg)
-                cursor.execute('ROLLBACK TO SAVEPOINT sp;')
-            else:
-                # display table
-                header = tuple(name[0] for name in cursor.description)
-                response = [tuple(map(str,entry)) for entry in cursor.fetchall()]
-                table = Relation.create_table(header,response)
-                Relation.print_table(table)
+                exported = self._if_export(cursor,input_flat,header, \
+                                           last_query)
+                if (exported):
+                    continue
 
-        conn.commit()
-        cursor.close()
-        conn.close()
+                input_flat,count_exist = self._if_count(input_flat)
+                input_flat,minmax_exist,minmax_clause = self._if_minmax(input_flat)
+                input_flat,sort_clause = self._if_sort(input_flat)
+                input_flat,where_clause = self._if_where(input_flat, \
+                                                         minmax_exist, \
+                                                         minmax_clause)
+
+                # unique attributes
+                user_attrs = list(set([flt[0] for flt in input_flat]))
+
+                query = self._if_assemble_query(user_attrs,where_clause, \
+                                                sort_clause,count_exist)
+
+                # execute query in a server-side cursor
+                if (result is not None):
+                    result.close()
+                header = ()
+                last_query = None
+                cursor.execute('SAVEPOINT sp;')
+                result = conn.cursor(name="interface")
+                result.itersize = PAGE_SIZE
+                try:
+                    result.execute(query)
+                except psycopg2.errors.UndefinedColumn:
+                    msg = "Error: Cannot find attribute."
+                    print(msg)
+                    cursor.execute('ROLLBACK TO SAVEPOINT sp;')
+                    result = None
+                except psycopg2.errors.UndefinedTable:
+                    msg = "Error: Cannot find table."
+                    print(msg)
+                    cursor.execute('ROLLBACK TO SAVEPOINT sp;')
+                    result = None
+                else:
+                    # display table page by page
+                    header = Relation.print_pages(result)
+                    last_query = query
+
+            if (result is not None):
+                result.close()
+
+            cursor.close()
 
     
     @check_db_exists
@@ -1212,130 +4352,155 @@ class Database:
     
         tasks = ["All relevant information", \
                  "All existing Users", \
-                 "Fail-counts for users and IP-addresses"]
+                 "Fail-counts for users", \
+                 "Fail-counts for IP-addresses", \
+                 "Fail-counts for hosts", \
+                 "Failures per day"]
     
         queries = ["""
-                   SELECT sessions.pid, users.user_name, users.user_exists, 
+                   SELECT hosts.host_name, sessions.pid, 
+                   users.user_name, users.user_exists, 
                    ip_addresses.ip_address, 
                    sessions.first_date_time, sessions.last_date_time, 
                    sessions.fail_count, sessions.login_status
                    FROM sessions 
+                   INNER JOIN hosts ON sessions.host_id = hosts.host_id 
                    INNER JOIN users ON sessions.user_id = users.user_id 
                    INNER JOIN ip_addresses ON sessions.ip_id = ip_addresses.ip_id;
                    """,
                    """
-                   SELECT sessions.pid, users.user_name, ip_addresses.ip_address, 
+                   SELECT hosts.host_name, sessions.pid, users.user_name, 
+                   ip_addresses.ip_address, 
                    sessions.first_date_time, sessions.last_date_time
                    FROM sessions 
+                   INNER JOIN hosts ON sessions.host_id = hosts.host_id 
                    INNER JOIN users ON sessions.user_id = users.user_id 
                    INNER JOIN ip_addresses ON sessions.ip_id = ip_addresses.ip_id
                    WHERE users.user_exists IS TRUE;
                    """,
                    """
-                   SELECT users.user_name, ip_addresses.ip_address, 
-                   sessions.fail_count, users.user_exists
-                   FROM sessions 
-                   JOIN users ON sessions.user_id = users.user_id 
-                   JOIN ip_addresses ON sessions.ip_id = ip_addresses.ip_id;
+                   SELECT users.user_name, users.user_exists, 
+                   failures_per_user.sessions, 
+                   failures_per_user.failed_sessions, 
+                   failures_per_user.fail_count
+                   FROM failures_per_user 
+                   JOIN users ON failures_per_user.user_id = users.user_id 
+                   ORDER BY failures_per_user.fail_count DESC;
+                   """,
+                   """
+                   SELECT ip_addresses.ip_address, 
+                   failures_per_ip.sessions, 
+                   failures_per_ip.failed_sessions, 
+                   failures_per_ip.fail_count
+                   FROM failures_per_ip 
+                   JOIN ip_addresses ON failures_per_ip.ip_id = ip_addresses.ip_id 
+                   ORDER BY failures_per_ip.fail_count DESC;
+                   """,
+                   """
+                   SELECT hosts.host_name, 
+                   failures_per_host.sessions, 
+                   failures_per_host.failed_sessions, 
+                   failures_per_host.fail_count
+                   FROM failures_per_host 
+                   JOIN hosts ON failures_per_host.host_id = hosts.host_id 
+                   ORDER BY failures_per_host.fail_count DESC;
+                   """,
+                   """
+                   SELECT day, sessions, failed_sessions, fail_count
+                   FROM failures_per_day 
+                   ORDER BY day;
                    """]
     
-        conn = psycopg2.connect(dbname=self.name,
-                                host="localhost",
-                                port="5432",
-                                user=sql_user.name,
-                                password=sql_user.passwd)
-        cursor = conn.cursor()
+        with self.connection(sql_user) as conn:
+            cursor = conn.cursor()
     
-        # table representation
-        try:
-            with open(self.tests,"w",newline="") as test_file:
+            # table representation
+            try:
+                with open(self.tests,"w",newline="") as test_file:
         
-                for ii in range(len(tasks)):
-                    test_file.write("\n" \
-                                   +textwrap.dedent(tasks[ii]).strip() \
-                                   +":\n")
-                    cursor.execute(queries[ii])
-                    header = tuple(name[0] for name in cursor.description)
-                    response = [tuple(map(str,entry)) \
-                                for entry in cursor.fetchall()]
-                    table = Relation.create_table(header,response)
-                    test_file.write(textwrap.dedent(queries[ii])+"\n")
-                    Relation.write_table(table,test_file)
+                    for ii in range(len(tasks)):
+                        test_file.write("\n" \
+                                       +textwrap.dedent(tasks[ii]).strip() \
+                                       +":\n")
+                        cursor.execute(queries[ii])
+                        header = tuple(name[0] for name in cursor.description)
+                        response = [tuple(map(str,entry)) \
+                                    for entry in cursor.fetchall()]
+                        table = Relation.create_table(header,response)
+                        test_file.write(textwrap.dedent(queries[ii])+"\n")
+                        Relation.write_table(table,test_file)
     
-        except PermissionError:
-            msg = f"Error: You lack permission to create {fname}."
-            print(msg)
+            except PermissionError:
+                msg = f"Error: You lack permission to create {fname}."
+                print(msg)
 
-        # csv file
-        cursor.execute(queries[0])
-        header = list(name[0] for name in cursor.description)
-        response = [list(map(str,entry)) \
-                    for entry in cursor.fetchall()]
-        Relation.export_csv([header,*response], \
-                            self.tests.split(".")[0]+".csv")
+            # csv file
+            Relation.export_copy(cursor,queries[0], \
+                                 self.tests.split(".")[0]+".csv")
     
-        conn.commit()
-        cursor.close()
-        conn.close()
+            cursor.close()
 
 
 @check_db_exists
-def interactive_queries(sql_user,db_name):
+def interactive_queries(sql_user,db):
     """Run queries interactively."""
 
-    conn = psycopg2.connect(dbname=db_name,
-                            host="localhost",
-                            port="5432",
-                            user=sql_user.name,
-                            password=sql_user.passwd)
-    cursor = conn.cursor()
+    with db.connection(sql_user) as conn:
+        cursor = conn.cursor()
 
-    input_quit = ""
-    while (input_quit!="q"):
+        input_quit = ""
+        while (input_quit!="q"):
     
-        # read query
-        print("\nEnter query or q+Enter to quit:")
-        input_list = []
-        while True:
-            line = input()
-            input_list.append(line)
-            # quit
-            if (input_list[0]=="q"):
-                input_quit = "q"
-                break
-            # collect input
-            if (";" in line):
-                line = line[:line.index(";")+1]
-                input_list[-1] = line
-                break
+            # read query
+            print("\nEnter query or q+Enter to quit:")
             input_list = []
-        if (input_quit=="q"):
-            continue
+            while True:
+                line = input()
+                input_list.append(line)
+                # quit
+                if (input_list[0]=="q"):
+                    input_quit = "q"
+                    break
+                # collect input
+                if (";" in line):
+                    line = line[:line.index(";")+1]
+                    input_list[-1] = line
+                    break
+                input_list = []
+            if (input_quit=="q"):
+                continue
 
-        query = " ".join(input_list)
+            query = " ".join(input_list)
 
-        # execute query
-        cursor.execute('SAVEPOINT sp;')
-        try:
-            cursor.execute(query)
-        except psycopg2.errors.UndefinedColumn:
-            msg = "Error: Cannot find attribute."
-            print(msg)
-            cursor.execute('ROLLBACK TO SAVEPOINT sp;')
-        except psycopg2.errors.UndefinedTable:
-            msg = "Error: Cannot find table."
-            print(msg)
-            cursor.execute('ROLLBACK TO SAVEPOINT sp;')
-        else:
-            # display table
-            header = tuple(name[0] for name in cursor.description)
-            response = [tuple(map(str,entry)) for entry in cursor.fetchall()]
-            table = Relation.create_table(header,response)
-            Relation.print_table(table)
+            # queries only reading rows run in a server-side cursor
+            # (DECLARE CURSOR refuses data-modifying WITH, SELECT INTO)
+            is_select = (query.split(None,1)[0].lower() \
+                         in ("select","with","values","table") and \
+                         not re.search(r"\b(insert|update|delete|" \
+                                       r"merge|into)\b",query,re.I))
+            result = conn.cursor(name="interactive") if (is_select) \
+                     else cursor
+
+            # execute query
+            cursor.execute('SAVEPOINT sp;')
+            try:
+                result.execute(query)
+            except psycopg2.errors.UndefinedColumn:
+                msg = "Error: Cannot find attribute."
+                print(msg)
+                cursor.execute('ROLLBACK TO SAVEPOINT sp;')
+            except psycopg2.errors.UndefinedTable:
+                msg = "Error: Cannot find table."
+                print(msg)
+                cursor.execute('ROLLBACK TO SAVEPOINT sp;')
+            else:
+                # display table page by page
+                if (is_select or result.description is not None):
+                    Relation.print_pages(result)
+                if (is_select):
+                    result.close()
     
-    conn.commit()
-    cursor.close()
-    conn.close()
+        cursor.close()
 
 
 class SQLUser:
@@ -1425,6 +4590,16 @@ class User:
                     self.list.append(line[0])
 
 
+def get_option(name,default):
+    """Reads value of option name (type of default) from the command line."""
+
+    value = default
+    if (name in sys.argv[2:-1]):
+        value = type(default)(sys.argv[sys.argv.index(name)+1])
+
+    return value
+
+
 def main():
     """
     Create-mode:
@@ -1436,26 +4611,71 @@ def main():
         Processes queries on created database.
     User-mode:
         Display data through a simple CLI.
+    Follow-mode:
+        Append newly logged data continuously.
     """
 
     print("\n| checkLogins |\n")
 
-    if (len(sys.argv)==2):
+    if (len(sys.argv)>=2):
         mode = sys.argv[1]
     else:
         mode = "-u"
 
-    log_file = LogFile("auth.log","/var/log")
+    rotated = ("--rotated" in sys.argv[2:])
+    log_file = LogFile("auth.log","/var/log",rotated)
     user = User()
-    log_file.copy_log(user.home)
+    # Logs of many hosts (directory tree)
+    hosts_dir = get_option("--hosts","")
+    hosts = None
+    if (bool(hosts_dir)):
+        hosts = LogFile.host_logs(hosts_dir,"auth.log")
+        if (not bool(hosts)):
+            print(f"Error: No auth.log found in {hosts_dir}.")
+            sys.exit(2)
+        print(f"Found the Logs of {len(hosts)} hosts in {hosts_dir}.")
+    # Follow-mode, rotation sets and hosts read the Logs in place
+    is_copied = (mode not in ("-f","--follow") and not rotated \
+                 and hosts is None)
+    if (is_copied):
+        log_file.copy_log(user.home)
     
     db_name = "auth_logs"
     db_tests = "auth_tests.txt"
-    db = Database(db_name,log_file,db_tests)
+    batch_size = get_option("--batch_size",1000)
+    cache_size = get_option("--cache_size",10000)
+    workers = get_option("--workers",1 if (hosts is None) \
+                                     else os.cpu_count())
+    flush = get_option("--flush_interval",0)
+    flush_interval = timedelta(seconds=flush) if (flush > 0) else None
+    # (the pipeline stages read the local Log)
+    pipeline = ("--pipeline" in sys.argv[2:] and hosts is None)
+    detector = None
+    if ("--detect" in sys.argv[2:]):
+        window = timedelta(seconds=get_option("--window",60))
+        detector = BruteForceDetector(get_option("--max_failures",10), \
+                                      window)
+    queue_size = get_option("--queue_size",4)
+    partitioned = ("--partition" in sys.argv[2:])
+    retention = get_option("--retention",0)
+    engine = get_option("--backend","postgresql")
+    backend = None
+    if (engine in ("duckdb","sqlite")):
+        backend = EmbeddedBackend(user.home,engine)
+    elif (engine != "postgresql"):
+        print(f"Error: Unknown backend {engine}, " \
+             +"available: postgresql, duckdb, sqlite.")
+        sys.exit(2)
+    db = Database(db_name,log_file,db_tests,batch_size,cache_size,workers, \
+                  flush_interval,detector,partitioned,retention,backend, \
+                  hosts)
 
     # get login data
+    # (embedded database files need no login)
     sql_user = SQLUser()
-    if (mode != "--cron_job"):
+    if (backend is not None):
+        db.check_credentials(sql_user)
+    elif (mode != "--cron_job"):
         print("Provide login details for the database.")
         connected = False
         while (not connected):
@@ -1477,6 +4697,8 @@ def main():
             db.initialize_relations()
             db.setup_relations(sql_user,user.list)
             print("Database relations created and filled.\n")
+            if (bool(db.pool.timings)):
+                print(db.pool.report()+"\n")
 
         except psycopg2.errors.OperationalError:
             msg = "Error: Database cannot be rebuild " \
@@ -1493,7 +4715,10 @@ def main():
 
         print("Appending to database relations...")
         db.initialize_relations()
-        db.append(sql_user,user.list)
+        if (pipeline):
+            db.append_pipeline(sql_user,user.list,queue_size)
+        else:
+            db.append(sql_user,user.list)
         print("Database extended.\n")
 
         print("Creating sample queries and output...")
@@ -1503,7 +4728,7 @@ def main():
     elif (mode=="-i" or mode=="--interactive"):
         print("\n| Interactive-mode |\n")
 
-        interactive_queries(sql_user,db.name)
+        interactive_queries(sql_user,db)
 
     elif (mode=="-u" or mode=="--user"):
         print("\n| User-mode |\n")
@@ -1516,21 +4741,51 @@ def main():
 
         # append to database from cron-job
         db.initialize_relations()
-        db.append(sql_user,user.list)
+        if (pipeline):
+            db.append_pipeline(sql_user,user.list,queue_size)
+        else:
+            db.append(sql_user,user.list)
 
         # setup cronjob
-        cronjob = CronJob("0","0","*","*","*","python3",f"{__file__} --cron_job")
+        options = " --pipeline" if (pipeline) else ""
+        if (detector is not None):
+            options += f" --detect --max_failures {detector.max_failures}" \
+                      +f" --window {int(detector.window.total_seconds())}"
+        if (retention > 0):
+            options += f" --retention {retention}"
+        if (backend is not None):
+            options += f" --backend {backend.engine}"
+        if (hosts is not None):
+            options += f" --hosts {os.path.abspath(hosts_dir)}" \
+                      +f" --workers {workers}"
+        cronjob = CronJob("0","0","*","*","*","python3", \
+                          f"{__file__} --cron_job"+options)
         if (not cronjob.active):
             cronjob.add_cronjob(sql_user)
 
     elif (mode=="--cron_job"):
         # append to database from cron-job
         db.initialize_relations()
-        db.append(sql_user,user.list)
+        if (pipeline):
+            db.append_pipeline(sql_user,user.list,queue_size)
+        else:
+            db.append(sql_user,user.list)
+        print(db.id_cache.report())
+
+    elif (mode=="-f" or mode=="--follow"):
+        print("\n| Follow-mode |\n")
+
+        poll_interval = get_option("--poll",1)
+        checkpoint = Checkpoint(f"{user.home}/.check_logins_checkpoint")
+        print("Following the Log file, press Ctrl+C to stop...")
+        db.initialize_relations()
+        db.follow(sql_user,user.list,checkpoint,poll_interval)
 
 
     # clean up
-    log_file.rm_log()
+    db.close_connections()
+    if (is_copied):
+        log_file.rm_log()
 
 
 if (__name__ == "__main__"):